@@ -0,0 +1,186 @@
+"""
+Compare the WSGI and ASGI serving modes under concurrent read load.
+
+    python scripts/bench_asgi.py --tasks 300 --concurrency 50 --seconds 10
+
+Seeds a throwaway SQLite database (or the DB_* database from the
+environment when --keep-db is given), then for each mode starts gunicorn
+exactly as scripts/entrypoint.sh does and hits GET /api/tasks/ and
+GET /api/contacts/ with an access_token cookie. Prints one JSON object
+with requests/s and p50/p99 latency per mode and endpoint.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+ENDPOINTS = ['/api/tasks/', '/api/contacts/']
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def setup_django(env):
+    os.environ.update(env)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todo_list_backend.settings')
+    sys.path.insert(0, str(BASE_DIR))
+    import django
+    django.setup()
+
+
+def seed(tasks):
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from rest_framework_simplejwt.tokens import AccessToken
+    from todo_list.models import Subtask, Task
+
+    call_command('migrate', verbosity=0)
+    user, _ = User.objects.get_or_create(
+        username='bench', defaults={'email': 'bench@example.com'})
+    profile = user.userprofile
+    missing = tasks - Task.objects.count()
+    for i in range(max(missing, 0)):
+        task = Task.objects.create(
+            title=f'Bench task {i}', description='Benchmark', color='blue')
+        task.members.add(profile)
+        Subtask.objects.bulk_create(
+            Subtask(title=f'Step {n}', task=task, status=n % 2 == 0)
+            for n in range(3))
+    return str(AccessToken.for_user(user))
+
+
+def server_command(mode, port, workers):
+    command = [
+        sys.executable, '-m', 'gunicorn',
+        '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+        '--log-level', 'warning',
+    ]
+    if mode == 'asgi':
+        return command + [
+            '--worker-class', 'uvicorn.workers.UvicornWorker',
+            'todo_list_backend.asgi:application']
+    return command + ['todo_list_backend.wsgi:application']
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(('127.0.0.1', port)) == 0:
+                return
+        time.sleep(0.2)
+    raise RuntimeError(f'server on port {port} did not start')
+
+
+async def fetch(port, path, token):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write((
+        f'GET {path} HTTP/1.1\r\nHost: localhost\r\n'
+        f'Cookie: access_token={token}\r\nConnection: close\r\n\r\n'
+    ).encode())
+    await writer.drain()
+    status = (await reader.readline()).split()[1]
+    await reader.read()
+    writer.close()
+    return int(status)
+
+
+async def load(port, path, token, concurrency, seconds):
+    latencies, errors = [], 0
+    deadline = time.monotonic() + seconds
+
+    async def worker():
+        nonlocal errors
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                status = await fetch(port, path, token)
+            except OSError:
+                status = None
+            if status != 200:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.monotonic()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.monotonic() - started
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        'p99_ms': round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2)
+        if latencies else None,
+    }
+
+
+def bench_mode(mode, env, token, args):
+    port = free_port()
+    server_env = dict(os.environ, **env, SERVER_MODE=mode)
+    server = subprocess.Popen(
+        server_command(mode, port, args.workers), cwd=BASE_DIR, env=server_env)
+    try:
+        wait_for_port(port)
+        results = {}
+        for path in ENDPOINTS:
+            asyncio.run(load(port, path, token, args.concurrency, 1))  # warm-up
+            results[path] = asyncio.run(
+                load(port, path, token, args.concurrency, args.seconds))
+        return results
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=300)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--modes', default='wsgi,asgi')
+    parser.add_argument(
+        '--keep-db', action='store_true',
+        help='use the configured database instead of a temporary SQLite file')
+    args = parser.parse_args()
+
+    env = {
+        'DEBUG': '0',
+        'ALLOWED_HOSTS': 'localhost,127.0.0.1',
+        'THROTTLE_USER_RATE': '100000000/day',
+    }
+    tmp = None
+    if not args.keep_db:
+        tmp = tempfile.TemporaryDirectory()
+        env.update(
+            USE_SQLITE='1', SQLITE_PATH=str(Path(tmp.name) / 'bench.sqlite3'))
+    setup_django(env)
+    token = seed(args.tasks)
+
+    report = {
+        'tasks': args.tasks,
+        'concurrency': args.concurrency,
+        'workers': args.workers,
+        'modes': {mode: bench_mode(mode, env, token, args)
+                  for mode in args.modes.split(',')},
+    }
+    print(json.dumps(report, indent=2))
+    if tmp:
+        tmp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Micro-benchmark of DRF's JSONRenderer/JSONParser against the orjson
+versions in todo_list_backend/renderers.py.
+
+    python scripts/bench_json.py --tasks 500 --repeat 50
+
+The payload has the shape of GET /api/tasks/ (members expanded, five
+subtasks per task), no database needed.
+"""
+import argparse
+import datetime
+import io
+import os
+import sys
+import timeit
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todo_list_backend.settings')
+    sys.path.insert(0, str(BASE_DIR))
+    import django
+    django.setup()
+
+
+def task_payload(count):
+    today = datetime.date.today()
+    members = [
+        {
+            'id': n,
+            'user': {'id': n, 'first_name': 'Ana', 'last_name': f'Müller {n}',
+                     'username': f'user{n}', 'email': f'user{n}@example.com'},
+            'phone_number': '+49 170 0000000',
+            'color': '#FF7A00',
+        }
+        for n in range(3)
+    ]
+    return [
+        {
+            'id': n,
+            'title': f'Task {n}: implement the board filter',
+            'category': 'user_story',
+            'description': 'Lorem ipsum dolor sit amet, consectetur ' * 4,
+            'status': 'in_progress',
+            'color': '#29ABE2',
+            'priority': 'medium',
+            'members': members,
+            'created_at': today.isoformat(),
+            'due_date': today + datetime.timedelta(days=n % 30),
+            'checked': False,
+            'subtasks': [
+                {'id': n * 10 + i, 'title': f'Step {i}', 'status': i % 2 == 0}
+                for i in range(5)
+            ],
+            'subtasks_progress': 60,
+        }
+        for n in range(count)
+    ]
+
+
+def bench(label, func, repeat):
+    seconds = min(timeit.repeat(func, number=1, repeat=repeat))
+    print(f'{label:<28} {seconds * 1000:8.2f} ms')
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from todo_list_backend import renderers
+
+    if renderers.orjson is None:
+        print('orjson is not installed, FastJSON* fall back to stdlib.')
+
+    data = task_payload(args.tasks)
+    body = JSONRenderer().render(data)
+    print(f'{args.tasks} tasks, {len(body) / 1024:.0f} KiB, best of {args.repeat}')
+
+    results = {}
+    for name, renderer in (('stdlib', JSONRenderer()),
+                           ('orjson', renderers.FastJSONRenderer())):
+        results[f'render {name}'] = bench(
+            f'render {name}', lambda: renderer.render(data), args.repeat)
+    for name, json_parser in (('stdlib', JSONParser()),
+                              ('orjson', renderers.FastJSONParser())):
+        results[f'parse {name}'] = bench(
+            f'parse {name}',
+            lambda: json_parser.parse(io.BytesIO(body)), args.repeat)
+
+    for action in ('render', 'parse'):
+        speedup = results[f'{action} stdlib'] / results[f'{action} orjson']
+        print(f'{action} speedup: {speedup:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+Login throughput per worker for each password hasher and serving mode.
+
+    python scripts/bench_login.py --hashers pbkdf2,scrypt --concurrency 20 --seconds 10
+
+Seeds a throwaway SQLite database with one user, then for every hasher
+and mode starts gunicorn like scripts/entrypoint.sh does (sync workers
+for wsgi, uvicorn workers with ASYNC_LOGIN for asgi) and posts to
+/api/login/. Hash costs come from the environment (PBKDF2_ITERATIONS,
+SCRYPT_WORK_FACTOR, ARGON2_*, PASSWORD_HASH_WORKERS). Prints one JSON
+object with logins/s per worker and p50/p99 latency, plus the latency
+of GET /api/contacts/ measured during the login burst, which shows
+whether hashing blocks other requests.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from bench_asgi import BASE_DIR, free_port, server_command, setup_django, wait_for_port
+
+ALGORITHMS = {'pbkdf2': 'pbkdf2_sha256', 'scrypt': 'scrypt', 'argon2': 'argon2'}
+EMAIL, PASSWORD = 'bench@example.com', 'bench-password'
+
+
+def seed():
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    call_command('migrate', verbosity=0)
+    user, _ = User.objects.get_or_create(username='bench', defaults={'email': EMAIL})
+    return user, str(AccessToken.for_user(user))
+
+
+def use_hasher(user, name):
+    from django.contrib.auth.hashers import make_password
+
+    # Hashed with the server's preferred hasher, so logins do not rehash
+    user.password = make_password(PASSWORD, hasher=ALGORITHMS[name])
+    user.save(update_fields=['password'])
+
+
+async def request(port, raw):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(raw)
+    await writer.drain()
+    status = (await reader.readline()).split()[1]
+    await reader.read()
+    writer.close()
+    return int(status)
+
+
+def login_request():
+    body = json.dumps({'email': EMAIL, 'password': PASSWORD}).encode()
+    return (
+        'POST /api/login/ HTTP/1.1\r\nHost: localhost\r\n'
+        'Content-Type: application/json\r\n'
+        f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n'
+    ).encode() + body
+
+
+def read_request(token):
+    return (
+        'GET /api/contacts/ HTTP/1.1\r\nHost: localhost\r\n'
+        f'Cookie: access_token={token}\r\nConnection: close\r\n\r\n'
+    ).encode()
+
+
+def summary(latencies, errors, elapsed):
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        'p99_ms': round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2)
+        if latencies else None,
+    }
+
+
+async def load(port, token, concurrency, seconds):
+    results = {'login': ([], 0), 'read': ([], 0)}
+    deadline = time.monotonic() + seconds
+
+    async def worker(kind, raw):
+        latencies, errors = results[kind]
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                status = await request(port, raw)
+            except OSError:
+                status = None
+            if status != 200:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+        results[kind] = (latencies, errors)
+
+    started = time.monotonic()
+    await asyncio.gather(
+        *(worker('login', login_request()) for _ in range(concurrency)),
+        worker('read', read_request(token)))
+    elapsed = time.monotonic() - started
+    return {kind: summary(*values, elapsed) for kind, values in results.items()}
+
+
+def bench(mode, hasher, env, token, args):
+    port = free_port()
+    server_env = dict(
+        os.environ, **env, SERVER_MODE=mode, PASSWORD_HASHER=hasher,
+        ASYNC_LOGIN='1' if mode == 'asgi' else '0')
+    server = subprocess.Popen(
+        server_command(mode, port, args.workers), cwd=BASE_DIR, env=server_env)
+    try:
+        wait_for_port(port)
+        asyncio.run(load(port, token, args.concurrency, 1))  # warm-up
+        result = asyncio.run(load(port, token, args.concurrency, args.seconds))
+        result['login']['rps_per_worker'] = round(
+            result['login']['rps'] / args.workers, 1)
+        return result
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--hashers', default='pbkdf2,scrypt')
+    parser.add_argument('--modes', default='wsgi,asgi')
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--workers', type=int, default=2)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    env = {
+        'DEBUG': '0',
+        'ALLOWED_HOSTS': 'localhost,127.0.0.1',
+        'THROTTLE_ANON_RATE': '100000000/day',
+        'THROTTLE_USER_RATE': '100000000/day',
+        'USE_SQLITE': '1',
+        'SQLITE_PATH': str(Path(tmp.name) / 'bench.sqlite3'),
+    }
+    setup_django(env)
+    user, token = seed()
+
+    report = {'workers': args.workers, 'concurrency': args.concurrency, 'hashers': {}}
+    for hasher in args.hashers.split(','):
+        use_hasher(user, hasher)
+        report['hashers'][hasher] = {
+            mode: bench(mode, hasher, env, token, args)
+            for mode in args.modes.split(',')
+        }
+    print(json.dumps(report, indent=2))
+    tmp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
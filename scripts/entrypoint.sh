@@ -71,6 +71,16 @@ case "$1" in
     migrate
     collectstatic
     create_superuser
+    # SERVER_MODE=wsgi (default) -> sync workers
+    # SERVER_MODE=asgi            -> uvicorn workers, async read views
+    if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+      echo "🚀 starting gunicorn (ASGI / uvicorn workers)"
+      exec gunicorn todo_list_backend.asgi:application \
+        --worker-class uvicorn.workers.UvicornWorker \
+        --bind 0.0.0.0:8000 \
+        --workers "${GUNICORN_WORKERS:-3}" \
+        --timeout "${GUNICORN_TIMEOUT:-120}"
+    fi
     echo "🚀 starting gunicorn"
     exec gunicorn todo_list_backend.wsgi:application \
       --bind 0.0.0.0:8000 \
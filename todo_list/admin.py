@@ -1,10 +1,12 @@
 from django.contrib import admin
 
-from todo_list.models import Task, Subtask
+from todo_list.models import Task, Subtask, Workspace, WorkspaceMembership
 from user_auth_app.models import UserProfile
 
 # Register your models here.
 
 admin.site.register(Task)
 admin.site.register(Subtask)
+admin.site.register(Workspace)
+admin.site.register(WorkspaceMembership)
 admin.site.register(UserProfile)
@@ -0,0 +1,143 @@
+"""
+Reading side of the change feed (see todo_list.models.ChangeLogEntry).
+
+collect_changes() turns the log after a cursor into one delta per object:
+the last action plus the current representation of the object (or only
+its id for deletes). Given a user, tasks and subtasks outside the user's
+workspaces are looked up as if they were gone, so they come out as
+deletes (which is also what a task moved out of a workspace is to that
+workspace's members).
+
+Subtask writes change their task's subtasks_progress through a counter
+UPDATE that is not logged for the task itself, so every subtask change
+in a window also yields an 'updated' delta for its task (unless the task
+has its own entry in the window).
+
+Log ids are handed out at INSERT, not at commit: on Postgres a
+transaction holding id N+1 can commit after N+2 was already read, and a
+cursor past N+2 would skip N+1 for good. So only entries older than
+CHANGE_FEED["VISIBILITY_LAG"] seconds are served, and the cursor stops
+before the first newer one. Writes whose transaction stays open longer
+than the lag after logging can still be missed.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from todo_list.models import ChangeLogEntry, Subtask, Task
+from user_auth_app.api.serializers import UserProfileSerializer
+from user_auth_app.models import UserProfile
+from .serializers import SubtaskSerializer, TaskItemSerializer
+
+
+def feed_option(name, default):
+    return getattr(settings, 'CHANGE_FEED', {}).get(name, default)
+
+
+class CursorExpired(Exception):
+    """
+    The cursor points before the oldest retained log entry, so deltas
+    may be missing and the client has to reload the full list.
+    """
+
+
+def visible_before():
+    """
+    Entries created at or after this may still have uncommitted
+    neighbours with lower ids. None when there is no lag (SQLite).
+    """
+    lag = feed_option('VISIBILITY_LAG', 0)
+    return timezone.now() - timedelta(seconds=lag) if lag else None
+
+
+def latest_cursor():
+    """
+    The newest entry old enough to be served, and older than every
+    recent one (any id in between may still be uncommitted).
+    """
+    cutoff = visible_before()
+    entries = ChangeLogEntry.objects.order_by('-id').values_list('id', flat=True)
+    if cutoff is None:
+        return entries.first() or 0
+    first_recent = entries.filter(created_at__gte=cutoff).last()
+    if first_recent is not None:
+        entries = entries.filter(id__lt=first_recent)
+    return entries.filter(created_at__lt=cutoff).first() or 0
+
+
+def collect_changes(since, limit=None, context=None, user=None):
+    limit = limit or feed_option('PAGE_SIZE', 500)
+    cutoff = visible_before()
+    entries = list(
+        ChangeLogEntry.objects.filter(id__gt=since).order_by('id')[:limit + 1])
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    for index, entry in enumerate(entries):
+        if cutoff is not None and entry.created_at >= cutoff:
+            entries, has_more = entries[:index], False
+            break
+
+    if since and entries and entries[0].id > since + 1:
+        oldest = ChangeLogEntry.objects.order_by('id').values_list(
+            'id', flat=True).first()
+        if oldest > since + 1:
+            raise CursorExpired()
+
+    latest = {}
+    for entry in entries:
+        latest.pop((entry.model, entry.object_id), None)
+        latest[(entry.model, entry.object_id)] = entry
+    for entry in list(latest.values()):
+        if entry.model == 'subtask' and entry.task_id is not None:
+            latest.setdefault(('task', entry.task_id), ChangeLogEntry(
+                model='task', object_id=entry.task_id, action='updated',
+                task_id=entry.task_id))
+
+    return {
+        'cursor': entries[-1].id if entries else since,
+        'has_more': has_more,
+        'changes': serialize_changes(latest.values(), context or {}, user),
+    }
+
+
+def serialize_changes(entries, context, user=None):
+    alive = {}
+    for entry in entries:
+        if entry.action != 'deleted':
+            alive.setdefault(entry.model, []).append(entry.object_id)
+
+    tasks, subtasks = Task.objects.with_related(), Subtask.objects.all()
+    if user is not None:
+        tasks, subtasks = tasks.for_user(user), subtasks.for_user(user)
+    objects = {
+        'task': tasks.in_bulk(alive.get('task', [])),
+        'subtask': subtasks.in_bulk(alive.get('subtask', [])),
+        'userprofile': UserProfile.objects.select_related('user').in_bulk(
+            alive.get('userprofile', [])),
+    }
+
+    changes = []
+    for entry in entries:
+        change = {
+            'model': entry.model,
+            'id': entry.object_id,
+            'action': entry.action,
+            'data': None,
+        }
+        if entry.task_id is not None and entry.model == 'subtask':
+            change['task'] = entry.task_id
+
+        instance = objects[entry.model].get(entry.object_id)
+        if instance is None:
+            # Deleted later in the same window.
+            change['action'] = 'deleted'
+        elif entry.model == 'task':
+            change['data'] = TaskItemSerializer(instance, context=context).data
+        elif entry.model == 'subtask':
+            change['data'] = SubtaskSerializer(instance, context=context).data
+        else:
+            change['data'] = UserProfileSerializer(
+                instance, context=context).data
+        changes.append(change)
+    return changes
@@ -0,0 +1,109 @@
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+
+from todo_list.models import Task
+from todo_list.search import search_tasks
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    Query params of GET /api/tasks/ (all optional, combined with AND):
+
+        ?status=todo,in_progress      one or more values
+        ?priority=high                one or more values
+        ?category=user_story          one or more values
+        ?member=3,5                   tasks with any of these profile ids
+        ?mine=1                       tasks of the current user
+        ?due_after=2024-01-01         due_date >= (inclusive)
+        ?due_before=2024-01-31        due_date <= (inclusive)
+        ?checked=true|false
+        ?q=login bug                  title/description contain every word
+
+    Only builds the queryset (no queries), so it also works in the async
+    read views. Invalid values answer 400.
+    """
+    choice_params = {
+        'status': Task.STATUS_CHOICES,
+        'priority': Task.PRIORITY_CHOICES,
+        'category': Task.CATEGORY_CHOICES,
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        errors = {}
+
+        def parse(name, field):
+            try:
+                return field.run_validation(params[name])
+            except serializers.ValidationError as exc:
+                errors[name] = exc.detail
+                return None
+
+        filters = {}
+        for name, choices in self.choice_params.items():
+            if name in params:
+                values = self.split(params[name])
+                field = serializers.ChoiceField(choices=choices)
+                for value in values:
+                    try:
+                        field.run_validation(value)
+                    except serializers.ValidationError as exc:
+                        errors[name] = exc.detail
+                filters[f'{name}__in'] = values
+
+        if 'member' in params:
+            try:
+                member_ids = [int(value) for value in self.split(params['member'])]
+            except ValueError:
+                errors['member'] = ['Expected comma separated profile ids.']
+            else:
+                queryset = queryset.filter(pk__in=self.member_tasks(
+                    userprofile_id__in=member_ids))
+
+        if 'mine' in params and parse('mine', serializers.BooleanField()):
+            queryset = queryset.filter(pk__in=self.member_tasks(
+                userprofile__user_id=request.user.id))
+
+        for name, lookup in (('due_after', 'gte'), ('due_before', 'lte')):
+            if name in params:
+                filters[f'due_date__{lookup}'] = parse(
+                    name, serializers.DateField())
+
+        if 'checked' in params:
+            filters['checked'] = parse('checked', serializers.BooleanField())
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        queryset = queryset.filter(**filters)
+        if params.get('q', '').strip():
+            queryset = search_tasks(queryset, params['q'])
+        return queryset
+
+    @staticmethod
+    def split(value):
+        return [part.strip() for part in value.split(',') if part.strip()]
+
+    @staticmethod
+    def member_tasks(**lookups):
+        # A subquery on the members table instead of a join, so a task
+        # with several matching members is returned once (no DISTINCT).
+        return Task.members.through.objects.filter(
+            **lookups).values('task_id')
+
+
+class SubtaskFilterBackend(BaseFilterBackend):
+    """
+    ?task=5 on GET /api/subtask/: the subtasks of one task, read through
+    the index on todo_list_subtask.task_id. Invalid values answer 400.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if 'task' not in request.query_params:
+            return queryset
+        try:
+            task_id = serializers.IntegerField().run_validation(
+                request.query_params['task'])
+        except serializers.ValidationError as exc:
+            raise serializers.ValidationError({'task': exc.detail})
+        return queryset.filter(task_id=task_id)
@@ -0,0 +1,130 @@
+"""
+values()-based read path for GET /api/tasks/.
+
+TaskReader renders the same dicts as TaskItemSerializer (with the same
+?fields= / ?expand= handling) from plain rows: one values() query for
+the tasks plus one each for subtasks and members when they are part of
+the response. No model instances and no serializer fields per object.
+test_task_readers.py holds the contract with TaskItemSerializer, so
+output changes must be made in both places.
+"""
+from collections import defaultdict
+
+from todo_list.models import Subtask, Task, subtasks_progress
+from .serializers import TaskItemSerializer
+
+TASK_COLUMNS = [
+    'id', 'workspace', 'title', 'category', 'description', 'status', 'color',
+    'priority', 'created_at', 'due_date', 'checked',
+]
+DATE_COLUMNS = ('created_at', 'due_date')
+PROFILE_FIELDS = [
+    'id', 'phone_number', 'color', 'user__id', 'user__first_name',
+    'user__last_name', 'user__username', 'user__email',
+]
+
+
+def profile_columns(prefix=''):
+    return [prefix + name for name in PROFILE_FIELDS]
+
+
+def profile_data(row, prefix=''):
+    """
+    UserProfileSerializer output from a values(*profile_columns()) row.
+    """
+    return {
+        'id': row[prefix + 'id'],
+        'user': {
+            'id': row[prefix + 'user__id'],
+            'first_name': row[prefix + 'user__first_name'],
+            'last_name': row[prefix + 'user__last_name'],
+            'username': row[prefix + 'user__username'],
+            'email': row[prefix + 'user__email'],
+        },
+        'phone_number': row[prefix + 'phone_number'],
+        'color': row[prefix + 'color'],
+    }
+
+
+class TaskReader:
+
+    def __init__(self, fields=None, expand=frozenset({'members'})):
+        self.fields = [
+            name for name in TaskItemSerializer.Meta.fields
+            if fields is None or name in fields
+        ]
+        self.expand_members = 'members' in expand
+
+    def values(self, queryset):
+        """
+        The task rows. The keyset ordering columns are always included,
+        KeysetPagination builds its cursor from them.
+        """
+        columns = {'id', 'created_at', 'priority'}
+        columns.update(name for name in self.fields if name in TASK_COLUMNS)
+        if 'subtasks_progress' in self.fields:
+            columns.update(Task.COUNTER_FIELDS)
+        return queryset.values(*columns)
+
+    def subtask_query(self, task_ids):
+        if 'subtasks' not in self.fields:
+            return None
+        return Subtask.objects.filter(task_id__in=task_ids).order_by(
+            'id').values_list('task_id', 'id', 'title', 'status')
+
+    def member_query(self, task_ids):
+        if 'members' not in self.fields:
+            return None
+        columns = ['task_id', 'userprofile_id']
+        if self.expand_members:
+            columns = ['task_id', *profile_columns('userprofile__')]
+        return Task.members.through.objects.filter(
+            task_id__in=task_ids).order_by('userprofile_id').values(*columns)
+
+    def to_data(self, rows):
+        ids = [row['id'] for row in rows]
+        subtasks, members = self.subtask_query(ids), self.member_query(ids)
+        return self.build(
+            rows,
+            list(subtasks) if subtasks is not None else [],
+            list(members) if members is not None else [],
+        )
+
+    async def ato_data(self, rows):
+        ids = [row['id'] for row in rows]
+        subtasks, members = self.subtask_query(ids), self.member_query(ids)
+        return self.build(
+            rows,
+            [row async for row in subtasks] if subtasks is not None else [],
+            [row async for row in members] if members is not None else [],
+        )
+
+    def build(self, rows, subtask_rows, member_rows):
+        subtasks = defaultdict(list)
+        for task_id, pk, title, status in subtask_rows:
+            subtasks[task_id].append({'id': pk, 'title': title, 'status': status})
+
+        members = defaultdict(list)
+        for row in member_rows:
+            members[row['task_id']].append(
+                profile_data(row, 'userprofile__') if self.expand_members
+                else row['userprofile_id'])
+
+        data = []
+        for row in rows:
+            item = {}
+            for name in self.fields:
+                if name == 'subtasks':
+                    item[name] = subtasks.get(row['id'], [])
+                elif name == 'members':
+                    item[name] = members.get(row['id'], [])
+                elif name == 'subtasks_progress':
+                    item[name] = subtasks_progress(
+                        row['subtask_total'], row['subtask_done'])
+                elif name in DATE_COLUMNS:
+                    value = row[name]
+                    item[name] = value.isoformat() if value is not None else None
+                else:
+                    item[name] = row[name]
+            data.append(item)
+        return data
@@ -1,43 +1,204 @@
-from django.db import transaction
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
 
-from todo_list.models import Task, Subtask
+from todo_list.changes import record_changes
+from todo_list.counters import (
+    remember_state, subtask_counter_deltas, update_subtask_counters)
+from todo_list.models import Task, Subtask, Workspace, workspace_ids
+from todo_list.permisions import WorkspacePermission
+from todo_list.summary import invalidate_task_summary
 from user_auth_app.models import UserProfile
 from user_auth_app.api.serializers import UserProfileSerializer
 
 
+def parse_field_selection(request):
+    """
+    Reads ?fields=a,b,c and ?expand=members from a GET request.
+
+    Returns (fields, expand):
+        - fields: set of top-level fields to render, or None for all
+        - expand: set of relations rendered as full objects. Without any
+          params `members` is expanded (the legacy shape); once `fields`
+          is given members are plain ids unless `expand=members`.
+    """
+    if request is None or request.method != 'GET':
+        return None, {'members'}
+
+    def split(value):
+        return {part.strip() for part in value.split(',') if part.strip()}
+
+    params = request.query_params
+    fields = split(params['fields']) if 'fields' in params else None
+    if 'expand' in params:
+        expand = split(params['expand'])
+    else:
+        expand = {'members'} if fields is None else set()
+    return fields, expand
+
+
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """
+    ManyRelatedField that looks all primary keys up in one query,
+    instead of one get() per item.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        child = self.child_relation
+        queryset = child.get_queryset()
+        pks = []
+        for item in data:
+            if isinstance(item, bool):
+                child.fail('incorrect_type', data_type=type(item).__name__)
+            try:
+                pks.append(queryset.model._meta.pk.to_python(item))
+            except (DjangoValidationError, TypeError):
+                child.fail('incorrect_type', data_type=type(item).__name__)
+
+        objects = queryset.in_bulk(pks)
+        for item, pk in zip(data, pks):
+            if pk not in objects:
+                child.fail('does_not_exist', pk_value=item)
+        return [objects[pk] for pk in pks]
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+
+class WorkspaceField(serializers.PrimaryKeyRelatedField):
+    """
+    A workspace the requesting user may add tasks to. Without a request
+    in the context (internal use) any workspace is accepted.
+    """
+
+    def get_queryset(self):
+        request = self.context.get('request')
+        if request is None:
+            return Workspace.objects.all()
+        return Workspace.objects.for_user(request.user, write=True)
+
+
 class SubtaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = Subtask
         fields = ['id', 'title', 'status']
 
 
+class TaskSubtaskSerializer(SubtaskSerializer):
+    """
+    Nested subtask inside a task payload. `id` is writable here so that
+    update_subtasks can match incoming rows with the existing ones.
+    """
+    id = serializers.IntegerField(required=False)
+
+
+def write_subtasks(user, task_id, changed=(), created=()):
+    """
+    Saves changed and new subtasks of one task in one transaction: the
+    task's counter UPDATE, one bulk_update, one bulk_create and the change
+    log inserts.
+
+    The counter UPDATE is scoped to the tasks the user may change, so it
+    doubles as the existence and permission check: when it matches no row
+    Task.DoesNotExist is raised and nothing is written. The INSERTs do not
+    read the task first, its foreign key constraint guards them instead.
+    `changed` must be loaded with the same scope.
+    """
+    deltas, _ = subtask_counter_deltas(changed=changed, created=created)
+    total, done = deltas.get(task_id, (0, 0))
+    try:
+        with transaction.atomic():
+            if total or done:
+                tasks = Task.objects.for_user(user, write=True).filter(pk=task_id)
+                if not tasks.add_subtask_counts(total, done):
+                    raise Task.DoesNotExist()
+            if changed:
+                Subtask.objects.bulk_update(
+                    changed, ['title', 'status', 'updated_at'])
+                record_changes(changed, 'updated')
+            if created:
+                Subtask.objects.bulk_create(created)
+                record_changes(created, 'created')
+    except IntegrityError:
+        raise Task.DoesNotExist()
+    for subtask in [*changed, *created]:
+        remember_state(subtask)
+
+
 class TaskItemSerializer(serializers.ModelSerializer):
-    members = serializers.PrimaryKeyRelatedField(
+    workspace = WorkspaceField(required=False)
+    members = BulkPrimaryKeyRelatedField(
         queryset=UserProfile.objects.all(),
         many=True,
     )
-    subtasks = SubtaskSerializer(many=True)
+    subtasks = TaskSubtaskSerializer(many=True)
     subtasks_progress = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Task
         fields = [
-            'id', 'title', 'category', 'description', 'status',
+            'id', 'workspace', 'title', 'category', 'description', 'status',
             'color', 'priority', 'members', 'created_at', 'due_date',
             'checked', 'subtasks', 'subtasks_progress',
         ]
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields, self.expand = parse_field_selection(
+            self.context.get('request'))
+        if fields is not None:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+    def validate(self, attrs):
+        if self.instance is None and 'workspace' not in attrs:
+            attrs['workspace'] = self.default_workspace()
+        return attrs
+
+    def default_workspace(self):
+        """
+        Where tasks created without a workspace go: the default workspace
+        when the user may write there, otherwise their oldest writable one.
+        """
+        # Batches validate all their items with the same context.
+        if 'default_workspace' not in self.context:
+            self.context['default_workspace'] = self.fields[
+                'workspace'].get_queryset().order_by('-is_default', 'id').first()
+        workspace = self.context['default_workspace']
+        if workspace is None:
+            raise serializers.ValidationError(
+                {'workspace': 'You cannot add tasks to any workspace.'})
+        return workspace
+
     def create(self, validated_data):
         subtasks_data = validated_data.pop('subtasks', [])
         members = validated_data.pop('members', [])
 
         with transaction.atomic():
-            task = Task.objects.create(**validated_data)
+            task = Task.objects.create(
+                **validated_data, **self.count_subtasks(subtasks_data))
             task.members.set(members)
 
-            for subtask_data in subtasks_data:
-                Subtask.objects.create(task=task, **subtask_data)
+            subtasks = Subtask.objects.bulk_create([
+                Subtask(task=task, **self.split_subtask_id(subtask_data)[1])
+                for subtask_data in subtasks_data
+            ])
+            record_changes(subtasks, 'created')
 
         return task
 
@@ -45,17 +206,22 @@ class TaskItemSerializer(serializers.ModelSerializer):
         subtasks_data = validated_data.pop('subtasks', None)
         members_data = validated_data.pop('members', None)
 
-        self.update_task(instance, validated_data)
+        with transaction.atomic():
+            self.update_task(instance, validated_data)
 
-        if members_data is not None:
-            self.update_members(instance, members_data)
+            if members_data is not None:
+                self.update_members(instance, members_data)
 
-        if subtasks_data is not None:
-            self.update_subtasks(instance, subtasks_data)
+            if subtasks_data is not None:
+                self.update_subtasks(instance, subtasks_data)
 
         return instance
 
     def update_task(self, instance, validated_data):
+        workspace = validated_data.get('workspace')
+        if workspace is not None and workspace.pk != instance.workspace_id:
+            # post_save only drops the summary of the new workspace
+            invalidate_task_summary([instance.workspace_id])
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save()
@@ -64,27 +230,349 @@ class TaskItemSerializer(serializers.ModelSerializer):
         instance.members.set(members_data)
 
     def update_subtasks(self, instance, subtasks_data):
+        self.apply_subtask_changes(
+            *self.diff_subtasks(instance, subtasks_data))
+        instance.refresh_from_db(fields=Task.COUNTER_FIELDS)
+
+    def diff_subtasks(self, instance, subtasks_data):
+        """
+        Compares the incoming subtask list with the task's existing rows.
+        Returns (changed, created, deleted_ids); unchanged subtasks are in
+        none of them.
+        """
         existing_subtasks = {
             subtask.id: subtask for subtask in instance.subtasks.all()
         }
+        changed, created = [], []
+        now = timezone.now()
 
         for subtask_data in subtasks_data:
-            subtask_id = subtask_data.get('id')
+            subtask_id, subtask_data = self.split_subtask_id(subtask_data)
+            subtask = existing_subtasks.pop(subtask_id, None)
 
-            if subtask_id and subtask_id in existing_subtasks:
-                subtask = existing_subtasks.pop(subtask_id)
+            if subtask is None:
+                created.append(Subtask(task=instance, **subtask_data))
+            elif any(getattr(subtask, attr) != value
+                     for attr, value in subtask_data.items()):
                 for attr, value in subtask_data.items():
                     setattr(subtask, attr, value)
-                subtask.save()
-            else:
-                Subtask.objects.create(task=instance, **subtask_data)
+                subtask.updated_at = now
+                changed.append(subtask)
 
-        for subtask in existing_subtasks.values():
-            subtask.delete()
+        return changed, created, list(existing_subtasks)
+
+    @staticmethod
+    def apply_subtask_changes(changed, created, deleted_ids):
+        """
+        Writes a diff_subtasks() result with one bulk_update, one
+        bulk_create and one DELETE (plus the change log inserts and the
+        task counter updates).
+        """
+        with transaction.atomic():
+            if changed:
+                Subtask.objects.bulk_update(
+                    changed, ['title', 'status', 'updated_at'])
+                record_changes(changed, 'updated')
+            if created:
+                Subtask.objects.bulk_create(created)
+                record_changes(created, 'created')
+            update_subtask_counters(changed=changed, created=created)
+            if deleted_ids:
+                # Counted per row by the post_delete signal.
+                Subtask.objects.filter(pk__in=deleted_ids).delete()
+
+    @staticmethod
+    def count_subtasks(subtasks_data):
+        """
+        Initial counter values for a task created with these subtasks.
+        """
+        return {
+            'subtask_total': len(subtasks_data),
+            'subtask_done': sum(
+                bool(data.get('status', False)) for data in subtasks_data),
+        }
+
+    @staticmethod
+    def split_subtask_id(subtask_data):
+        """
+        Returns (id, fields) of a nested subtask payload, so the id is
+        only used for matching and never written as a primary key.
+        """
+        subtask_data = dict(subtask_data)
+        return subtask_data.pop('id', None), subtask_data
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
+        if 'members' not in representation or 'members' not in self.expand:
+            return representation
+        members = instance.members.all()
+        if 'members' not in getattr(instance, '_prefetched_objects_cache', {}):
+            # e.g. after create/update, members.set() drops the prefetch
+            members = members.select_related('user').order_by('id')
         representation['members'] = UserProfileSerializer(
-            instance.members.all(), many=True
+            members, many=True
         ).data
         return representation
+
+
+class TaskBatchOperationSerializer(serializers.Serializer):
+    OPERATIONS = ('create', 'update', 'delete')
+
+    op = serializers.ChoiceField(choices=OPERATIONS)
+    id = serializers.IntegerField(required=False)
+    data = serializers.DictField(required=False)
+
+    def validate(self, attrs):
+        if attrs['op'] != 'create' and 'id' not in attrs:
+            raise serializers.ValidationError(
+                {'id': f"This field is required for '{attrs['op']}'."})
+        if attrs['op'] != 'delete' and 'data' not in attrs:
+            raise serializers.ValidationError(
+                {'data': f"This field is required for '{attrs['op']}'."})
+        return attrs
+
+
+class TaskBatchSerializer(serializers.Serializer):
+    """
+    Many task creates/updates/deletes in one request:
+
+        {"operations": [
+            {"op": "create", "data": {...task payload...}},
+            {"op": "update", "id": 5, "data": {"status": "done"}},
+            {"op": "delete", "id": 7}
+        ]}
+
+    Every item is validated with TaskItemSerializer (updates are partial).
+    If any item is invalid nothing is written and `item_errors` holds the
+    per-item errors; otherwise everything is applied in one transaction
+    with bulk queries and save() returns the per-item results.
+    """
+    MAX_OPERATIONS = 200
+
+    operations = TaskBatchOperationSerializer(
+        many=True, allow_empty=False, max_length=MAX_OPERATIONS)
+
+    item_errors = None
+
+    def validate_operations(self, operations):
+        ids = [op['id'] for op in operations if op['op'] != 'create']
+        user = self.context['request'].user
+        tasks = Task.objects.with_related().for_user(user).in_bulk(ids)
+        writable = set()
+        if tasks:
+            writable = set(workspace_ids(user, write=True).values_list(
+                'workspace_id', flat=True))
+        self.items, errors, seen = [], [], set()
+
+        for index, operation in enumerate(operations):
+            op, task_id = operation['op'], operation.get('id')
+            result = {'index': index, 'op': op}
+            if task_id is not None:
+                result['id'] = task_id
+
+            if op != 'create' and task_id not in tasks:
+                errors.append({**result, 'status': 404,
+                               'errors': {'id': 'Task not found.'}})
+                continue
+            if op != 'create' and tasks[task_id].workspace_id not in writable:
+                errors.append({**result, 'status': 403, 'errors': {
+                    'id': WorkspacePermission.message}})
+                continue
+            if task_id in seen:
+                errors.append({**result, 'status': 400, 'errors': {
+                    'id': 'Task appears more than once in the batch.'}})
+                continue
+            if task_id is not None:
+                seen.add(task_id)
+
+            item = None
+            if op == 'create':
+                item = TaskItemSerializer(
+                    data=operation['data'], context=self.context)
+            elif op == 'update':
+                item = TaskItemSerializer(
+                    tasks[task_id], data=operation['data'], partial=True,
+                    context=self.context)
+            if item is not None and not item.is_valid():
+                errors.append(
+                    {**result, 'status': 400, 'errors': item.errors})
+                continue
+            self.items.append((result, tasks.get(task_id), item))
+
+        if errors:
+            self.item_errors = errors
+            raise serializers.ValidationError(
+                'One or more operations are invalid.')
+        return operations
+
+    def create(self, validated_data):
+        creates = [entry for entry in self.items if entry[0]['op'] == 'create']
+        updates = [entry for entry in self.items if entry[0]['op'] == 'update']
+        deletes = [entry for entry in self.items if entry[0]['op'] == 'delete']
+
+        # Updates can move tasks: the workspaces before and after count.
+        workspaces = {task.workspace_id for _, task, _ in updates + deletes}
+        with transaction.atomic():
+            self.bulk_create_tasks(creates)
+            self.bulk_update_tasks(updates)
+            if deletes:
+                Task.objects.filter(
+                    pk__in=[task.pk for _, task, _ in deletes]).delete()
+            # bulk_create / bulk_update send no post_save
+            workspaces.update(
+                item.validated_data['workspace'].pk for _, _, item in creates)
+            workspaces.update(task.workspace_id for _, task, _ in updates)
+            invalidate_task_summary(workspaces)
+
+        return self.get_results(creates, updates, deletes)
+
+    def bulk_create_tasks(self, creates):
+        if not creates:
+            return
+        tasks, members, subtasks = [], [], []
+        for _, _, item in creates:
+            data = dict(item.validated_data)
+            members.append(data.pop('members', []))
+            subtasks.append(data.pop('subtasks', []))
+            tasks.append(Task(
+                **data, **TaskItemSerializer.count_subtasks(subtasks[-1])))
+
+        Task.objects.bulk_create(tasks)
+
+        self.set_members(tasks, members)
+        subtasks = Subtask.objects.bulk_create([
+            Subtask(task=task, **TaskItemSerializer.split_subtask_id(data)[1])
+            for task, task_subtasks in zip(tasks, subtasks)
+            for data in task_subtasks
+        ])
+        record_changes(tasks + subtasks, 'created')
+        for (result, _, _), task in zip(creates, tasks):
+            result['id'] = task.pk
+
+    def bulk_update_tasks(self, updates):
+        if not updates:
+            return
+        fields = {'updated_at'}
+        now = timezone.now()
+        member_tasks, members = [], []
+        changed, created, deleted_ids = [], [], []
+
+        for _, task, item in updates:
+            data = dict(item.validated_data)
+            if 'members' in data:
+                member_tasks.append(task)
+                members.append(data.pop('members'))
+            if 'subtasks' in data:
+                diff = item.diff_subtasks(task, data.pop('subtasks'))
+                changed += diff[0]
+                created += diff[1]
+                deleted_ids += diff[2]
+            for attr, value in data.items():
+                setattr(task, attr, value)
+            fields.update(data)
+            task.updated_at = now
+
+        tasks = [task for _, task, _ in updates]
+        Task.objects.bulk_update(tasks, fields)
+        record_changes(tasks, 'updated')
+        if member_tasks:
+            Task.members.through.objects.filter(
+                task__in=member_tasks).delete()
+            self.set_members(member_tasks, members)
+        TaskItemSerializer.apply_subtask_changes(changed, created, deleted_ids)
+
+    @staticmethod
+    def set_members(tasks, members):
+        Membership = Task.members.through
+        Membership.objects.bulk_create([
+            Membership(task_id=task.pk, userprofile_id=profile_id)
+            for task, profiles in zip(tasks, members)
+            for profile_id in {profile.pk for profile in profiles}
+        ])
+
+    def get_results(self, creates, updates, deletes):
+        ids = [result['id'] for result, _, _ in creates + updates]
+        tasks = Task.objects.with_related().in_bulk(ids)
+
+        results = []
+        for result, _, _ in creates + updates:
+            result['status'] = 201 if result['op'] == 'create' else 200
+            result['data'] = TaskItemSerializer(
+                tasks[result['id']], context=self.context).data
+            results.append(result)
+        for result, _, _ in deletes:
+            result['status'] = 204
+            results.append(result)
+        return sorted(results, key=lambda result: result['index'])
+
+
+class SubtaskBulkItemSerializer(TaskSubtaskSerializer):
+    """
+    With `id`: changes the given fields of that subtask. Without: a new
+    subtask (`title` required).
+    """
+
+    class Meta(TaskSubtaskSerializer.Meta):
+        extra_kwargs = {'title': {'required': False}}
+
+    def validate(self, attrs):
+        if 'id' not in attrs and 'title' not in attrs:
+            raise serializers.ValidationError(
+                {'title': 'This field is required.'})
+        return attrs
+
+
+class SubtaskBulkSerializer(serializers.Serializer):
+    """
+    Many subtasks of one task (context['task_id']) in one request:
+
+        {"subtasks": [
+            {"id": 3, "status": true},
+            {"id": 4, "title": "Renamed"},
+            {"title": "New step", "status": false}
+        ]}
+
+    Everything is written in one transaction with bulk queries (see
+    write_subtasks); unchanged subtasks are not written. save() returns
+    the subtasks in payload order.
+    """
+    MAX_SUBTASKS = 200
+
+    subtasks = SubtaskBulkItemSerializer(
+        many=True, allow_empty=False, max_length=MAX_SUBTASKS)
+
+    def validate_subtasks(self, items):
+        ids = [item['id'] for item in items if 'id' in item]
+        if len(set(ids)) != len(ids):
+            raise serializers.ValidationError(
+                'A subtask appears more than once.')
+        self.existing = Subtask.objects.for_user(
+            self.context['request'].user, write=True,
+        ).filter(task_id=self.context['task_id']).in_bulk(ids)
+        missing = [pk for pk in ids if pk not in self.existing]
+        if missing:
+            raise serializers.ValidationError(
+                f'Subtasks not found: {", ".join(map(str, missing))}.')
+        return items
+
+    def save(self):
+        task_id = self.context['task_id']
+        now = timezone.now()
+        subtasks, changed, created = [], [], []
+        for item in self.validated_data['subtasks']:
+            subtask_id, data = TaskItemSerializer.split_subtask_id(item)
+            if subtask_id is None:
+                subtask = Subtask(task_id=task_id, **data)
+                created.append(subtask)
+            else:
+                subtask = self.existing[subtask_id]
+                if any(getattr(subtask, attr) != value
+                       for attr, value in data.items()):
+                    for attr, value in data.items():
+                        setattr(subtask, attr, value)
+                    subtask.updated_at = now
+                    changed.append(subtask)
+            subtasks.append(subtask)
+
+        write_subtasks(self.context['request'].user, task_id, changed, created)
+        return SubtaskSerializer(subtasks, many=True).data
@@ -0,0 +1,152 @@
+"""
+Counter stores for the sliding-window throttles (see throttling.py).
+
+A store keeps one integer per (throttle key, window) and must be shared by
+all worker processes, otherwise every gunicorn worker counts on its own:
+
+    - CacheThrottleStore  -> a Django cache alias (Redis in production)
+    - SQLiteThrottleStore -> a shared SQLite file (single host / tests)
+
+The store is selected with settings.THROTTLE_STORE:
+
+    THROTTLE_STORE = {
+        "BACKEND": "todo_list.api.throttle_stores.CacheThrottleStore",
+        "OPTIONS": {"alias": "default"},
+    }
+"""
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+class BaseThrottleStore:
+
+    def hit(self, key, previous_key, ttl, limit, weight):
+        """
+        Counts one request in `key` (created with `ttl` seconds to live)
+        if `value of previous_key * weight + value of key` stays within
+        `limit` with it, atomically. Rejected requests are not counted.
+
+        Returns (allowed, value of key, value of previous_key).
+        """
+        raise NotImplementedError('.hit() must be overridden')
+
+    @staticmethod
+    def within_limit(current, previous, limit, weight):
+        return previous * weight + current <= limit
+
+
+class CacheThrottleStore(BaseThrottleStore):
+    """
+    Uses cache.add/cache.incr/cache.decr, which are atomic on Redis and
+    Memcached: a rejected request is counted and taken back, so for that
+    moment a concurrent request can see one request too many.
+    With the LocMemCache fallback the counters are per process only.
+    """
+
+    def __init__(self, alias='default'):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def hit(self, key, previous_key, ttl, limit, weight):
+        cache = self.cache
+        cache.add(key, 0, ttl)
+        try:
+            current = cache.incr(key)
+        except ValueError:
+            # The key expired between add() and incr().
+            cache.add(key, 1, ttl)
+            current = 1
+        previous = cache.get(previous_key, 0)
+        if self.within_limit(current, previous, limit, weight):
+            return True, current, previous
+        try:
+            cache.decr(key)
+        except ValueError:
+            # Expired in the meantime, nothing to take back.
+            pass
+        return False, current - 1, previous
+
+
+class SQLiteThrottleStore(BaseThrottleStore):
+    """
+    Counters in a SQLite file that every worker on the host opens.
+    Expired rows are purged every `purge_every` hits.
+    """
+
+    def __init__(self, path, timeout=5.0, purge_every=1000):
+        self.path = str(path)
+        self.timeout = timeout
+        self.purge_every = purge_every
+        self.local = threading.local()
+        self.hits = 0
+
+    def get_connection(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS throttle_counter ('
+                ' key TEXT PRIMARY KEY,'
+                ' value INTEGER NOT NULL,'
+                ' expires_at REAL NOT NULL)'
+            )
+            self.local.connection = connection
+        return connection
+
+    def hit(self, key, previous_key, ttl, limit, weight):
+        now = time.time()
+        connection = self.get_connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            rows = dict(connection.execute(
+                'SELECT key, value FROM throttle_counter'
+                ' WHERE key IN (?, ?) AND expires_at > ?',
+                (key, previous_key, now),
+            ).fetchall())
+            current, previous = rows.get(key, 0), rows.get(previous_key, 0)
+            allowed = self.within_limit(current + 1, previous, limit, weight)
+            if allowed:
+                connection.execute(
+                    'INSERT INTO throttle_counter (key, value, expires_at)'
+                    ' VALUES (?, 1, ?)'
+                    ' ON CONFLICT(key) DO UPDATE SET value = value + 1',
+                    (key, now + ttl),
+                )
+                current += 1
+            self.hits += 1
+            if self.hits % self.purge_every == 0:
+                connection.execute(
+                    'DELETE FROM throttle_counter WHERE expires_at <= ?',
+                    (now,))
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return allowed, current, previous
+
+
+@lru_cache(maxsize=None)
+def get_throttle_store():
+    config = getattr(settings, 'THROTTLE_STORE', {})
+    backend = import_string(config.get(
+        'BACKEND', 'todo_list.api.throttle_stores.CacheThrottleStore'))
+    return backend(**config.get('OPTIONS', {}))
+
+
+@receiver(setting_changed)
+def reset_throttle_store(setting, **kwargs):
+    if setting == 'THROTTLE_STORE':
+        get_throttle_store.cache_clear()
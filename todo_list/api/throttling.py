@@ -1,7 +1,64 @@
-from rest_framework.throttling import UserRateThrottle
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 
+from .throttle_stores import get_throttle_store
 
-class TaskThrottle(UserRateThrottle):
+
+class SlidingWindowMixin:
+    """
+    Replaces DRF's timestamp-history throttling with a sliding-window
+    counter: two integers per client (current and previous window), stored
+    in the shared throttle store, so cost per request stays constant no
+    matter how high the rate is.
+
+    The request count is estimated as
+        previous * (1 - elapsed / duration) + current
+    Like DRF's throttles, only allowed requests are counted: a client that
+    keeps retrying gets through again as soon as the window slides.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, elapsed = divmod(self.now, self.duration)
+        self.elapsed = elapsed
+        allowed, self.current, self.previous = get_throttle_store().hit(
+            f'{self.key}:{int(window)}',
+            f'{self.key}:{int(window) - 1}',
+            self.duration * 2,
+            limit=self.num_requests,
+            weight=1 - elapsed / self.duration,
+        )
+        if not allowed:
+            return self.throttle_failure()
+        return True
+
+    def wait(self):
+        """
+        Seconds until the estimate leaves room for one more request.
+        """
+        remaining = self.duration - self.elapsed
+        if self.current >= self.num_requests or not self.previous:
+            return remaining
+        # previous * (1 - t / duration) + current + 1 <= num_requests
+        ratio = (self.num_requests - self.current - 1) / self.previous
+        return max(self.duration * (1 - ratio) - self.elapsed, 0)
+
+
+class AnonThrottle(SlidingWindowMixin, AnonRateThrottle):
+    pass
+
+
+class UserThrottle(SlidingWindowMixin, UserRateThrottle):
+    pass
+
+
+class TaskThrottle(SlidingWindowMixin, UserRateThrottle):
     """
     Допълнителен throttle само за write методи към Task/Subtask.
     GET/HEAD/OPTIONS не се ограничават тук (важат само глобалните anon/user).
@@ -1,11 +1,21 @@
 from django.contrib import admin
 from django.urls import path, include
 
-from todo_list.api.views import SubtaskDetailView, TaskListCreateView, TaskDetailView, SubtaskListCreateView
+from todo_list_backend.async_views import read_view
+from todo_list.api.views import SubtaskBulkView, SubtaskDetailView, TaskBatchView, TaskChangesView, TaskListCreateView, TaskDetailView, TaskSummaryView, SubtaskListCreateView, task_changes_stream
 
 urlpatterns = [
-    path('tasks/', TaskListCreateView.as_view(), name='task-list'),
-    path('tasks/<int:pk>/', TaskDetailView.as_view(), name='task-detail'),
+    path('tasks/', read_view(TaskListCreateView), name='task-list'),
+    path('tasks/batch/', TaskBatchView.as_view(), name='task-batch'),
+    path('tasks/summary/', TaskSummaryView.as_view(), name='task-summary'),
+    path('tasks/changes/', TaskChangesView.as_view(), name='task-changes'),
+    path('tasks/changes/stream/', task_changes_stream,
+         name='task-changes-stream'),
+    path('tasks/<int:pk>/', read_view(TaskDetailView), name='task-detail'),
+    path('tasks/<int:task_pk>/subtasks/',
+         SubtaskListCreateView.as_view(), name='task-subtask-list'),
+    path('tasks/<int:task_pk>/subtasks/bulk/',
+         SubtaskBulkView.as_view(), name='task-subtask-bulk'),
     path('subtask/', SubtaskListCreateView.as_view(), name='subtask-list'),
     path('subtask/<int:pk>/',
          SubtaskDetailView.as_view(), name='subtask-detail'),
@@ -1,36 +1,142 @@
-from todo_list.models import Subtask, Task
-from .serializers import TaskItemSerializer, SubtaskSerializer
+import asyncio
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.views import APIView
+
+from django.contrib.auth.models import User
+
+from todo_list.models import Subtask, Task, WorkspaceMembership
+from todo_list.permisions import WorkspacePermission
+from todo_list.summary import get_task_summary
+from todo_list_backend.async_views import (
+    AsyncListModelMixin, AsyncRetrieveModelMixin)
+from todo_list_backend.conditional import ConditionalGetMixin
+from todo_list_backend.middleware import timing
+from todo_list_backend.renderers import FastJSONRenderer
+from todo_list_backend.response_cache import ResponseCacheMixin
+from user_auth_app.authentication import CookieJWTAuthentication
+from user_auth_app.models import UserProfile
+from .changes import CursorExpired, collect_changes, feed_option, latest_cursor
+from .filters import SubtaskFilterBackend, TaskFilterBackend
+from .pagination import KeysetPagination
+from .readers import TaskReader
+from .serializers import (
+    SubtaskBulkSerializer, TaskBatchSerializer, TaskItemSerializer,
+    SubtaskSerializer, parse_field_selection, write_subtasks)
 from .throttling import TaskThrottle
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from rest_framework import permissions, serializers, status, generics
 
 
-class TaskListCreateView(generics.ListCreateAPIView):
+TASK_RESPONSE_MODELS = (Task, Subtask, UserProfile, User, WorkspaceMembership)
+
+
+class TaskListCreateView(ConditionalGetMixin, ResponseCacheMixin, AsyncListModelMixin, generics.ListCreateAPIView):
     """
     GET  /api/tasks/        -> list of tasks
     POST /api/tasks/        -> create new task (with members + subtasks)
+
+    GET query params (all optional):
+        ?status=todo&mine=1&q=.. -> filters and search (see TaskFilterBackend)
+        ?page_size=50&cursor=... -> keyset pagination ({next, results})
+        ?fields=id,title,status  -> render only these fields
+        ?expand=members          -> members as full profiles instead of ids
+
+    Only the tasks of the user's workspaces are listed; POST takes an
+    optional `workspace` (default: see TaskItemSerializer.default_workspace).
+
+    GET answers If-None-Match with 304, and is served
+    from the response cache when RESPONSE_CACHE is configured.
+    Under ASGI GET is served async (see todo_list_backend/async_views.py).
     """
     queryset = Task.objects.all()
 
     serializer_class = TaskItemSerializer
+    filter_backends = [TaskFilterBackend]
+    pagination_class = KeysetPagination
     throttle_classes = [TaskThrottle]
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [WorkspacePermission]
+    response_cache_models = TASK_RESPONSE_MODELS
+    response_cache_per_user = True
+
+    def get_queryset(self):
+        return Task.objects.for_user(self.request.user)
+
+    def get_version_querysets(self):
+        user = self.request.user
+        return [
+            Task.objects.for_user(user),
+            Subtask.objects.for_user(user),
+            UserProfile.objects.all(),
+        ]
+
+    def get_reader(self):
+        return TaskReader(*parse_field_selection(self.request))
+
+    def list(self, request, *args, **kwargs):
+        """
+        Rendered by TaskReader from values() rows instead of running
+        TaskItemSerializer per task (same output, see readers.py).
+        """
+        reader = self.get_reader()
+        rows = reader.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        rows = list(rows) if page is None else page
+        with timing(request, 'serialize'):
+            data = reader.to_data(rows)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    async def alist(self, request, *args, **kwargs):
+        reader = self.get_reader()
+        rows = reader.values(self.filter_queryset(self.get_queryset()))
+        page = await sync_to_async(self.paginate_queryset)(rows)
+        rows = [row async for row in rows] if page is None else page
+        with timing(request, 'serialize'):
+            data = await reader.ato_data(rows)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
 
     def perform_create(self, serializer):
         serializer.save()
 
 
-class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TaskDetailView(ConditionalGetMixin, ResponseCacheMixin, AsyncRetrieveModelMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     GET    /api/tasks/<id>/ -> retrieve single task
     PUT    /api/tasks/<id>/ -> partial update (title, status, members, subtasks, ...)
     PATCH  /api/tasks/<id>/ -> partial update
     DELETE /api/tasks/<id>/ -> delete task
+
+    Tasks outside the user's workspaces are 404; changes need a writing
+    role in the task's workspace (WorkspacePermission).
+    GET answers If-None-Match with 304, uses the response cache and is
+    served async under ASGI.
     """
-    queryset = Task.objects.all()
+    queryset = Task.objects.with_related()
     serializer_class = TaskItemSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [WorkspacePermission]
     throttle_classes = [TaskThrottle]
+    response_cache_models = TASK_RESPONSE_MODELS
+    response_cache_per_user = True
+    version_object = True
+
+    def get_queryset(self):
+        return Task.objects.with_related().for_user(self.request.user)
+
+    def get_version_querysets(self):
+        pk = self.kwargs['pk']
+        return [
+            Task.objects.for_user(self.request.user).filter(pk=pk),
+            Subtask.objects.filter(task_id=pk),
+            UserProfile.objects.filter(tasks_as_member=pk),
+        ]
 
     def update(self, request, *args, **kwargs):
         """
@@ -41,36 +147,260 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
         return super().update(request, *args, **kwargs)
 
 
+class TaskBatchView(generics.GenericAPIView):
+    """
+    POST /api/tasks/batch/  -> many create/update/delete operations at once
+                               (see TaskBatchSerializer for the payload)
+
+    All-or-nothing: 200 with per-item results, or 400 with per-item errors
+    and nothing written. Counts as one request for the task-write throttle.
+    """
+    serializer_class = TaskBatchSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [TaskThrottle]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            errors = serializer.errors
+            if serializer.item_errors:
+                errors = {'results': serializer.item_errors}
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'results': serializer.save()})
+
+
+class TaskSummaryView(APIView):
+    """
+    GET /api/tasks/summary/  -> board counters
+        {"total": 12, "by_status": {"todo": 4, ...}, "by_priority": {...},
+         "urgent": 2, "next_due_date": "2024-05-01",
+         "next_urgent_due_date": "2024-05-03",
+         "members": [{"id": 3, "user": 7, "total": 5, "open": 3}, ...],
+         "mine": {"total": 5, "open": 3}}
+
+    Counts the tasks of the user's workspaces. `urgent` and the due dates
+    only count tasks that are not done. Cached per workspace until the
+    next write to one of its tasks.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        summary = get_task_summary(request.user)
+        mine = next(
+            (member for member in summary['members']
+             if member['user'] == request.user.id), None)
+        return Response({
+            **summary,
+            'mine': {
+                'total': mine['total'] if mine else 0,
+                'open': mine['open'] if mine else 0,
+            },
+        })
+
+
+class TaskChangesView(APIView):
+    """
+    GET /api/tasks/changes/?since=<cursor>  -> deltas after the cursor
+        {"cursor": 42, "has_more": false, "changes": [
+            {"model": "task", "id": 5, "action": "updated", "data": {...}},
+            {"model": "subtask", "id": 9, "task": 5, "action": "deleted", "data": null}
+        ]}
+
+    Without `since` only the current cursor is returned (load the full list
+    first, then follow the feed). ?wait=<seconds> long-polls until there is
+    a change, at most CHANGE_FEED["MAX_WAIT"] seconds (capped in settings
+    well below the gunicorn worker timeout). A waiting client holds a sync
+    worker the whole time; many waiting clients should use the SSE stream
+    (/api/tasks/changes/stream/) under ASGI.
+    Changes show up CHANGE_FEED["VISIBILITY_LAG"] seconds after they were
+    written (see todo_list/api/changes.py).
+    410 means the cursor is older than the retained log -> full reload.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        since = self.get_int_param('since')
+        if since is None:
+            return Response(
+                {'cursor': latest_cursor(), 'has_more': False, 'changes': []})
+
+        wait = min(self.get_int_param('wait') or 0,
+                   feed_option('MAX_WAIT', 25))
+        deadline = time.monotonic() + wait
+        context = self.get_serializer_context()
+        try:
+            while True:
+                payload = collect_changes(
+                    since, context=context, user=request.user)
+                if payload['changes'] or time.monotonic() >= deadline:
+                    return Response(payload)
+                time.sleep(feed_option('POLL_INTERVAL', 1))
+        except CursorExpired:
+            return Response(
+                {'detail': 'Cursor expired, reload the task list.'},
+                status=status.HTTP_410_GONE)
+
+    def get_int_param(self, name):
+        value = self.request.query_params.get(name)
+        if value in (None, ''):
+            return None
+        try:
+            return max(int(value), 0)
+        except ValueError:
+            raise serializers.ValidationError({name: 'Must be an integer.'})
+
+    def get_serializer_context(self):
+        return {'request': self.request, 'view': self}
+
+
+async def task_changes_stream(request):
+    """
+    GET /api/tasks/changes/stream/?since=<cursor>  (text/event-stream)
+
+    Server-sent events version of TaskChangesView for the ASGI entry point
+    (todo_list_backend/asgi.py): one `changes` event per batch of deltas,
+    event ids are cursors so EventSource resumes via Last-Event-ID.
+    The stream ends after CHANGE_FEED["STREAM_SECONDS"]; clients reconnect.
+
+    404 unless SERVER_MODE=asgi: a sync worker would buffer the whole
+    stream (nothing reaches the client until it ends) and be blocked for
+    STREAM_SECONDS, longer than the gunicorn timeout.
+    """
+    if settings.SERVER_MODE != 'asgi':
+        return JsonResponse(
+            {'detail': 'The change stream needs SERVER_MODE=asgi; '
+                       'long-poll /api/tasks/changes/?wait= instead.'},
+            status=status.HTTP_404_NOT_FOUND)
+
+    authenticator = CookieJWTAuthentication()
+    result = await sync_to_async(authenticator.authenticate)(request)
+    if result is None:
+        return JsonResponse(
+            {'detail': 'Authentication credentials were not provided.'},
+            status=status.HTTP_401_UNAUTHORIZED)
+    user = result[0]
+
+    since = request.headers.get('Last-Event-ID') or request.GET.get('since')
+    try:
+        since = max(int(since), 0)
+    except (TypeError, ValueError):
+        since = await sync_to_async(latest_cursor)()
+
+    renderer = FastJSONRenderer()
+    poll_interval = feed_option('POLL_INTERVAL', 1)
+    keepalive = feed_option('KEEPALIVE_SECONDS', 15)
+    stream_seconds = feed_option('STREAM_SECONDS', 300)
+    load = sync_to_async(collect_changes)
+
+    async def events():
+        cursor = since
+        started = last_sent = time.monotonic()
+        yield f'retry: {poll_interval * 1000}\n\n'
+        while time.monotonic() - started < stream_seconds:
+            try:
+                payload = await load(cursor, user=user)
+            except CursorExpired:
+                yield 'event: expired\ndata: {}\n\n'
+                return
+            if payload['changes']:
+                cursor = payload['cursor']
+                data = renderer.render(payload).decode()
+                yield f'id: {cursor}\nevent: changes\ndata: {data}\n\n'
+                last_sent = time.monotonic()
+                if payload['has_more']:
+                    continue
+            elif time.monotonic() - last_sent >= keepalive:
+                yield ': keep-alive\n\n'
+                last_sent = time.monotonic()
+            await asyncio.sleep(poll_interval)
+
+    response = StreamingHttpResponse(
+        events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 # ==========================
 # SUBTASK VIEWS
 # ==========================
 class SubtaskListCreateView(generics.ListCreateAPIView):
     """
-    GET  /api/subtasks/     -> list of all subtasks (ако изобщо ти трябва)
-    POST /api/subtasks/     -> create subtask for given task (payload-а съдържа task id)
+    GET  /api/subtask/              -> subtasks of the user's workspaces
+    GET  /api/subtask/?task=5       -> subtasks of one task
+    POST /api/subtask/              -> create subtask (payload-а съдържа task id)
+
+    GET  /api/tasks/<id>/subtasks/  -> same, with the task in the URL
+    POST /api/tasks/<id>/subtasks/
     """
     queryset = Subtask.objects.all()
     serializer_class = SubtaskSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [SubtaskFilterBackend]
+    permission_classes = [WorkspacePermission]
     throttle_classes = [TaskThrottle]
 
+    def get_queryset(self):
+        queryset = Subtask.objects.for_user(self.request.user)
+        if 'task_pk' in self.kwargs:
+            queryset = queryset.filter(task_id=self.kwargs['task_pk'])
+        return queryset
+
+    def get_task_id(self):
+        if 'task_pk' in self.kwargs:
+            return self.kwargs['task_pk']
+        task_id = self.request.data.get("task")
+        if not task_id:
+            raise serializers.ValidationError({"task": "Task ID is required."})
+        try:
+            return serializers.IntegerField().run_validation(task_id)
+        except serializers.ValidationError:
+            raise serializers.ValidationError({"task": "Task not found."})
+
     def perform_create(self, serializer):
         """
         В стария код:
             - task_id идваше от request.data["task"]
             - SubtaskSerializer НЯМА поле task => подаваме го ръчно
-        Запазваме същото поведение тук.
+        Запазваме същото поведение тук. The task is not read first, see
+        write_subtasks.
         """
-        task_id = self.request.data.get("task")
-        if not task_id:
-            raise serializers.ValidationError({"task": "Task ID is required."})
-
+        task_id = self.get_task_id()
+        subtask = Subtask(task_id=task_id, **serializer.validated_data)
         try:
-            task = Task.objects.get(pk=task_id)
+            write_subtasks(self.request.user, task_id, created=[subtask])
         except Task.DoesNotExist:
+            if 'task_pk' in self.kwargs:
+                raise NotFound("Task not found.")
             raise serializers.ValidationError({"task": "Task not found."})
+        serializer.instance = subtask
 
-        serializer.save(task=task)
+
+class SubtaskBulkView(generics.GenericAPIView):
+    """
+    POST /api/tasks/<id>/subtasks/bulk/  -> toggle, rename and create many
+        subtasks of the task at once (see SubtaskBulkSerializer)
+
+    One transaction; 200 with the subtasks in payload order, 400 when an
+    item is invalid (nothing written), 404 when the task is not found in
+    the user's writable workspaces. Counts as one request for the
+    task-write throttle.
+    """
+    serializer_class = SubtaskBulkSerializer
+    permission_classes = [WorkspacePermission]
+    throttle_classes = [TaskThrottle]
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(),
+                'task_id': self.kwargs['task_pk']}
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            subtasks = serializer.save()
+        except Task.DoesNotExist:
+            raise NotFound("Task not found.")
+        return Response({'subtasks': subtasks})
 
 
 class SubtaskDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -79,12 +409,18 @@ class SubtaskDetailView(generics.RetrieveUpdateDestroyAPIView):
     PUT    /api/subtasks/<id>/ -> partial update
     PATCH  /api/subtasks/<id>/ -> partial update
     DELETE /api/subtasks/<id>/ -> delete subtask
+
+    Same workspace scoping and permissions as the task detail.
     """
     queryset = Subtask.objects.all()
     serializer_class = SubtaskSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [WorkspacePermission]
     throttle_classes = [TaskThrottle]
 
+    def get_queryset(self):
+        return Subtask.objects.for_user(
+            self.request.user).select_related('task')
+
     def update(self, request, *args, **kwargs):
         kwargs["partial"] = True
         return super().update(request, *args, **kwargs)
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class TodoListConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'todo_list'
+
+    def ready(self):
+        import todo_list.signals
+        # Connect the request/connection counters before the first request.
+        import todo_list_backend.metrics
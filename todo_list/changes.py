@@ -0,0 +1,42 @@
+from todo_list.models import ChangeLogEntry, Subtask, Task
+from todo_list_backend.response_cache import bump_versions
+from user_auth_app.models import UserProfile
+
+MODEL_NAMES = {
+    Task: 'task',
+    Subtask: 'subtask',
+    UserProfile: 'userprofile',
+}
+
+
+def get_task_id(instance):
+    if isinstance(instance, Task):
+        return instance.pk
+    return getattr(instance, 'task_id', None)
+
+
+def record_change(instance, action):
+    ChangeLogEntry.objects.create(
+        model=MODEL_NAMES[type(instance)],
+        object_id=instance.pk,
+        action=action,
+        task_id=get_task_id(instance),
+    )
+
+
+def record_changes(instances, action):
+    """
+    One INSERT for many objects. Used after bulk_create / bulk_update,
+    which do not send post_save, so it also bumps the response cache
+    versions the signals would have bumped.
+    """
+    bump_versions(*instances)
+    ChangeLogEntry.objects.bulk_create([
+        ChangeLogEntry(
+            model=MODEL_NAMES[type(instance)],
+            object_id=instance.pk,
+            action=action,
+            task_id=get_task_id(instance),
+        )
+        for instance in instances
+    ])
@@ -0,0 +1,78 @@
+"""
+Keeps Task.subtask_total / Task.subtask_done in step with the subtasks.
+
+Single-object saves and deletes are handled by the signals in
+todo_list/signals.py. Bulk queries (bulk_create, bulk_update) bypass the
+signals, so code using them calls update_subtask_counters() itself.
+
+Every Subtask remembers the (task_id, status) it was loaded or last
+counted with, so an update only touches the counters when one of the two
+actually changed.
+"""
+from collections import defaultdict
+
+from todo_list.models import Task
+
+UNKNOWN = object()
+
+
+def subtask_state(subtask):
+    return subtask.task_id, bool(subtask.status)
+
+
+def remember_state(subtask):
+    subtask._counted_state = subtask_state(subtask)
+
+
+def remember_loaded_state(subtask):
+    """
+    post_init hook. Instances loaded without task_id or status (.only(),
+    .defer()) get UNKNOWN and their task is recounted on save.
+    """
+    if 'task_id' in subtask.__dict__ and 'status' in subtask.__dict__:
+        remember_state(subtask)
+    else:
+        subtask._counted_state = UNKNOWN
+
+
+def subtask_counter_deltas(changed=(), created=(), deleted=()):
+    """
+    Returns ({task_id: [total, done]}, {task ids to recount}) for
+    subtasks that were just saved, created or deleted.
+    """
+    deltas, recount = defaultdict(lambda: [0, 0]), set()
+
+    def add(state, sign):
+        if state is not None and state[0] is not None:
+            deltas[state[0]][0] += sign
+            deltas[state[0]][1] += sign * state[1]
+
+    for subtask in created:
+        add(subtask_state(subtask), 1)
+    for subtask in [*changed, *deleted]:
+        old = getattr(subtask, '_counted_state', UNKNOWN)
+        if old is UNKNOWN:
+            if subtask.task_id is not None:
+                recount.add(subtask.task_id)
+            continue
+        add(old, -1)
+    for subtask in changed:
+        if subtask._counted_state is not UNKNOWN:
+            add(subtask_state(subtask), 1)
+    return deltas, recount
+
+
+def update_subtask_counters(changed=(), created=(), deleted=()):
+    """
+    Applies the counter changes caused by the given subtasks with one F()
+    UPDATE per affected task.
+    """
+    deltas, recount = subtask_counter_deltas(changed, created, deleted)
+    for task_id, (total, done) in deltas.items():
+        if (total or done) and task_id not in recount:
+            Task.objects.filter(pk=task_id).add_subtask_counts(total, done)
+    if recount:
+        Task.objects.filter(pk__in=recount).recount_subtasks()
+    for subtask in [*changed, *created]:
+        remember_state(subtask)
+
@@ -0,0 +1,334 @@
+import json
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from itertools import cycle
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import (
+    CaptureQueriesContext, setup_test_environment, teardown_test_environment)
+from django.urls import reverse
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+from rest_framework.throttling import SimpleRateThrottle
+
+from todo_list.models import Subtask, Task, Workspace, WorkspaceMembership
+from user_auth_app.models import UserProfile
+
+PASSWORD = 'bench-password'
+# Not counted as queries, so the counts are the same with --current-db,
+# where transactions become savepoints.
+TRANSACTION_STATEMENTS = ('BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE SAVEPOINT')
+
+# Most queries a single request of each scenario may run (--budget).
+# They must not depend on the size of the dataset: a budget that has to
+# grow with --tasks or --members is an N+1.
+QUERY_BUDGETS = {
+    'task-list': 6,
+    'task-list-page': 6,
+    'task-detail': 6,
+    'subtask-list': 1,
+    'user-contacts': 2,
+    'user-login': 2,
+    # Writes include one workspace check (todo_list/permisions.py).
+    'task-create': 12,
+    'task-update': 9,
+    # The counter UPDATE is the workspace check (write_subtasks).
+    'subtask-create': 3,
+    'subtask-update': 5,
+    'subtask-bulk': 6,
+}
+
+
+def percentile(values, fraction):
+    """
+    Nearest-rank percentile of sorted values.
+    """
+    if not values:
+        return None
+    index = max(int(round(fraction * len(values) + 0.5)) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+@contextmanager
+def unthrottled():
+    """
+    Keeps the throttles in the measured path, with rates no benchmark
+    reaches. DRF reads the rates once, at import.
+    """
+    rates = SimpleRateThrottle.THROTTLE_RATES
+    SimpleRateThrottle.THROTTLE_RATES = {
+        scope: '1000000000/day' for scope in api_settings.DEFAULT_THROTTLE_RATES}
+    try:
+        yield
+    finally:
+        SimpleRateThrottle.THROTTLE_RATES = rates
+
+
+class Dataset:
+    """
+    Bulk-inserted benchmark data: users with profiles, split round-robin
+    over workspaces, and tasks with subtasks and members in them. The
+    measured user sees one workspace, i.e. tasks / workspaces tasks.
+    """
+
+    def __init__(self, users, tasks, subtasks, members, workspaces=1):
+        self.sizes = {
+            'users': users, 'tasks': tasks,
+            'subtasks_per_task': subtasks, 'members_per_task': members,
+            'workspaces': workspaces,
+        }
+        self.workspaces = Workspace.objects.bulk_create([
+            Workspace(name=f'Bench workspace {i}') for i in range(workspaces)
+        ])
+        password = make_password(PASSWORD)
+        self.users = User.objects.bulk_create([
+            User(username=f'bench-{i}', email=f'bench-{i}@example.com',
+                 first_name='Bench', last_name=f'User {i}', password=password)
+            for i in range(users)
+        ])
+        self.profiles = UserProfile.objects.bulk_create([
+            UserProfile(user=user, phone_number='', color=color)
+            for user, color in zip(self.users, cycle(['green', 'blue', 'red']))
+        ])
+        WorkspaceMembership.objects.bulk_create([
+            WorkspaceMembership(workspace=self.workspace(i), profile=profile)
+            for i, profile in enumerate(self.profiles)
+        ])
+
+        statuses = cycle(status for status, _ in Task.STATUS_CHOICES)
+        priorities = cycle(priority for priority, _ in Task.PRIORITY_CHOICES)
+        self.tasks = Task.objects.bulk_create([
+            Task(workspace=self.workspace(i), title=f'Bench task {i}',
+                 description='Benchmark task', color='blue',
+                 status=next(statuses), priority=next(priorities),
+                 due_date=date.today() + timedelta(days=i % 30),
+                 subtask_total=subtasks, subtask_done=subtasks // 2)
+            for i in range(tasks)
+        ])
+        self.subtasks = Subtask.objects.bulk_create([
+            Subtask(title=f'Step {n}', task=task, status=n < subtasks // 2)
+            for task in self.tasks for n in range(subtasks)
+        ])
+        Task.members.through.objects.bulk_create([
+            Task.members.through(task=task, userprofile=profile)
+            for i, task in enumerate(self.tasks)
+            for profile in self.task_members(i, members)
+        ])
+
+        # The measured user is in the first workspace.
+        self.own_tasks = self.tasks[::workspaces]
+        self.own_subtasks = [
+            subtask for subtask in self.subtasks
+            if subtask.task.workspace_id == self.workspaces[0].pk]
+
+    def workspace(self, i):
+        return self.workspaces[i % len(self.workspaces)]
+
+    def workspace_profiles(self, i):
+        return self.profiles[i % len(self.workspaces)::len(self.workspaces)]
+
+    def task_members(self, i, members):
+        profiles = self.workspace_profiles(i)
+        start = i // len(self.workspaces)
+        return [
+            profiles[(start + n) % len(profiles)]
+            for n in range(min(members, len(profiles)))
+        ]
+
+    def task(self, i):
+        return self.own_tasks[i % len(self.own_tasks)]
+
+    def subtask(self, i):
+        return self.own_subtasks[i % len(self.own_subtasks)]
+
+    def subtask_ids(self, i):
+        task = self.task(i)
+        return [
+            subtask.pk for subtask in self.own_subtasks
+            if subtask.task_id == task.pk]
+
+    def member_ids(self):
+        return [
+            profile.pk for profile in
+            self.workspace_profiles(0)[:self.sizes['members_per_task']]]
+
+
+def scenarios(data):
+    """
+    name -> (method, path(i), body(i) or None). `i` is the request number.
+    """
+    subtask_count = data.sizes['subtasks_per_task']
+    return {
+        'task-list': ('get', lambda i: reverse('task-list'), None),
+        'task-list-page': (
+            'get', lambda i: reverse('task-list') + '?page_size=50', None),
+        'task-detail': (
+            'get', lambda i: reverse('task-detail', args=[data.task(i).pk]), None),
+        'subtask-list': ('get', lambda i: reverse('subtask-list'), None),
+        'user-contacts': ('get', lambda i: reverse('user-contacts'), None),
+        'user-login': ('post', lambda i: reverse('user-login'), lambda i: {
+            'email': data.users[i % len(data.users)].email, 'password': PASSWORD,
+        }),
+        'task-create': ('post', lambda i: reverse('task-list'), lambda i: {
+            'title': f'Created {i}', 'description': 'Benchmark', 'color': 'red',
+            'members': data.member_ids(),
+            'subtasks': [
+                {'title': f'Step {n}', 'status': False}
+                for n in range(subtask_count)
+            ],
+        }),
+        'task-update': (
+            'patch', lambda i: reverse('task-detail', args=[data.task(i).pk]),
+            lambda i: {'title': f'Updated {i}', 'priority': 'high'}),
+        'subtask-create': ('post', lambda i: reverse('subtask-list'), lambda i: {
+            'title': f'Added {i}', 'status': False, 'task': data.task(i).pk,
+        }),
+        'subtask-update': (
+            'patch', lambda i: reverse('subtask-detail', args=[data.subtask(i).pk]),
+            lambda i: {'status': i % 2 == 0}),
+        'subtask-bulk': (
+            'post',
+            lambda i: reverse('task-subtask-bulk', args=[data.task(i).pk]),
+            lambda i: {'subtasks': [
+                *({'id': pk, 'status': i % 2 == 0} for pk in data.subtask_ids(i)),
+                {'title': f'Added {i}', 'status': False},
+            ]}),
+    }
+
+
+class Command(BaseCommand):
+    help = ('Seeds a benchmark dataset and drives the REST API in-process. '
+            'Prints queries per request, latency percentiles and throughput '
+            'per endpoint as JSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--tasks', type=int, default=500)
+        parser.add_argument('--subtasks', type=int, default=3,
+                            help='Subtasks per task.')
+        parser.add_argument('--members', type=int, default=3,
+                            help='Members per task.')
+        parser.add_argument(
+            '--workspaces', type=int, default=1,
+            help='Workspaces the users and tasks are split over.')
+        parser.add_argument('--requests', type=int, default=50,
+                            help='Measured requests per endpoint.')
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--endpoints', default='',
+                            help='Comma separated scenario names (default: all).')
+        parser.add_argument('--output', help='Also write the report to this file.')
+        parser.add_argument(
+            '--budget', action='store_true',
+            help='Fail when a request runs more queries than QUERY_BUDGETS allows.')
+        parser.add_argument(
+            '--current-db', action='store_true',
+            help='Use the configured database inside a transaction that is '
+                 'rolled back, instead of a throwaway test database.')
+
+    def handle(self, *args, **options):
+        if options['current_db']:
+            with transaction.atomic():
+                report = self.run(options)
+                transaction.set_rollback(True)
+        else:
+            setup_test_environment()
+            old_name = connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False)
+            try:
+                report = self.run(options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                teardown_test_environment()
+
+        output = json.dumps(report, indent=2)
+        self.stdout.write(output)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        if report.get('over_budget'):
+            raise CommandError('Query budget exceeded: ' + ', '.join(
+                f'{name} ran {queries} > {QUERY_BUDGETS[name]}'
+                for name, queries in report['over_budget'].items()))
+
+    def run(self, options):
+        started = time.perf_counter()
+        data = Dataset(options['users'], options['tasks'],
+                       options['subtasks'], options['members'],
+                       options['workspaces'])
+        seed_seconds = time.perf_counter() - started
+
+        selected = scenarios(data)
+        if options['endpoints']:
+            names = options['endpoints'].split(',')
+            unknown = set(names) - set(selected)
+            if unknown:
+                raise CommandError(f'Unknown endpoints: {", ".join(sorted(unknown))}')
+            selected = {name: selected[name] for name in names}
+
+        client = APIClient()
+        client.post(reverse('user-login'),
+                    {'email': data.users[0].email, 'password': PASSWORD},
+                    format='json')
+        anonymous = APIClient()
+
+        results = {}
+        with unthrottled():
+            for name, scenario in selected.items():
+                results[name] = self.measure(
+                    anonymous if name == 'user-login' else client,
+                    scenario, options['requests'], options['warmup'])
+
+        report = {
+            'database': connection.vendor,
+            'dataset': {**data.sizes, 'seed_seconds': round(seed_seconds, 3)},
+            'endpoints': results,
+        }
+        if options['budget']:
+            report['over_budget'] = {
+                name: result['queries']['max']
+                for name, result in results.items()
+                if name in QUERY_BUDGETS
+                and result['queries']['max'] > QUERY_BUDGETS[name]
+            }
+        return report
+
+    def measure(self, client, scenario, requests, warmup):
+        method, path, body = scenario
+        send = getattr(client, method)
+        latencies, queries, statuses = [], [], set()
+
+        for i in range(warmup + requests):
+            kwargs = {'data': body(i), 'format': 'json'} if body else {}
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                response = send(path(i), **kwargs)
+                elapsed = time.perf_counter() - started
+            if response.status_code >= 400:
+                raise CommandError(
+                    f'{method.upper()} {path(i)} -> {response.status_code}: '
+                    f'{getattr(response, "data", response.content)}')
+            if i < warmup:
+                continue
+            latencies.append(elapsed)
+            queries.append(sum(
+                not query['sql'].startswith(TRANSACTION_STATEMENTS)
+                for query in context.captured_queries))
+            statuses.add(response.status_code)
+
+        latencies.sort()
+        return {
+            'requests': requests,
+            'status': sorted(statuses),
+            'queries': {
+                'mean': round(sum(queries) / len(queries), 2),
+                'max': max(queries),
+            },
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+            'rps': round(len(latencies) / sum(latencies), 1),
+        }
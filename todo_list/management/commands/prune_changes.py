@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from todo_list.models import ChangeLogEntry
+
+
+class Command(BaseCommand):
+    help = 'Deletes change feed entries older than the retention period.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int,
+            default=settings.CHANGE_FEED.get('RETENTION_DAYS', 7),
+            help='Keep entries from the last N days.')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        deleted, _ = ChangeLogEntry.objects.filter(
+            created_at__lt=cutoff).delete()
+        self.stdout.write(f'Deleted {deleted} change log entries.')
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+from django.utils import timezone
+
+from todo_list.models import Task
+from todo_list_backend.response_cache import bump_versions
+
+
+class Command(BaseCommand):
+    help = ('Recomputes Task.subtask_total / subtask_done from the subtask '
+            'table and fixes the tasks that drifted.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only report the drifted tasks.')
+
+    def handle(self, *args, **options):
+        drifted = list(
+            Task.objects.with_actual_subtask_counts()
+            .filter(~Q(actual_total=F('subtask_total'))
+                    | ~Q(actual_done=F('subtask_done')))
+            .order_by('pk')
+            .values_list('pk', 'subtask_total', 'subtask_done',
+                         'actual_total', 'actual_done')
+        )
+        for pk, total, done, actual_total, actual_done in drifted:
+            self.stdout.write(
+                f'Task {pk}: {done}/{total} -> {actual_done}/{actual_total}')
+
+        if drifted and not options['dry_run']:
+            # A queryset update sends no signals: move updated_at for the
+            # ETags and bump the response cache version by hand.
+            Task.objects.filter(
+                pk__in=[row[0] for row in drifted]
+            ).recount_subtasks(updated_at=timezone.now())
+            bump_versions(Task)
+        verb = 'Found' if options['dry_run'] else 'Repaired'
+        self.stdout.write(f'{verb} {len(drifted)} drifted tasks.')
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.1 on 2026-10-18 02:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo_list', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['-created_at', 'priority', 'id'], name='task_board_order_idx'),
+        ),
+    ]
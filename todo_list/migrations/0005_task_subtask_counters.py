@@ -0,0 +1,44 @@
+# Generated by Django 4.2.1 on 2026-10-18 02:35
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_subtask_counters(apps, schema_editor):
+    Task = apps.get_model('todo_list', 'Task')
+    Subtask = apps.get_model('todo_list', 'Subtask')
+
+    def count(subtasks):
+        return Coalesce(Subquery(
+            subtasks.order_by().values('task')
+            .annotate(n=Count('pk')).values('n')
+        ), 0)
+
+    subtasks = Subtask.objects.filter(task=OuterRef('pk'))
+    Task.objects.update(
+        subtask_total=count(subtasks),
+        subtask_done=count(subtasks.filter(status=True)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo_list', '0004_changelogentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='subtask_done',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='subtask_total',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            fill_subtask_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.1 on 2026-10-18 02:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo_list', '0005_task_subtask_counters'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='status',
+            field=models.CharField(choices=[('todo', 'Todo'), ('in_progress', 'In Progress'), ('await_feedback', 'Await feedback'), ('done', 'Done')], default='todo', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'due_date'], name='task_status_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status', 'done'), _negated=True), fields=['due_date'], name='task_open_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('checked', False)), fields=['due_date'], name='task_unchecked_due_idx'),
+        ),
+        # The auto-created M2M table only has (task_id, userprofile_id)
+        # unique plus single-column FK indexes; "tasks of a member" wants
+        # the reverse pair so the join never reads the table itself.
+        migrations.RunSQL(
+            'CREATE INDEX task_members_profile_idx '
+            'ON todo_list_task_members (userprofile_id, task_id);',
+            'DROP INDEX task_members_profile_idx;',
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations
+
+from todo_list.search import install_search_index, uninstall_search_index
+
+
+def install(apps, schema_editor):
+    install_search_index(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    uninstall_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    """
+    Text search index for ?q= on the task list (see todo_list/search.py):
+    pg_trgm GIN indexes on Postgres, an FTS5 trigram table on SQLite.
+    """
+
+    dependencies = [
+        ('todo_list', '0006_task_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
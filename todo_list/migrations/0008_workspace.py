@@ -0,0 +1,60 @@
+# Generated by Django 4.2.1 on 2026-10-18 03:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth_app', '0004_user_email_unique'),
+        ('todo_list', '0007_task_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Workspace',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=80)),
+                ('is_default', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='WorkspaceMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('owner', 'Owner'), ('member', 'Member'), ('viewer', 'Viewer')], default='member', max_length=10)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='workspacemembership',
+            name='profile',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='workspace_memberships', to='user_auth_app.userprofile'),
+        ),
+        migrations.AddField(
+            model_name='workspacemembership',
+            name='workspace',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='todo_list.workspace'),
+        ),
+        migrations.AddField(
+            model_name='workspace',
+            name='members',
+            field=models.ManyToManyField(related_name='workspaces', through='todo_list.WorkspaceMembership', to='user_auth_app.userprofile'),
+        ),
+        migrations.AddConstraint(
+            model_name='workspacemembership',
+            constraint=models.UniqueConstraint(fields=('profile', 'workspace'), name='workspace_membership_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='workspace',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_default', True)), fields=('is_default',), name='workspace_single_default'),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='workspace',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='todo_list.workspace'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+
+def create_default_workspace(apps, schema_editor):
+    """
+    Everything that existed so far was one shared board: it becomes the
+    default workspace, with all its tasks and every profile as member.
+    """
+    Workspace = apps.get_model('todo_list', 'Workspace')
+    WorkspaceMembership = apps.get_model('todo_list', 'WorkspaceMembership')
+    Task = apps.get_model('todo_list', 'Task')
+    UserProfile = apps.get_model('user_auth_app', 'UserProfile')
+
+    workspace, _ = Workspace.objects.get_or_create(
+        is_default=True, defaults={'name': 'Default'})
+    Task.objects.filter(workspace__isnull=True).update(workspace=workspace)
+    WorkspaceMembership.objects.bulk_create([
+        WorkspaceMembership(workspace=workspace, profile_id=profile_id)
+        for profile_id in UserProfile.objects.values_list('pk', flat=True)
+    ], ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+    """
+    Data only. Kept apart from the schema changes before and after it:
+    on Postgres an ALTER TABLE of todo_list_task in the same transaction
+    as this UPDATE fails with pending (deferred FK) trigger events.
+    """
+
+    dependencies = [
+        ('todo_list', '0008_workspace'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_default_workspace, migrations.RunPython.noop),
+    ]
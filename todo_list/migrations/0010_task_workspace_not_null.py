@@ -0,0 +1,25 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo_list', '0009_workspace_backfill'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='workspace',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='todo_list.workspace'),
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_board_order_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['workspace', '-created_at', 'priority', 'id'], name='task_workspace_order_idx'),
+        ),
+    ]
@@ -1,13 +1,192 @@
 import datetime
-from functools import cached_property
 from django.db import models
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from user_auth_app.models import UserProfile
 
 
+def subtasks_progress(total, done):
+    if total <= 0:
+        return 0
+    return round(done * 100 / total)
+
+
+class WorkspaceQuerySet(models.QuerySet):
+
+    def for_user(self, user, write=False):
+        return self.filter(pk__in=workspace_ids(user, write=write))
+
+    def default_id(self):
+        """
+        The workspace tasks go to when none is given. Created by migration
+        0008; recreated here if it was deleted.
+        """
+        workspace, _ = self.get_or_create(
+            is_default=True, defaults={'name': 'Default'})
+        return workspace.pk
+
+
+class Workspace(models.Model):
+    """
+    A board: the tasks in it are visible to its members only (see
+    todo_list/permisions.py for what each role may do).
+    New profiles join the default workspace (WORKSPACE_AUTO_JOIN).
+    """
+
+    objects = WorkspaceQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['is_default'], condition=Q(is_default=True),
+                name='workspace_single_default'),
+        ]
+
+    name = models.CharField(max_length=80)
+    is_default = models.BooleanField(default=False)
+    members = models.ManyToManyField(
+        UserProfile, through='WorkspaceMembership', related_name='workspaces')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'({self.id}) {self.name}'
+
+
+class WorkspaceMembership(models.Model):
+
+    class Meta:
+        constraints = [
+            # Also the index behind workspace_ids(): the workspaces of a
+            # profile, read from the index alone.
+            models.UniqueConstraint(
+                fields=['profile', 'workspace'],
+                name='workspace_membership_unique'),
+        ]
+
+    ROLE_CHOICES = [
+        ('owner', 'Owner'),
+        ('member', 'Member'),
+        ('viewer', 'Viewer'),
+    ]
+    WRITE_ROLES = ('owner', 'member')
+
+    workspace = models.ForeignKey(
+        Workspace, related_name='memberships', on_delete=models.CASCADE)
+    profile = models.ForeignKey(
+        UserProfile, related_name='workspace_memberships',
+        on_delete=models.CASCADE, db_index=False)
+    role = models.CharField(
+        max_length=10, choices=ROLE_CHOICES, default='member')
+
+    def __str__(self):
+        return f'{self.profile_id} in {self.workspace_id} ({self.role})'
+
+
+def workspace_ids(user, write=False):
+    """
+    Subquery of the ids of the user's workspaces; with write=True only
+    those where the user's role may change tasks. Built from user.id,
+    so it runs no query of its own and is safe in async views.
+    """
+    memberships = WorkspaceMembership.objects.filter(profile__user_id=user.id)
+    if write:
+        memberships = memberships.filter(
+            role__in=WorkspaceMembership.WRITE_ROLES)
+    return memberships.values('workspace_id')
+
+
+class TaskQuerySet(models.QuerySet):
+
+    def for_user(self, user, write=False):
+        """
+        The tasks in the user's workspaces. Read through
+        task_workspace_order_idx, so the cost follows the size of those
+        workspaces, not of the whole table.
+        """
+        return self.filter(workspace_id__in=workspace_ids(user, write=write))
+
+    def with_related(self, subtasks=True, members=True):
+        """
+        Loads everything TaskItemSerializer touches in a fixed number of
+        queries: one for the tasks, one for the subtasks and one for the
+        members joined with their users.
+        Relations that the response does not render can be skipped.
+        """
+        lookups = []
+        if subtasks:
+            lookups.append(models.Prefetch(
+                'subtasks', queryset=Subtask.objects.order_by('id')))
+        if members:
+            lookups.append(models.Prefetch(
+                'members',
+                queryset=UserProfile.objects.select_related(
+                    'user').order_by('id'),
+            ))
+        return self.prefetch_related(*lookups)
+
+    def add_subtask_counts(self, total=0, done=0):
+        """
+        Atomic in-database change of the subtask counters, safe against
+        concurrent writers (no read-modify-write in Python).
+        """
+        return self.update(
+            subtask_total=F('subtask_total') + total,
+            subtask_done=F('subtask_done') + done,
+        )
+
+    def recount_subtasks(self, **fields):
+        """
+        Recomputes the subtask counters from the subtask table in a single
+        UPDATE, setting `fields` as well. Used to repair drift
+        (manage.py repair_subtask_counters).
+        """
+        def count(subtasks):
+            return Coalesce(Subquery(
+                subtasks.order_by().values('task')
+                .annotate(n=Count('pk')).values('n')
+            ), 0)
+
+        subtasks = Subtask.objects.filter(task=OuterRef('pk'))
+        return self.update(
+            subtask_total=count(subtasks),
+            subtask_done=count(subtasks.filter(status=True)),
+            **fields,
+        )
+
+    def with_actual_subtask_counts(self):
+        return self.annotate(
+            actual_total=Count('subtasks'),
+            actual_done=Count('subtasks', filter=Q(subtasks__status=True)),
+        )
+
+
 class Task(models.Model):
 
+    objects = TaskQuerySet.as_manager()
+
     class Meta:
         ordering = ('-created_at', 'priority', 'id')
+        indexes = [
+            # Meta.ordering within a workspace; used by the (scoped) list
+            # and keyset pagination.
+            models.Index(
+                fields=['workspace', '-created_at', 'priority', 'id'],
+                name='task_workspace_order_idx'),
+            # Board columns: one status, sorted by due date. Also serves
+            # plain status filters, so status has no index of its own.
+            models.Index(
+                fields=['status', 'due_date'], name='task_status_due_idx'),
+            # Partial indexes: only the rows that are still open.
+            models.Index(
+                fields=['due_date'], condition=~Q(status='done'),
+                name='task_open_due_idx'),
+            models.Index(
+                fields=['due_date'], condition=Q(checked=False),
+                name='task_unchecked_due_idx'),
+        ]
+        # todo_list_task_members gets a (userprofile_id, task_id) index in
+        # migration 0006 ("tasks of a member" without touching the table).
 
     CATEGORY_CHOICES = [
         ('user_story', 'User Story'),
@@ -27,37 +206,60 @@ class Task(models.Model):
         ('high', 'High'),
     ]
 
+    # Indexed by task_workspace_order_idx, which starts with it. Not a
+    # field default: that would query on every Task(); save() fills it in.
+    workspace = models.ForeignKey(
+        Workspace, related_name='tasks', on_delete=models.CASCADE,
+        db_index=False)
     title = models.CharField(max_length=80)
     category = models.CharField(
         max_length=50, choices=CATEGORY_CHOICES, default='user_story')
     description = models.TextField(max_length=250)
     status = models.CharField(
-        max_length=20, choices=STATUS_CHOICES, default='todo', db_index=True)
+        max_length=20, choices=STATUS_CHOICES, default='todo')
     color = models.CharField(max_length=20)
     members = models.ManyToManyField(
         UserProfile, related_name='tasks_as_member')
     created_at = models.DateField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     due_date = models.DateField(default=datetime.date.today, db_index=True)
     checked = models.BooleanField(default=False)
     priority = models.CharField(
         max_length=20, choices=PRIORITY_CHOICES, default='medium', db_index=True)
+    # Denormalized subtask counts, maintained by todo_list/counters.py.
+    subtask_total = models.IntegerField(default=0, editable=False)
+    subtask_done = models.IntegerField(default=0, editable=False)
+
+    COUNTER_FIELDS = ('subtask_total', 'subtask_done')
 
     def __str__(self):
         return f'({self.id}) {self.title}'
 
-    @cached_property
+    @property
     def subtasks_progress(self) -> int:
         """
-        Computed progress of subtasks in percent (0-100).
-        Calculated from related Subtask instances:
+        Progress of subtasks in percent (0-100):
             - 0 if there are no subtasks
             - otherwise: done / total * 100 (rounded)
+        Read from the counter columns, no queries.
         """
-        total = self.subtasks.count()
-        if not total:
-            return 0
-        done = self.subtasks.filter(status=True).count()
-        return round(done * 100 / total)
+        return subtasks_progress(self.subtask_total, self.subtask_done)
+
+    def save(self, *args, **kwargs):
+        # Tasks created without a workspace go to the default one. The API
+        # always passes one (TaskItemSerializer.validate); bulk_create
+        # callers must too.
+        if self._state.adding and self.workspace_id is None:
+            self.workspace_id = Workspace.objects.default_id()
+        # The counters only change through F() updates. A full save of an
+        # instance loaded earlier must not write back stale values.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
 
     # def save(self, *args, **kwargs):
     #     for member in self.members.all():
@@ -67,11 +269,52 @@ class Task(models.Model):
     #     super().save(*args, **kwargs)
 
 
+class SubtaskQuerySet(models.QuerySet):
+
+    def for_user(self, user, write=False):
+        return self.filter(
+            task__workspace_id__in=workspace_ids(user, write=write))
+
+
 class Subtask(models.Model):
+
+    objects = SubtaskQuerySet.as_manager()
+
     title = models.CharField(max_length=100)
     status = models.BooleanField(default=False)
     task = models.ForeignKey(
         Task, related_name='subtasks', on_delete=models.CASCADE, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f'({self.id}) {self.title}'
+
+
+class ChangeLogEntry(models.Model):
+    """
+    Append-only log of writes to tasks, subtasks and profiles. The id is
+    the cursor of the change feed (GET /api/tasks/changes/).
+    Written by todo_list/signals.py and, for bulk queries that bypass the
+    signals, by todo_list.changes.record_changes.
+    """
+
+    MODEL_CHOICES = [
+        ('task', 'Task'),
+        ('subtask', 'Subtask'),
+        ('userprofile', 'User profile'),
+    ]
+
+    ACTION_CHOICES = [
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('deleted', 'Deleted'),
+    ]
+
+    model = models.CharField(max_length=20, choices=MODEL_CHOICES)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    task_id = models.BigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f'({self.id}) {self.model}:{self.object_id} {self.action}'
@@ -0,0 +1,35 @@
+"""
+Per-workspace object permissions for tasks and subtasks.
+
+The views only load tasks from the user's workspaces
+(Task.objects.for_user), so every object that reaches these checks is
+readable. Changing or deleting it needs one of
+WorkspaceMembership.WRITE_ROLES in the object's workspace; viewers are
+read-only.
+"""
+from rest_framework import permissions
+
+from todo_list.models import Subtask, WorkspaceMembership
+
+
+def object_workspace_id(obj):
+    if isinstance(obj, Subtask):
+        return obj.task.workspace_id
+    return obj.workspace_id
+
+
+def can_write(user, workspace_id):
+    return WorkspaceMembership.objects.filter(
+        workspace_id=workspace_id,
+        profile__user_id=user.id,
+        role__in=WorkspaceMembership.WRITE_ROLES,
+    ).exists()
+
+
+class WorkspacePermission(permissions.IsAuthenticated):
+    message = 'Your role in this workspace does not allow changes.'
+
+    def has_object_permission(self, request, view, obj):
+        if request.method in permissions.SAFE_METHODS:
+            return True
+        return can_write(request.user, object_workspace_id(obj))
@@ -0,0 +1,118 @@
+"""
+Substring search over Task.title / Task.description.
+
+Postgres: pg_trgm GIN indexes on UPPER(title) / UPPER(description), which
+is exactly the expression Django's `icontains` compiles to, so the plain
+ORM lookup is index-backed.
+
+SQLite: an FTS5 table with the trigram tokenizer (SQLite >= 3.34), kept in
+sync with todo_list_task by triggers. Trigram matching needs at least
+three characters, shorter words fall back to `icontains`.
+"""
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'todo_list_task_fts'
+
+SQLITE_TABLE = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+    title, description,
+    content='todo_list_task', content_rowid='id', tokenize='trigram'
+)
+"""
+
+# Django rebuilds SQLite tables on many ALTERs, which drops triggers, so
+# they are (re)created after every migrate (see todo_list/signals.py).
+SQLITE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON todo_list_task
+    BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON todo_list_task
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF title, description ON todo_list_task
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+POSTGRES_INDEXES = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS task_title_trgm_idx ON todo_list_task '
+    'USING gin (UPPER(title) gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS task_description_trgm_idx ON todo_list_task '
+    'USING gin (UPPER(description) gin_trgm_ops)',
+]
+
+MIN_TRIGRAM_LENGTH = 3
+
+
+def install_search_index(connection):
+    """
+    Creates the search index for the connection's database. Idempotent;
+    on SQLite the FTS table is rebuilt when its triggers were missing.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            for sql in POSTGRES_INDEXES:
+                cursor.execute(sql)
+        elif connection.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT COUNT(*) FROM sqlite_master "
+                "WHERE type = 'trigger' AND name LIKE %s",
+                [f'{FTS_TABLE}_%'])
+            in_sync = cursor.fetchone()[0] == len(SQLITE_TRIGGERS)
+            cursor.execute(SQLITE_TABLE)
+            for sql in SQLITE_TRIGGERS:
+                cursor.execute(sql)
+            if not in_sync:
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def uninstall_search_index(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('DROP INDEX IF EXISTS task_title_trgm_idx')
+            cursor.execute('DROP INDEX IF EXISTS task_description_trgm_idx')
+        elif connection.vendor == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+            cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def search_tasks(queryset, text):
+    """
+    Tasks whose title or description contains every word of `text`
+    (case-insensitive).
+    """
+    words = text.split()
+    if connections[queryset.db].vendor == 'sqlite':
+        phrases = [w for w in words if len(w) >= MIN_TRIGRAM_LENGTH]
+        if phrases:
+            match = ' AND '.join(
+                '"{}"'.format(w.replace('"', '""')) for w in phrases)
+            queryset = queryset.filter(pk__in=RawSQL(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+                [match]))
+        words = [w for w in words if len(w) < MIN_TRIGRAM_LENGTH]
+
+    for word in words:
+        queryset = queryset.filter(
+            Q(title__icontains=word) | Q(description__icontains=word))
+    return queryset
@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_init, post_migrate, post_save)
+from django.dispatch import receiver
+
+from todo_list.changes import record_change
+from todo_list.counters import remember_loaded_state, update_subtask_counters
+from todo_list.models import Subtask, Task, Workspace, WorkspaceMembership
+from todo_list.search import install_search_index
+from todo_list.summary import invalidate_task_summary
+from todo_list_backend.response_cache import bump_versions
+from user_auth_app.models import UserProfile
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Subtask)
+@receiver(post_save, sender=UserProfile)
+def log_save(sender, instance, created, **kwargs):
+    record_change(instance, 'created' if created else 'updated')
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Subtask)
+@receiver(post_delete, sender=UserProfile)
+def log_delete(sender, instance, **kwargs):
+    record_change(instance, 'deleted')
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Subtask)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_save, sender=WorkspaceMembership)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Subtask)
+@receiver(post_delete, sender=UserProfile)
+@receiver(post_delete, sender=WorkspaceMembership)
+def bump_response_versions(sender, **kwargs):
+    bump_versions(sender)
+
+
+@receiver(m2m_changed, sender=Task.members.through)
+def bump_member_response_versions(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_versions(Task)
+
+
+@receiver(post_save, sender=UserProfile)
+def join_default_workspace(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and getattr(settings, 'WORKSPACE_AUTO_JOIN', True):
+        WorkspaceMembership.objects.create(
+            workspace_id=Workspace.objects.default_id(), profile=instance)
+
+
+@receiver(post_init, sender=Subtask)
+def remember_subtask_state(sender, instance, **kwargs):
+    remember_loaded_state(instance)
+
+
+@receiver(post_save, sender=Subtask)
+def count_saved_subtask(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        if created:
+            update_subtask_counters(created=[instance])
+        else:
+            update_subtask_counters(changed=[instance])
+
+
+@receiver(post_delete, sender=Subtask)
+def count_deleted_subtask(sender, instance, origin=None, **kwargs):
+    # Deleting a task cascades to its subtasks; its counters go with it.
+    if isinstance(origin, Task) or getattr(origin, 'model', None) is Task:
+        return
+    update_subtask_counters(deleted=[instance])
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def drop_task_summary(sender, instance, **kwargs):
+    invalidate_task_summary([instance.workspace_id])
+
+
+@receiver(m2m_changed, sender=Task.members.through)
+def drop_member_task_summary(sender, instance, action, reverse, pk_set, **kwargs):
+    # m2m_changed fires for pre_* and post_* actions; post_* is enough.
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        invalidate_task_summary([instance.workspace_id])
+    elif action == 'post_clear':
+        invalidate_task_summary(Workspace.objects.values_list('pk', flat=True))
+    else:
+        # profile.tasks_as_member.add(...): pk_set holds task ids
+        invalidate_task_summary(Task.objects.filter(
+            pk__in=pk_set).values_list('workspace_id', flat=True))
+
+
+@receiver(post_migrate)
+def restore_search_index(sender, using, **kwargs):
+    # SQLite table rebuilds in later migrations drop the FTS triggers.
+    if sender.name != 'todo_list':
+        return
+    connection = connections[using]
+    applied = MigrationRecorder(connection).applied_migrations()
+    if ('todo_list', '0007_task_search') in applied:
+        install_search_index(connection)
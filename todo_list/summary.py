@@ -0,0 +1,138 @@
+"""
+Board counters for GET /api/tasks/summary/.
+
+Counters are kept per workspace: compute_task_summaries() runs two
+GROUP BY queries (tasks by workspace, status and priority, memberships
+by workspace and profile) for the workspaces that are not cached, and
+get_task_summary() adds up the workspaces of one user. Each workspace's
+counters stay in the default cache until a write to one of its tasks
+invalidates them (todo_list/signals.py, the task serializers).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Min, Q
+
+from todo_list.models import Task, workspace_ids
+
+CACHE_KEY = 'todo_list:task-summary'
+URGENT_PRIORITY = 'high'
+DONE_STATUS = 'done'
+
+
+def cache_key(workspace_id):
+    return f'{CACHE_KEY}:{workspace_id}'
+
+
+def empty_summary():
+    return {
+        'total': 0,
+        'by_status': {status: 0 for status, _ in Task.STATUS_CHOICES},
+        'by_priority': {priority: 0 for priority, _ in Task.PRIORITY_CHOICES},
+        'urgent': 0,
+        'next_due_date': None,
+        'next_urgent_due_date': None,
+        'members': [],
+    }
+
+
+def earliest(*dates):
+    return min(filter(None, dates), default=None)
+
+
+def compute_task_summaries(workspace_ids):
+    summaries = {workspace_id: empty_summary() for workspace_id in workspace_ids}
+
+    groups = Task.objects.filter(workspace_id__in=workspace_ids).order_by().values(
+        'workspace_id', 'status', 'priority',
+    ).annotate(count=Count('pk'), next_due=Min('due_date'))
+    for group in groups:
+        summary, count = summaries[group['workspace_id']], group['count']
+        summary['total'] += count
+        by_status, by_priority = summary['by_status'], summary['by_priority']
+        by_status[group['status']] = by_status.get(group['status'], 0) + count
+        by_priority[group['priority']] = (
+            by_priority.get(group['priority'], 0) + count)
+        if group['status'] == DONE_STATUS:
+            continue
+        summary['next_due_date'] = earliest(
+            summary['next_due_date'], group['next_due'])
+        if group['priority'] == URGENT_PRIORITY:
+            summary['urgent'] += count
+            summary['next_urgent_due_date'] = earliest(
+                summary['next_urgent_due_date'], group['next_due'])
+
+    members = Task.members.through.objects.filter(
+        task__workspace_id__in=workspace_ids,
+    ).order_by().values(
+        'task__workspace_id', 'userprofile_id', 'userprofile__user_id',
+    ).annotate(
+        total=Count('pk'),
+        open=Count('pk', filter=~Q(task__status=DONE_STATUS)),
+    )
+    for row in members:
+        summaries[row['task__workspace_id']]['members'].append({
+            'id': row['userprofile_id'],
+            'user': row['userprofile__user_id'],
+            'total': row['total'],
+            'open': row['open'],
+        })
+    return summaries
+
+
+def merge_summaries(summaries):
+    merged = empty_summary()
+    members = {}
+    for summary in summaries:
+        merged['total'] += summary['total']
+        for name in ('by_status', 'by_priority'):
+            for key, count in summary[name].items():
+                merged[name][key] = merged[name].get(key, 0) + count
+        merged['urgent'] += summary['urgent']
+        for name in ('next_due_date', 'next_urgent_due_date'):
+            merged[name] = earliest(merged[name], summary[name])
+        for member in summary['members']:
+            if member['id'] in members:
+                members[member['id']]['total'] += member['total']
+                members[member['id']]['open'] += member['open']
+            else:
+                members[member['id']] = dict(member)
+    merged['members'] = list(members.values())
+    return merged
+
+
+def get_task_summary(user):
+    """
+    The summary over the user's workspaces: one indexed query for the
+    workspace ids, the rest comes from the cache when it is warm.
+    """
+    ids = sorted(workspace_ids(user).values_list('workspace_id', flat=True))
+    timeout = getattr(settings, 'TASK_SUMMARY_CACHE_TIMEOUT', 300)
+    if not timeout:
+        return merge_summaries(compute_task_summaries(ids).values())
+
+    cached = cache.get_many([cache_key(workspace_id) for workspace_id in ids])
+    summaries = {
+        workspace_id: cached[cache_key(workspace_id)]
+        for workspace_id in ids if cache_key(workspace_id) in cached
+    }
+    missing = [workspace_id for workspace_id in ids if workspace_id not in summaries]
+    if missing:
+        computed = compute_task_summaries(missing)
+        cache.set_many({
+            cache_key(workspace_id): summary
+            for workspace_id, summary in computed.items()
+        }, timeout)
+        summaries.update(computed)
+    return merge_summaries(summaries[workspace_id] for workspace_id in ids)
+
+
+def invalidate_task_summary(workspace_ids):
+    """
+    Drops the cached counters of these workspaces once the current
+    transaction commits (right away outside of one), so no reader can
+    cache pre-commit data again.
+    """
+    keys = [cache_key(workspace_id) for workspace_id in set(workspace_ids)]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,50 @@
+import json
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from todo_list.management.commands import benchmark_api
+from todo_list.models import Task
+
+
+class BenchmarkApiCommandTests(TestCase):
+
+    def run_benchmark(self, *args):
+        out = StringIO()
+        call_command(
+            'benchmark_api', '--current-db', '--users=4', '--tasks=6',
+            '--requests=2', '--warmup=1', *args, stdout=out)
+        return json.loads(out.getvalue())
+
+    def test_report(self):
+        report = self.run_benchmark('--budget')
+        self.assertEqual(set(report['endpoints']), set(benchmark_api.QUERY_BUDGETS))
+        self.assertEqual(report['dataset']['tasks'], 6)
+        self.assertEqual(report['over_budget'], {})
+        task_list = report['endpoints']['task-list']
+        self.assertEqual(task_list['requests'], 2)
+        for key in ('p50_ms', 'p95_ms', 'p99_ms', 'rps'):
+            self.assertGreater(task_list[key], 0)
+        # everything is rolled back
+        self.assertFalse(Task.objects.exists())
+
+    def test_query_counts_do_not_grow_with_the_dataset(self):
+        endpoints = 'task-list,task-detail,task-create,task-update'
+        small = self.run_benchmark(f'--endpoints={endpoints}')
+        large = self.run_benchmark(
+            f'--endpoints={endpoints}', '--tasks=12', '--subtasks=5', '--members=4',
+            '--workspaces=3')
+        for name in endpoints.split(','):
+            self.assertEqual(
+                small['endpoints'][name]['queries'],
+                large['endpoints'][name]['queries'], name)
+
+    def test_budget_exceeded(self):
+        with mock.patch.dict(benchmark_api.QUERY_BUDGETS, {'subtask-list': 0}):
+            with self.assertRaisesMessage(CommandError, 'subtask-list ran 1 > 0'):
+                self.run_benchmark('--budget', '--endpoints=subtask-list')
+
+    def test_unknown_endpoint(self):
+        with self.assertRaisesMessage(CommandError, 'Unknown endpoints: nope'):
+            self.run_benchmark('--endpoints=nope')
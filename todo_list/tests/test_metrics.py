@@ -0,0 +1,49 @@
+from rest_framework.test import APITestCase, APIClient
+from django.urls import reverse
+from django.contrib.auth.models import User
+from todo_list_backend.metrics import ConnectionStats, connection_stats
+
+
+class ConnectionStatsTests(APITestCase):
+
+    def test_opens_per_request(self):
+        stats = ConnectionStats()
+        for i in range(4):
+            stats.request_started()
+            if i == 0:
+                stats.connection_created()
+            stats.request_finished()
+        stats.connection_created()  # outside a request, e.g. a management command
+
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot['requests'], 4)
+        self.assertEqual(snapshot['connections_opened'], 2)
+        self.assertEqual(snapshot['opens_per_request'], 0.25)
+        self.assertEqual(snapshot['reuse_ratio'], 0.75)
+
+
+class MetricsViewTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword')
+        self.client = APIClient()
+        self.url = reverse('metrics')
+
+    def test_requires_staff(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+    def test_db_metrics(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_authenticate(user=self.user)
+        connection_stats.reset()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        db = response.data['db']
+        self.assertEqual(db['requests'], 1)
+        self.assertIn('conn_max_age', db)
+        self.assertIn('reuse_ratio', db)
@@ -0,0 +1,94 @@
+import json
+
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from todo_list.models import Task
+from todo_list_backend.middleware import (
+    LatencyHistogram, RequestProfile, latency_histogram)
+
+
+class RequestProfileTests(APITestCase):
+
+    def test_duplicate_queries(self):
+        profile = RequestProfile()
+        with connection.execute_wrapper(profile):
+            for pk in (1, 2, 3):
+                Task.objects.filter(pk=pk).first()
+            Task.objects.count()
+        self.assertEqual(sum(profile.queries.values()), 4)
+        self.assertEqual(len(profile.queries), 2)
+
+
+class LatencyHistogramTests(SimpleTestCase):
+
+    def observe(self, histogram, total_ms):
+        histogram.observe({
+            'url_name': 'task-list', 'total_ms': total_ms, 'db_ms': 1.0,
+            'serialize_ms': 0.25, 'render_ms': 0.5, 'queries': 3, 'duplicate_queries': 1, 'bytes': 100,
+        })
+
+    def test_snapshot(self):
+        histogram = LatencyHistogram()
+        for total_ms in [3] * 90 + [40] * 9 + [9000]:
+            self.observe(histogram, total_ms)
+        stats = histogram.snapshot()['task-list']
+        self.assertEqual(stats['count'], 100)
+        self.assertEqual((stats['p50_ms'], stats['p95_ms']), (5, 50))
+        self.assertEqual(stats['p99_ms'], 50)
+        self.assertEqual(stats['buckets']['5'], 90)
+        self.assertEqual(stats['buckets']['+Inf'], 1)
+        self.assertEqual(stats['avg_queries'], 3)
+        self.assertEqual(stats['avg_serialize_ms'], 0.25)
+
+
+@override_settings(PERF_SAMPLE_RATE=1)
+class PerformanceMiddlewareTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword',
+            is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        latency_histogram.reset()
+
+    def test_server_timing_and_log(self):
+        with self.assertLogs('todo_list_backend.perf', 'INFO') as logs:
+            response = self.client.get(reverse('task-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(
+            response['Server-Timing'],
+            r'app;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries, \d+ duplicate", '
+            r'serialize;dur=[\d.]+, render;dur=[\d.]+')
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['url_name'], 'task-list')
+        self.assertEqual(record['status'], 200)
+        self.assertGreater(record['queries'], 0)
+        self.assertEqual(record['bytes'], len(response.content))
+        self.assertGreater(record['serialize_ms'], 0)
+
+    def test_histogram_in_metrics(self):
+        with self.assertLogs('todo_list_backend.perf', 'INFO'):
+            self.client.get(reverse('task-list'))
+            self.client.get(reverse('task-list'))
+            response = self.client.get(reverse('metrics'))
+        requests = response.data['requests']
+        self.assertEqual(requests['sample_rate'], 1)
+        self.assertEqual(requests['endpoints']['task-list']['count'], 2)
+
+    async def test_async_requests(self):
+        with self.assertLogs('todo_list_backend.perf', 'INFO'):
+            response = await self.async_client.get(reverse('task-list'))
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('Server-Timing', response)
+
+
+class PerformanceMiddlewareOffTests(APITestCase):
+
+    def test_no_header_when_sampling_is_off(self):
+        response = self.client.get(reverse('task-list'))
+        self.assertNotIn('Server-Timing', response)
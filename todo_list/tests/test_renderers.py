@@ -0,0 +1,75 @@
+import datetime
+import io
+import json
+from decimal import Decimal
+from unittest import mock
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase, APIClient
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from django.contrib.auth.models import User
+from todo_list_backend import renderers
+from todo_list_backend.renderers import FastJSONParser, FastJSONRenderer
+
+
+class FastJSONRendererTests(SimpleTestCase):
+
+    data = {
+        'title': 'Über Aufgabe',
+        'due_date': datetime.date(2024, 5, 1),
+        'amount': Decimal('1.50'),
+        'label': gettext_lazy('Done'),
+        'ids': (1, 2),
+        'nested': [{'ok': True, 'none': None}],
+    }
+
+    def test_matches_stdlib_renderer(self):
+        self.assertEqual(
+            json.loads(FastJSONRenderer().render(self.data)),
+            json.loads(JSONRenderer().render(self.data)))
+
+    def test_compact_unless_indent_requested(self):
+        self.assertNotIn(b'\n', FastJSONRenderer().render(self.data))
+        self.assertIn(b'\n  ', FastJSONRenderer().render(
+            self.data, 'application/json; indent=4'))
+
+    def test_parser(self):
+        body = JSONRenderer().render(self.data)
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body)))
+
+    def test_stdlib_fallback(self):
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertEqual(
+                FastJSONRenderer().render(self.data),
+                JSONRenderer().render(self.data))
+            self.assertEqual(
+                FastJSONParser().parse(io.BytesIO(b'{"a": 1}')), {'a': 1})
+
+
+class FastJSONEndpointTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_invalid_json_is_400(self):
+        response = self.client.post(
+            reverse('task-list'), data=b'{"title": ',
+            content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_round_trip(self):
+        response = self.client.post(reverse('task-list'), data=json.dumps({
+            'title': 'Новая задача', 'description': 'Description',
+            'color': 'blue', 'members': [], 'subtasks': [],
+        }), content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content)['title'], 'Новая задача')
@@ -0,0 +1,149 @@
+from rest_framework.test import APITestCase, APIClient
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from todo_list.models import Task, Workspace, WorkspaceMembership
+from todo_list_backend.metrics import collect
+from todo_list_backend.response_cache import (
+    LocalResponseCache, SharedResponseCache, get_response_cache,
+    response_cache_stats)
+
+LOCAL = {'BACKEND': 'todo_list_backend.response_cache.LocalResponseCache'}
+
+
+@override_settings(RESPONSE_CACHE=LOCAL)
+class ResponseCacheTests(APITestCase):
+
+    def setUp(self):
+        # a fresh backend: the ids and versions repeat between tests
+        get_response_cache.cache_clear()
+        response_cache_stats.reset()
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword',
+            first_name='Test')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.task = Task.objects.create(
+            title='Task', description='Description', color='red')
+        self.task.members.set([self.user.userprofile])
+
+    def get(self, url, client=None, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = (client or self.client).get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response, len(context.captured_queries)
+
+    def test_hit_returns_the_same_bytes(self):
+        url = reverse('task-list')
+        first, miss_queries = self.get(url)
+        second, hit_queries = self.get(url)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(second['Content-Type'], 'application/json')
+        self.assertLess(hit_queries, miss_queries)
+
+        # other query params are other entries
+        third, _ = self.get(url, fields='id,title')
+        self.assertEqual(third.json(), [{'id': self.task.id, 'title': 'Task'}])
+        metrics = collect()['response_cache']
+        self.assertEqual(metrics['backend'], 'LocalResponseCache')
+        self.assertEqual(metrics['endpoints']['task-list'], {
+            'hits': 1, 'misses': 2, 'hit_ratio': 0.3333})
+
+    def test_writes_bump_the_versions(self):
+        url = reverse('task-detail', args=[self.task.id])
+        self.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(url, {'title': 'Changed'}, format='json')
+        self.assertEqual(self.get(url)[0].json()['title'], 'Changed')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse('task-subtask-bulk', args=[self.task.id]),
+                {'subtasks': [{'title': 'Step', 'status': True}]}, format='json')
+        data = self.get(url)[0].json()
+        self.assertEqual(data['subtasks_progress'], 100)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = 'Renamed'
+            self.user.save()
+        data = self.get(url)[0].json()
+        self.assertEqual(data['members'][0]['user']['first_name'], 'Renamed')
+        self.assertEqual(response_cache_stats.snapshot()['hits'], 0)
+
+    def test_logins_do_not_bump_the_user_version(self):
+        url = reverse('user-contacts')
+        self.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save(update_fields=['last_login'])
+        self.get(url)
+        self.assertEqual(response_cache_stats.snapshot()['hits'], 1)
+
+    def test_entries_are_per_user_for_scoped_views(self):
+        other = User.objects.create_user(
+            username='other', email='other@example.com', password='testpassword')
+        WorkspaceMembership.objects.filter(profile=other.userprofile).delete()
+        WorkspaceMembership.objects.create(
+            workspace=Workspace.objects.create(name='Other'),
+            profile=other.userprofile)
+        client = APIClient()
+        client.force_authenticate(user=other)
+
+        url = reverse('task-list')
+        self.get(url)
+        self.assertEqual(self.get(url, client)[0].json(), [])
+
+        # contacts are the same for everyone
+        self.get(reverse('user-contacts'))
+        self.get(reverse('user-contacts'), client)
+        self.assertEqual(
+            response_cache_stats.snapshot()['endpoints']['user-contacts']['hits'], 1)
+
+    def test_large_responses_are_not_stored(self):
+        with override_settings(RESPONSE_CACHE={
+                **LOCAL, 'OPTIONS': {'max_entry_bytes': 10}}):
+            self.get(reverse('task-list'))
+            self.get(reverse('task-list'))
+        snapshot = response_cache_stats.snapshot()
+        self.assertEqual((snapshot['hits'], snapshot['too_large']), (0, 2))
+
+    @override_settings(RESPONSE_CACHE={})
+    def test_disabled(self):
+        self.get(reverse('task-list'))
+        self.get(reverse('task-list'))
+        self.assertEqual(response_cache_stats.snapshot()['misses'], 0)
+
+
+class ResponseCacheBackendTests(SimpleTestCase):
+
+    def test_local_cache_evicts_least_recently_used(self):
+        backend = LocalResponseCache(max_entries=2)
+        backend.set('a', b'1')
+        backend.set('b', b'2')
+        backend.get('a')
+        backend.set('c', b'3')
+        self.assertEqual(
+            [backend.get(key) for key in 'abc'], [b'1', None, b'3'])
+
+    def test_local_versions(self):
+        backend = LocalResponseCache()
+        self.assertEqual(backend.get_versions(['todo_list.task']), [0])
+        backend.bump(['todo_list.task'])
+        self.assertEqual(
+            backend.get_versions(['todo_list.task', 'auth.user']), [1, 0])
+
+    def test_shared_versions(self):
+        cache.clear()
+        backend = SharedResponseCache()
+        first = backend.get_versions(['todo_list.task'])[0]
+        backend.bump(['todo_list.task'])
+        self.assertEqual(backend.get_versions(['todo_list.task']), [first + 1])
+
+        # an evicted counter does not go back to a used value
+        cache.delete(backend.version_key('todo_list.task'))
+        self.assertGreater(backend.get_versions(['todo_list.task'])[0], first + 1)
+
+        backend.set('key', b'{}')
+        self.assertEqual(backend.get('key'), b'{}')
@@ -0,0 +1,127 @@
+from rest_framework.test import APITestCase, APIClient
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from todo_list.models import ChangeLogEntry, Subtask, Task, Workspace
+
+
+class SubtaskEndpointTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.task = self.create_task()
+        self.other_task = self.create_task()
+        self.subtasks = [
+            Subtask.objects.create(title=f'Step {n}', task=self.task)
+            for n in range(3)
+        ]
+        Subtask.objects.create(title='Elsewhere', task=self.other_task)
+        self.bulk_url = reverse('task-subtask-bulk', args=[self.task.id])
+
+    def create_task(self, **fields):
+        return Task.objects.create(
+            title='Task', description='Description', color='red', **fields)
+
+    def ids(self, response):
+        return sorted(subtask['id'] for subtask in response.data)
+
+    def writes(self, context):
+        return [
+            query['sql'] for query in context.captured_queries
+            if not query['sql'].startswith(('SELECT', 'SAVEPOINT', 'RELEASE'))
+        ]
+
+    def test_filter_by_task(self):
+        expected = [subtask.id for subtask in self.subtasks]
+        response = self.client.get(reverse('subtask-list'), {'task': self.task.id})
+        self.assertEqual(self.ids(response), expected)
+        response = self.client.get(
+            reverse('task-subtask-list', args=[self.task.id]))
+        self.assertEqual(self.ids(response), expected)
+
+        response = self.client.get(reverse('subtask-list'), {'task': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('task', response.data)
+
+    def test_create_without_reading_the_task(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                reverse('task-subtask-list', args=[self.task.id]),
+                {'title': 'New', 'status': True}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['title'], 'New')
+        # counter update (also the task check), subtask, change log
+        self.assertEqual(len([
+            query for query in context.captured_queries
+            if 'todo_list_task' in query['sql']
+            or 'todo_list_subtask' in query['sql']
+            or 'todo_list_changelogentry' in query['sql']
+        ]), 3)
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.subtask_total, self.task.subtask_done), (4, 1))
+
+    def test_create_for_missing_task(self):
+        response = self.client.post(
+            reverse('task-subtask-list', args=[9999]),
+            {'title': 'New'}, format='json')
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post(
+            reverse('subtask-list'), {'title': 'New', 'task': 9999}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'task': 'Task not found.'})
+        self.assertEqual(Subtask.objects.count(), 4)
+
+    def test_bulk_toggle_and_create(self):
+        first, second, third = self.subtasks
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.bulk_url, {'subtasks': [
+                {'id': first.id, 'status': True},
+                {'id': second.id, 'title': 'Renamed'},
+                {'id': third.id, 'status': False},
+                {'title': 'Added', 'status': True},
+                {'title': 'Added too'},
+            ]}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            [(subtask['title'], subtask['status'])
+             for subtask in response.data['subtasks']],
+            [('Step 0', True), ('Renamed', False), ('Step 2', False),
+             ('Added', True), ('Added too', False)])
+        # counters, bulk update, bulk create and one log insert for each
+        self.assertEqual(len(self.writes(context)), 5, self.writes(context))
+
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.subtask_total, self.task.subtask_done), (5, 2))
+        self.assertEqual(ChangeLogEntry.objects.filter(
+            model='subtask', action='updated').count(), 2)
+
+    def test_bulk_is_all_or_nothing(self):
+        foreign = self.other_task.subtasks.get()
+        response = self.client.post(self.bulk_url, {'subtasks': [
+            {'id': self.subtasks[0].id, 'status': True},
+            {'id': foreign.id, 'status': True},
+            {'status': True},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('title', response.data['subtasks'][2])
+        self.assertFalse(Subtask.objects.filter(status=True).exists())
+
+        response = self.client.post(self.bulk_url, {'subtasks': [
+            {'id': self.subtasks[0].id, 'status': True},
+            {'id': foreign.id, 'status': True},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data['subtasks'], [f'Subtasks not found: {foreign.id}.'])
+
+    def test_bulk_outside_writable_workspaces(self):
+        hidden = self.create_task(workspace=Workspace.objects.create(name='Other'))
+        response = self.client.post(
+            reverse('task-subtask-bulk', args=[hidden.id]),
+            {'subtasks': [{'title': 'New'}]}, format='json')
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(hidden.subtasks.exists())
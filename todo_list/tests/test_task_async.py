@@ -0,0 +1,77 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import AsyncRequestFactory, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient, force_authenticate
+
+from todo_list.api.views import TaskDetailView, TaskListCreateView
+from todo_list.models import Subtask, Task
+from user_auth_app.api.views import UserProfileList_View
+
+
+class AsyncReadViewTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword')
+        for i in range(3):
+            task = Task.objects.create(
+                title=f'Task {i}', description='Description', color='red')
+            task.members.set([self.user.userprofile])
+            Subtask.objects.create(title='Subtask', status=True, task=task)
+        self.task = task
+        self.factory = AsyncRequestFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    async def call(self, view_class, path, headers=None, **kwargs):
+        request = self.factory.get(path, headers=headers)
+        force_authenticate(request, user=self.user)
+        return await view_class.as_async_view()(request, **kwargs)
+
+    async def sync_data(self, url):
+        response = await sync_to_async(self.client.get)(url)
+        return json.loads(response.content)
+
+    async def test_task_list_matches_sync_view(self):
+        url = reverse('task-list')
+        response = await self.call(TaskListCreateView, url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), await self.sync_data(url))
+
+    async def test_task_list_pagination_and_fields(self):
+        url = reverse('task-list') + '?page_size=2&fields=id,subtasks_progress'
+        response = await self.call(TaskListCreateView, url)
+        data = json.loads(response.content)
+        self.assertEqual(len(data['results']), 2)
+        self.assertEqual(data['results'][0]['subtasks_progress'], 100)
+        self.assertIsNotNone(data['next'])
+
+    async def test_task_detail(self):
+        url = reverse('task-detail', args=[self.task.id])
+        response = await self.call(TaskDetailView, url, pk=self.task.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), await self.sync_data(url))
+
+        response = await self.call(
+            TaskDetailView, url, headers={'If-None-Match': response['ETag']},
+            pk=self.task.id)
+        self.assertEqual(response.status_code, 304)
+
+    async def test_task_detail_not_found(self):
+        response = await self.call(
+            TaskDetailView, reverse('task-detail', args=[999]), pk=999)
+        self.assertEqual(response.status_code, 404)
+
+    async def test_contacts(self):
+        url = reverse('user-contacts')
+        response = await self.call(UserProfileList_View, url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), await self.sync_data(url))
+
+    async def test_unauthenticated(self):
+        request = self.factory.get(reverse('task-list'))
+        response = await TaskListCreateView.as_async_view()(request)
+        self.assertEqual(response.status_code, 401)
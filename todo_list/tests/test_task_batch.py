@@ -0,0 +1,84 @@
+from rest_framework.test import APITestCase, APIClient
+from django.urls import reverse
+from django.contrib.auth.models import User
+from todo_list.models import Task, Subtask
+
+
+class TaskBatchTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('task-batch')
+        self.first = Task.objects.create(
+            title='First', description='Description', color='red')
+        self.second = Task.objects.create(
+            title='Second', description='Description', color='red')
+        self.subtask = Subtask.objects.create(title='Subtask', task=self.first)
+        self.profile_id = self.user.userprofile.id
+
+    def test_batch_create_update_delete(self):
+        response = self.client.post(self.url, {'operations': [
+            {'op': 'create', 'data': {
+                'title': 'Created', 'description': 'Description', 'color': 'blue',
+                'members': [self.profile_id],
+                'subtasks': [{'title': 'One'}, {'title': 'Two', 'status': True}],
+            }},
+            {'op': 'update', 'id': self.first.id, 'data': {
+                'status': 'done',
+                'members': [self.profile_id],
+                'subtasks': [
+                    {'id': self.subtask.id, 'title': 'Subtask', 'status': True}],
+            }},
+            {'op': 'delete', 'id': self.second.id},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        created, updated, deleted = response.data['results']
+        self.assertEqual(created['status'], 201)
+        self.assertEqual(created['data']['subtasks_progress'], 50)
+        self.assertEqual(
+            created['data']['members'][0]['user']['username'], 'testuser')
+        self.assertEqual(updated['data']['status'], 'done')
+        self.assertEqual(updated['data']['subtasks_progress'], 100)
+        self.assertEqual(deleted, {
+            'index': 2, 'op': 'delete', 'id': self.second.id, 'status': 204})
+
+        self.assertFalse(Task.objects.filter(pk=self.second.id).exists())
+        self.assertEqual(
+            list(self.first.members.values_list('id', flat=True)),
+            [self.profile_id])
+        self.assertEqual(Task.objects.get(pk=created['id']).subtasks.count(), 2)
+
+    def test_invalid_item_writes_nothing(self):
+        response = self.client.post(self.url, {'operations': [
+            {'op': 'update', 'id': self.first.id, 'data': {'status': 'done'}},
+            {'op': 'create', 'data': {'title': 'Missing fields'}},
+            {'op': 'delete', 'id': 999999},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.data['results']
+        self.assertEqual([error['index'] for error in errors], [1, 2])
+        self.assertEqual(errors[0]['status'], 400)
+        self.assertIn('description', errors[0]['errors'])
+        self.assertEqual(errors[1]['status'], 404)
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.status, 'todo')
+
+    def test_duplicate_task_in_batch(self):
+        response = self.client.post(self.url, {'operations': [
+            {'op': 'update', 'id': self.first.id, 'data': {'status': 'done'}},
+            {'op': 'delete', 'id': self.first.id},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(Task.objects.filter(pk=self.first.id).exists())
+
+    def test_operation_shape_is_validated(self):
+        response = self.client.post(self.url, {'operations': [
+            {'op': 'update', 'data': {'status': 'done'}},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('operations', response.data)
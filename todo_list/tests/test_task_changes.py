@@ -0,0 +1,158 @@
+import io
+import json
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from rest_framework.test import APITestCase, APIClient
+from django.core.management import call_command
+from django.http import StreamingHttpResponse
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from todo_list.models import ChangeLogEntry, Task, Subtask
+
+
+class TaskChangeFeedTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('task-changes')
+        self.task = Task.objects.create(
+            title='Test Task', description='Test Description', color='red')
+
+    def get_cursor(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['changes'], [])
+        return response.data['cursor']
+
+    def test_changes_since_cursor(self):
+        cursor = self.get_cursor()
+        subtask = Subtask.objects.create(title='Subtask', task=self.task)
+        self.client.patch(
+            reverse('task-detail', args=[self.task.id]),
+            {'status': 'done'}, format='json')
+        self.client.patch(
+            reverse('task-detail', args=[self.task.id]),
+            {'title': 'Renamed'}, format='json')
+
+        response = self.client.get(self.url, {'since': cursor})
+        self.assertEqual(response.status_code, 200)
+        changes = {(c['model'], c['id']): c for c in response.data['changes']}
+        self.assertEqual(len(changes), 2)
+        task_change = changes[('task', self.task.id)]
+        self.assertEqual(task_change['action'], 'updated')
+        self.assertEqual(task_change['data']['title'], 'Renamed')
+        self.assertEqual(changes[('subtask', subtask.id)]['task'], self.task.id)
+
+        response = self.client.get(
+            self.url, {'since': response.data['cursor']})
+        self.assertEqual(response.data['changes'], [])
+
+    def test_subtask_writes_update_their_task(self):
+        cursor = self.get_cursor()
+        self.client.post(
+            reverse('task-subtask-bulk', args=[self.task.id]),
+            {'subtasks': [{'title': 'Done', 'status': True}]}, format='json')
+
+        response = self.client.get(self.url, {'since': cursor})
+        changes = {(c['model'], c['action']): c for c in response.data['changes']}
+        self.assertEqual(set(changes), {('subtask', 'created'), ('task', 'updated')})
+        self.assertEqual(
+            changes[('task', 'updated')]['data']['subtasks_progress'], 100)
+
+    def test_bulk_writes_are_logged(self):
+        cursor = self.get_cursor()
+        self.client.post(reverse('task-batch'), {'operations': [
+            {'op': 'create', 'data': {
+                'title': 'Created', 'description': 'Description',
+                'color': 'blue', 'members': [],
+                'subtasks': [{'title': 'One'}]}},
+            {'op': 'delete', 'id': self.task.id},
+        ]}, format='json')
+
+        response = self.client.get(self.url, {'since': cursor})
+        actions = sorted(
+            (c['model'], c['action']) for c in response.data['changes'])
+        self.assertEqual(actions, [
+            ('subtask', 'created'), ('task', 'created'), ('task', 'deleted')])
+
+    @override_settings(CHANGE_FEED={'VISIBILITY_LAG': 60})
+    def test_entries_committed_out_of_order(self):
+        long_ago = timezone.now() - timedelta(minutes=2)
+        ChangeLogEntry.objects.update(created_at=long_ago)
+        cursor = self.get_cursor()
+        first = ChangeLogEntry.objects.create(
+            model='task', object_id=self.task.id, action='updated')
+        second = ChangeLogEntry.objects.create(
+            model='subtask', object_id=9999, action='deleted')
+        # the first entry's transaction commits after the second one's
+        row = ChangeLogEntry.objects.filter(pk=first.pk).values().get()
+        first.delete()
+
+        response = self.client.get(self.url, {'since': cursor})
+        self.assertEqual(response.data['changes'], [])
+        self.assertEqual(response.data['cursor'], cursor)
+        self.assertEqual(self.get_cursor(), cursor)
+
+        ChangeLogEntry.objects.create(**row)
+        ChangeLogEntry.objects.update(created_at=long_ago)
+        response = self.client.get(self.url, {'since': cursor})
+        self.assertEqual(
+            [(c['model'], c['id']) for c in response.data['changes']],
+            [('task', self.task.id), ('subtask', 9999)])
+        self.assertEqual(response.data['cursor'], second.pk)
+
+    def test_expired_cursor(self):
+        Subtask.objects.create(title='Subtask', task=self.task)
+        Subtask.objects.create(title='Subtask', task=self.task)
+        call_command('prune_changes', days=-1, stdout=io.StringIO())
+        Subtask.objects.create(title='Subtask', task=self.task)
+        response = self.client.get(self.url, {'since': 1})
+        self.assertEqual(response.status_code, 410)
+
+    @override_settings(SERVER_MODE='asgi', CHANGE_FEED={
+        'POLL_INTERVAL': 0.01, 'STREAM_SECONDS': 0.1, 'KEEPALIVE_SECONDS': 60})
+    async def test_event_stream(self):
+        cursor = await sync_to_async(
+            lambda: ChangeLogEntry.objects.order_by('-id').first().id)()
+        await sync_to_async(Subtask.objects.create)(
+            title='Streamed', task=self.task)
+        token = str(AccessToken.for_user(self.user))
+
+        self.async_client.cookies['access_token'] = token
+        response = await self.async_client.get(
+            reverse('task-changes-stream'), {'since': cursor})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = ''.join([
+            chunk.decode() if isinstance(chunk, bytes) else chunk
+            async for chunk in response.streaming_content
+        ])
+
+        event = body.split('event: changes\n', 1)[1]
+        payload = json.loads(event.split('data: ', 1)[1].split('\n', 1)[0])
+        self.assertEqual(payload['changes'][0]['data']['title'], 'Streamed')
+
+    @override_settings(SERVER_MODE='asgi')
+    async def test_event_stream_requires_authentication(self):
+        response = await self.async_client.get(reverse('task-changes-stream'))
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(SERVER_MODE='wsgi')
+    def test_event_stream_is_not_served_by_sync_workers(self):
+        self.client.cookies['access_token'] = str(AccessToken.for_user(self.user))
+        response = self.client.get(reverse('task-changes-stream'))
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIsInstance(response, StreamingHttpResponse)
+
+    @override_settings(CHANGE_FEED={'MAX_WAIT': 0, 'POLL_INTERVAL': 60})
+    def test_long_poll_wait_is_capped(self):
+        cursor = self.get_cursor()
+        response = self.client.get(self.url, {'since': cursor, 'wait': 3600})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['changes'], [])
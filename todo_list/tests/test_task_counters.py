@@ -0,0 +1,126 @@
+import io
+
+from rest_framework.test import APITestCase, APIClient
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from todo_list.models import Task, Subtask
+from todo_list_backend.response_cache import get_response_cache
+
+
+class SubtaskCounterTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.task = Task.objects.create(
+            title='Test Task', description='Test Description', color='red')
+
+    def assertCounters(self, task, total, done):
+        task = Task.objects.get(pk=task.pk)
+        self.assertEqual((task.subtask_total, task.subtask_done), (total, done))
+
+    def test_subtask_endpoints(self):
+        response = self.client.post(reverse('subtask-list'), {
+            'title': 'One', 'status': False, 'task': self.task.id}, format='json')
+        self.client.post(reverse('subtask-list'), {
+            'title': 'Two', 'status': True, 'task': self.task.id}, format='json')
+        self.assertCounters(self.task, 2, 1)
+
+        url = reverse('subtask-detail', args=[response.data['id']])
+        self.client.patch(url, {'status': True}, format='json')
+        self.assertCounters(self.task, 2, 2)
+        self.client.patch(url, {'title': 'Renamed'}, format='json')
+        self.assertCounters(self.task, 2, 2)
+
+        self.client.delete(url)
+        self.assertCounters(self.task, 1, 1)
+
+    def test_task_create_and_reconcile(self):
+        response = self.client.post(reverse('task-list'), {
+            'title': 'New Task', 'description': 'New Description',
+            'color': 'blue', 'members': [],
+            'subtasks': [{'title': 'One'}, {'title': 'Two', 'status': True}],
+        }, format='json')
+        task = Task.objects.get(pk=response.data['id'])
+        self.assertCounters(task, 2, 1)
+
+        one, two = response.data['subtasks']
+        response = self.client.patch(
+            reverse('task-detail', args=[task.id]), {'subtasks': [
+                {'id': one['id'], 'title': 'One', 'status': True},
+                {'title': 'Three', 'status': False},
+            ]}, format='json')
+        self.assertEqual(response.data['subtasks_progress'], 50)
+        self.assertCounters(task, 2, 1)
+
+    def test_batch(self):
+        Subtask.objects.create(title='Open', task=self.task)
+        response = self.client.post(reverse('task-batch'), {'operations': [
+            {'op': 'create', 'data': {
+                'title': 'Created', 'description': 'Description',
+                'color': 'blue', 'members': [],
+                'subtasks': [{'title': 'One', 'status': True}]}},
+            {'op': 'update', 'id': self.task.id, 'data': {
+                'subtasks': [{'title': 'New', 'status': True}]}},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        created = Task.objects.get(pk=response.data['results'][0]['id'])
+        self.assertCounters(created, 1, 1)
+        self.assertCounters(self.task, 1, 1)
+
+    def test_stale_task_save_keeps_counters(self):
+        stale = Task.objects.get(pk=self.task.pk)
+        Subtask.objects.create(title='Done', status=True, task=self.task)
+        stale.title = 'Renamed'
+        stale.save()
+        self.assertCounters(self.task, 1, 1)
+
+    def test_progress_needs_no_subtask_queries(self):
+        for status in (True, False, False, True):
+            Subtask.objects.create(title='Subtask', status=status, task=self.task)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                reverse('task-list'), {'fields': 'id,subtasks_progress'})
+        self.assertEqual(response.data[0]['subtasks_progress'], 50)
+        self.assertFalse([
+            query for query in context.captured_queries
+            if '"todo_list_subtask"."title"' in query['sql']
+        ])
+
+    def test_repair_command(self):
+        Subtask.objects.create(title='Done', status=True, task=self.task)
+        Task.objects.filter(pk=self.task.pk).update(
+            subtask_total=5, subtask_done=0)
+
+        out = io.StringIO()
+        call_command('repair_subtask_counters', dry_run=True, stdout=out)
+        self.assertIn('Found 1 drifted tasks.', out.getvalue())
+        self.assertCounters(self.task, 5, 0)
+
+        call_command('repair_subtask_counters', stdout=io.StringIO())
+        self.assertCounters(self.task, 1, 1)
+
+    @override_settings(RESPONSE_CACHE={
+        'BACKEND': 'todo_list_backend.response_cache.LocalResponseCache'})
+    def test_repair_invalidates_cached_responses(self):
+        get_response_cache.cache_clear()
+        self.task.members.set([self.user.userprofile])
+        Subtask.objects.create(title='Done', status=True, task=self.task)
+        Task.objects.filter(pk=self.task.pk).update(
+            subtask_total=4, subtask_done=0)
+        url = reverse('task-detail', args=[self.task.id])
+        etag = self.client.get(url)['ETag']
+        # served from the cache
+        self.assertEqual(self.client.get(url).json()['subtasks_progress'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('repair_subtask_counters', stdout=io.StringIO())
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['subtasks_progress'], 100)
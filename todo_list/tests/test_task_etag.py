@@ -0,0 +1,90 @@
+from rest_framework.test import APITestCase, APIClient
+from django.urls import reverse
+from django.contrib.auth.models import User
+from todo_list.models import Subtask, Task, Workspace
+
+
+class TaskConditionalGetTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword')
+        self.task = Task.objects.create(
+            title='Test Task', description='Test Description', color='red')
+        self.task.members.set([self.user.userprofile])
+        self.subtask = Subtask.objects.create(title='Subtask', task=self.task)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def assert_not_modified(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+        # max(updated_at) misses deletes, only the ETag counts rows
+        self.assertNotIn('Last-Modified', response)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        return etag
+
+    def test_task_list_not_modified(self):
+        self.assert_not_modified(reverse('task-list'))
+
+    def test_task_detail_not_modified(self):
+        self.assert_not_modified(reverse('task-detail', args=[self.task.id]))
+
+    def test_task_update_changes_etag(self):
+        url = reverse('task-list')
+        etag = self.assert_not_modified(url)
+        self.client.patch(
+            reverse('task-detail', args=[self.task.id]),
+            {'title': 'Changed'}, format='json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_subtask_delete_changes_etag(self):
+        url = reverse('task-detail', args=[self.task.id])
+        etag = self.assert_not_modified(url)
+        self.client.delete(reverse('subtask-detail', args=[self.subtask.id]))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['subtasks'], [])
+
+    def test_contacts_not_modified(self):
+        url = reverse('user-contacts')
+        etag = self.assert_not_modified(url)
+        self.client.patch(
+            reverse('user-contact-detail', args=[self.user.userprofile.id]),
+            {'color': 'blue'}, format='json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_modified_since_does_not_hide_deletes(self):
+        url = reverse('task-detail', args=[self.task.id])
+        self.client.delete(reverse('subtask-detail', args=[self.subtask.id]))
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+
+    def test_known_etag_of_a_hidden_task(self):
+        url = reverse('task-detail', args=[self.task.id])
+        etag = self.assert_not_modified(url)
+        self.task.workspace = Workspace.objects.create(name='Other')
+        self.task.save(update_fields=['workspace'])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 404)
+
+    def test_contact_detail_last_modified(self):
+        url = reverse('user-contact-detail', args=[self.user.userprofile.id])
+        response = self.client.get(url)
+        self.assertIn('Last-Modified', response)
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(
+            reverse('user-contact-detail', args=[9999]),
+            HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 404)
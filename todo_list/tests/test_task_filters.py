@@ -0,0 +1,92 @@
+import datetime
+
+from rest_framework.test import APITestCase, APIClient
+from django.urls import reverse
+from django.contrib.auth.models import User
+from todo_list.models import Task
+
+
+class TaskFilterTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword')
+        self.other = User.objects.create_user(
+            username='otheruser', email='other@example.com', password='testpassword')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('task-list')
+
+        today = datetime.date.today()
+        self.login = self.create_task(
+            'Fix login bug', 'Users cannot sign in', status='todo',
+            priority='high', due_date=today, members=[self.user, self.other])
+        self.docs = self.create_task(
+            'Write docs', 'Describe the API', status='done',
+            priority='low', due_date=today + datetime.timedelta(days=7),
+            checked=True, members=[self.other])
+        self.review = self.create_task(
+            'Review PR', 'Check the login form', status='in_progress',
+            category='technical_task', due_date=today - datetime.timedelta(days=7))
+
+    def create_task(self, title, description, members=(), **fields):
+        task = Task.objects.create(
+            title=title, description=description, color='red', **fields)
+        task.members.set([user.userprofile for user in members])
+        return task
+
+    def get_ids(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return {task['id'] for task in response.data}
+
+    def test_field_filters(self):
+        self.assertEqual(self.get_ids(status='todo,done'), {self.login.id, self.docs.id})
+        self.assertEqual(self.get_ids(priority='high'), {self.login.id})
+        self.assertEqual(self.get_ids(category='technical_task'), {self.review.id})
+        self.assertEqual(self.get_ids(checked='false'), {self.login.id, self.review.id})
+
+    def test_due_date_range(self):
+        today = datetime.date.today().isoformat()
+        self.assertEqual(self.get_ids(due_after=today), {self.login.id, self.docs.id})
+        self.assertEqual(
+            self.get_ids(due_after=today, due_before=today), {self.login.id})
+
+    def test_members(self):
+        self.assertEqual(self.get_ids(mine=1), {self.login.id})
+        other = self.other.userprofile.id
+        self.assertEqual(self.get_ids(member=other), {self.login.id, self.docs.id})
+        self.assertEqual(
+            self.get_ids(member=f'{other},{self.user.userprofile.id}'),
+            {self.login.id, self.docs.id})
+
+    def test_search(self):
+        self.assertEqual(self.get_ids(q='login'), {self.login.id, self.review.id})
+        self.assertEqual(self.get_ids(q='LOGIN form'), {self.review.id})
+        self.assertEqual(self.get_ids(q='PR'), {self.review.id})
+        self.assertEqual(self.get_ids(q='ogi', status='todo'), {self.login.id})
+
+    def test_search_follows_updates_and_deletes(self):
+        self.client.patch(
+            reverse('task-detail', args=[self.docs.id]),
+            {'title': 'Write changelog'}, format='json')
+        self.assertEqual(self.get_ids(q='changelog'), {self.docs.id})
+        self.assertEqual(self.get_ids(q='Write docs'), set())
+
+        self.client.delete(reverse('task-detail', args=[self.docs.id]))
+        self.assertEqual(self.get_ids(q='changelog'), set())
+
+    def test_filters_with_pagination(self):
+        response = self.client.get(
+            self.url, {'status': 'todo,in_progress', 'page_size': 1})
+        self.assertEqual(len(response.data['results']), 1)
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next'])
+
+    def test_invalid_values(self):
+        response = self.client.get(
+            self.url, {'status': 'nope', 'due_before': 'tomorrow', 'member': 'x'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            set(response.data), {'status', 'due_before', 'member'})
@@ -0,0 +1,77 @@
+from unittest import skipUnless
+
+from rest_framework.test import APITestCase, APIClient
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from todo_list.models import Task, Workspace
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is SQLite syntax')
+class TaskQueryPlanTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        for status in ('todo', 'done'):
+            task = Task.objects.create(
+                title='Task', description='Description', color='red',
+                status=status)
+            task.members.set([self.user.userprofile])
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            return '\n'.join(row[-1] for row in cursor.fetchall())
+
+    def endpoint_task_query(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return next(
+            query['sql'] for query in context.captured_queries
+            if 'FROM "todo_list_task"' in query['sql']
+            and 'ORDER BY' in query['sql'])
+
+    # The list reads only the rows of the user's workspaces. Ordering
+    # them may take a sort, but never a scan of the whole table.
+    def test_task_list_is_read_by_workspace(self):
+        plan = self.explain(self.endpoint_task_query(reverse('task-list')))
+        self.assertIn(
+            'SEARCH todo_list_task USING INDEX task_workspace_order_idx '
+            '(workspace_id=?)', plan)
+        self.assertNotIn('SCAN todo_list_task', plan)
+
+    def test_keyset_page_is_read_by_workspace(self):
+        url = reverse('task-list') + '?page_size=1'
+        cursor = self.client.get(url).data['next'].split('cursor=')[1]
+        plan = self.explain(self.endpoint_task_query(f'{url}&cursor={cursor}'))
+        self.assertIn(
+            'USING INDEX task_workspace_order_idx (workspace_id=? AND created_at<?)',
+            plan)
+        self.assertNotIn('SCAN todo_list_task', plan)
+
+    def test_workspace_is_read_in_index_order(self):
+        plan = str(Task.objects.filter(
+            workspace_id=Workspace.objects.default_id(),
+        ).order_by('-created_at', 'priority', 'id').explain())
+        self.assertIn('task_workspace_order_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_board_column(self):
+        plan = str(Task.objects.filter(status='todo').order_by('due_date').explain())
+        self.assertIn('task_status_due_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_open_tasks_use_partial_indexes(self):
+        plan = str(Task.objects.exclude(status='done').order_by('due_date').explain())
+        self.assertIn('task_open_due_idx', plan)
+        plan = str(Task.objects.filter(checked=False).order_by('due_date').explain())
+        self.assertIn('task_unchecked_due_idx', plan)
+
+    def test_tasks_of_member(self):
+        plan = str(Task.objects.filter(members=self.user.userprofile).explain())
+        self.assertIn('task_members_profile_idx', plan)
@@ -0,0 +1,66 @@
+import datetime
+
+from rest_framework.test import APITestCase, APIClient
+from django.urls import reverse
+from django.contrib.auth.models import User
+from todo_list.models import Task, Subtask
+
+
+class TaskPaginationTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('task-list')
+
+        today = datetime.date.today()
+        for i in range(7):
+            task = Task.objects.create(
+                title=f'Task {i}', description='Description', color='red',
+                priority=['low', 'medium', 'high'][i % 3])
+            # Several tasks share the same created_at, so the cursor has to
+            # break ties on priority and id.
+            Task.objects.filter(pk=task.pk).update(
+                created_at=today - datetime.timedelta(days=i // 3))
+            task.members.set([self.user.userprofile])
+            Subtask.objects.create(title='Subtask', task=task)
+
+    def test_default_response_is_unpaginated(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 7)
+
+    def test_cursor_pages_follow_default_ordering(self):
+        expected = [task.id for task in Task.objects.all()]
+        seen = []
+        url = f'{self.url}?page_size=3'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 3)
+            seen.extend(task['id'] for task in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(f'{self.url}?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+
+    def test_fields_selection(self):
+        response = self.client.get(
+            f'{self.url}?fields=id,title,members,subtasks_progress')
+        self.assertEqual(response.status_code, 200)
+        card = response.data[0]
+        self.assertEqual(
+            set(card), {'id', 'title', 'members', 'subtasks_progress'})
+        self.assertEqual(card['members'], [self.user.userprofile.id])
+
+    def test_fields_selection_with_expanded_members(self):
+        response = self.client.get(
+            f'{self.url}?fields=id,members&expand=members')
+        self.assertEqual(response.status_code, 200)
+        member = response.data[0]['members'][0]
+        self.assertEqual(member['user']['username'], 'testuser')
@@ -0,0 +1,97 @@
+from rest_framework.test import APITestCase, APIClient
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from todo_list.models import Task, Subtask
+
+
+class TaskQueryCountTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword')
+        self.other = User.objects.create_user(
+            username='otheruser', email='other@example.com', password='testpassword')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def create_tasks(self, count):
+        for i in range(count):
+            task = Task.objects.create(
+                title=f'Task {i}', description='Description', color='red')
+            task.members.set([self.user.userprofile, self.other.userprofile])
+            Subtask.objects.create(title='Open', status=False, task=task)
+            Subtask.objects.create(title='Done', status=True, task=task)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), response
+
+    def test_task_list_query_count_is_constant(self):
+        url = reverse('task-list')
+        self.create_tasks(2)
+        small, _ = self.count_queries(url)
+
+        self.create_tasks(20)
+        large, response = self.count_queries(url)
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(response.data), 22)
+        self.assertEqual(response.data[0]['subtasks_progress'], 50)
+        self.assertEqual(
+            response.data[0]['members'][0]['user']['username'], 'testuser')
+
+    def test_task_detail_query_count_is_constant(self):
+        self.create_tasks(1)
+        task = Task.objects.get()
+        small, _ = self.count_queries(reverse('task-detail', args=[task.id]))
+
+        for i in range(10):
+            Subtask.objects.create(title=f'Extra {i}', task=task)
+        large, response = self.count_queries(
+            reverse('task-detail', args=[task.id]))
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(response.data['subtasks']), 12)
+
+    def create_task_queries(self, members):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(reverse('task-list'), {
+                'title': 'New', 'description': 'Description', 'color': 'red',
+                'members': [profile.id for profile in members],
+                'subtasks': [],
+            }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [member['id'] for member in response.data['members']],
+            sorted(profile.id for profile in members))
+        return len(context.captured_queries)
+
+    def test_task_create_query_count_is_constant(self):
+        extra = [
+            User.objects.create_user(
+                username=f'user{i}', email=f'user{i}@example.com',
+                password='testpassword').userprofile
+            for i in range(5)
+        ]
+        small = self.create_task_queries([self.user.userprofile])
+        large = self.create_task_queries([self.user.userprofile, *extra])
+        self.assertEqual(small, large)
+
+    def test_unknown_member(self):
+        response = self.client.post(reverse('task-list'), {
+            'title': 'New', 'description': 'Description', 'color': 'red',
+            'members': [self.user.userprofile.id, 9999], 'subtasks': [],
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data['members'], ['Invalid pk "9999" - object does not exist.'])
+
+        response = self.client.post(reverse('task-list'), {
+            'title': 'New', 'description': 'Description', 'color': 'red',
+            'members': ['abc'], 'subtasks': [],
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,71 @@
+import datetime
+
+from asgiref.sync import async_to_sync
+from rest_framework.request import Request
+from rest_framework.test import APITestCase, APIClient, APIRequestFactory
+from django.urls import reverse
+from django.contrib.auth.models import User
+from todo_list.api.readers import TaskReader
+from todo_list.api.serializers import TaskItemSerializer, parse_field_selection
+from todo_list.models import Task, Subtask
+
+
+class TaskReaderContractTests(APITestCase):
+    """
+    TaskReader must produce exactly what TaskItemSerializer produces.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword',
+            first_name='Test', last_name='User')
+        self.other = User.objects.create_user(
+            username='otheruser', email='other@example.com', password='testpassword')
+        self.other.userprofile.phone_number = None
+        self.other.userprofile.save()
+
+        full = Task.objects.create(
+            title='Full', description='Description', color='red',
+            category='technical_task', priority='high', checked=True,
+            due_date=datetime.date(2024, 5, 1))
+        full.members.set([self.other.userprofile, self.user.userprofile])
+        for i, status in enumerate((True, False, True)):
+            Subtask.objects.create(title=f'Subtask {i}', status=status, task=full)
+        Task.objects.create(title='Empty', description='', color='blue')
+
+    def assertContract(self, query=''):
+        request = Request(APIRequestFactory().get('/api/tasks/' + query))
+        tasks = Task.objects.with_related()
+        expected = [
+            TaskItemSerializer(task, context={'request': request}).data
+            for task in tasks
+        ]
+
+        reader = TaskReader(*parse_field_selection(request))
+        rows = list(reader.values(Task.objects.all()))
+        for actual in (reader.to_data(rows), async_to_sync(reader.ato_data)(rows)):
+            self.assertEqual(len(actual), len(expected))
+            for fast, slow in zip(actual, expected):
+                self.assertEqual(list(fast), list(slow))
+                for name in slow:
+                    self.assertEqual(fast[name], slow[name], name)
+
+    def test_full_representation(self):
+        self.assertContract()
+
+    def test_field_selection(self):
+        self.assertContract('?fields=id,title,members,subtasks_progress')
+        self.assertContract('?fields=id,members,subtasks&expand=members')
+        self.assertContract('?fields=due_date,created_at,checked')
+
+    def test_endpoint_uses_reader(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.get(reverse('task-list'))
+        self.assertEqual(response.status_code, 200)
+        full, empty = response.data
+        self.assertEqual(
+            [member['user']['username'] for member in full['members']],
+            ['testuser', 'otheruser'])
+        self.assertEqual(full['subtasks_progress'], 67)
+        self.assertEqual((empty['members'], empty['subtasks']), ([], []))
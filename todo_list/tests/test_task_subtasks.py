@@ -0,0 +1,88 @@
+from rest_framework.test import APITestCase, APIClient
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from todo_list.models import Task, Subtask
+
+
+class TaskSubtaskReconciliationTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.task = Task.objects.create(
+            title='Test Task', description='Test Description', color='red')
+        self.url = reverse('task-detail', args=[self.task.id])
+
+    def create_subtasks(self, count):
+        return Subtask.objects.bulk_create([
+            Subtask(title=f'Subtask {i}', task=self.task) for i in range(count)
+        ])
+
+    def patch_subtasks(self, subtasks):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(
+                self.url, {'subtasks': subtasks}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response, [
+            query['sql'] for query in context.captured_queries
+            if 'todo_list_subtask' in query['sql']
+            and not query['sql'].startswith('SELECT')
+        ]
+
+    def test_reconcile_changes_creates_and_deletes(self):
+        first, second, third = self.create_subtasks(3)
+        untouched = Subtask.objects.get(pk=first.pk).updated_at
+
+        response, writes = self.patch_subtasks([
+            {'id': first.id, 'title': first.title, 'status': False},
+            {'id': second.id, 'title': 'Renamed', 'status': True},
+            {'title': 'New', 'status': False},
+        ])
+
+        self.assertEqual(len(writes), 3)
+        self.assertEqual(
+            [subtask['title'] for subtask in response.data['subtasks']],
+            ['Subtask 0', 'Renamed', 'New'])
+        self.assertFalse(Subtask.objects.filter(pk=third.pk).exists())
+        self.assertEqual(Subtask.objects.get(pk=first.pk).updated_at, untouched)
+        self.assertTrue(Subtask.objects.get(pk=second.pk).status)
+
+    def test_write_count_does_not_grow_with_subtasks(self):
+        subtasks = self.create_subtasks(30)
+        payload = [
+            {'id': subtask.id, 'title': f'Changed {subtask.id}', 'status': True}
+            for subtask in subtasks[:25]
+        ]
+        payload.append({'title': 'New 1', 'status': False})
+        payload.append({'title': 'New 2', 'status': False})
+
+        _, writes = self.patch_subtasks(payload)
+
+        self.assertEqual(len(writes), 3)
+        self.assertEqual(self.task.subtasks.count(), 27)
+
+    def test_unchanged_subtasks_are_not_written(self):
+        subtasks = self.create_subtasks(5)
+        _, writes = self.patch_subtasks([
+            {'id': subtask.id, 'title': subtask.title, 'status': subtask.status}
+            for subtask in subtasks
+        ])
+        self.assertEqual(writes, [])
+
+    def test_create_task_with_subtasks(self):
+        response = self.client.post(reverse('task-list'), {
+            'title': 'New Task',
+            'description': 'New Description',
+            'color': 'blue',
+            'members': [self.user.userprofile.id],
+            'subtasks': [{'title': 'One'}, {'title': 'Two', 'status': True}],
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [subtask['title'] for subtask in response.data['subtasks']],
+            ['One', 'Two'])
+        self.assertEqual(response.data['subtasks_progress'], 50)
@@ -0,0 +1,80 @@
+import datetime
+
+from rest_framework.test import APITestCase, APIClient
+from django.core.cache import cache
+from django.urls import reverse
+from django.contrib.auth.models import User
+from todo_list.models import Task
+
+
+class TaskSummaryTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('task-summary')
+        self.today = datetime.date.today()
+
+        self.urgent = self.create_task(
+            status='todo', priority='high',
+            due_date=self.today + datetime.timedelta(days=3))
+        self.create_task(
+            status='in_progress', priority='low', due_date=self.today)
+        self.create_task(
+            status='done', priority='high',
+            due_date=self.today - datetime.timedelta(days=3), members=[])
+
+    def create_task(self, members=None, **fields):
+        task = Task.objects.create(
+            title='Task', description='Description', color='red', **fields)
+        task.members.set(
+            [self.user.userprofile] if members is None else members)
+        return task
+
+    def get_summary(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_summary(self):
+        summary = self.get_summary()
+        self.assertEqual(summary['total'], 3)
+        self.assertEqual(summary['by_status'], {
+            'todo': 1, 'in_progress': 1, 'await_feedback': 0, 'done': 1})
+        self.assertEqual(summary['by_priority'], {
+            'low': 1, 'medium': 0, 'high': 2})
+        self.assertEqual(summary['urgent'], 1)
+        self.assertEqual(summary['next_due_date'], self.today)
+        self.assertEqual(
+            summary['next_urgent_due_date'],
+            self.today + datetime.timedelta(days=3))
+        self.assertEqual(summary['mine'], {'total': 2, 'open': 2})
+
+    def test_summary_is_cached_per_workspace(self):
+        # the user's workspace ids, then the two GROUP BY queries
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    def test_writes_invalidate(self):
+        self.get_summary()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                reverse('task-detail', args=[self.urgent.id]),
+                {'status': 'done', 'members': []}, format='json')
+        summary = self.get_summary()
+        self.assertEqual(summary['urgent'], 0)
+        self.assertEqual(summary['mine'], {'total': 1, 'open': 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('task-batch'), {'operations': [
+                {'op': 'create', 'data': {
+                    'title': 'Created', 'description': 'Description',
+                    'color': 'blue', 'members': [], 'subtasks': [],
+                    'priority': 'high'}},
+            ]}, format='json')
+        self.assertEqual(self.get_summary()['urgent'], 1)
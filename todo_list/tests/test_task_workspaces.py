@@ -0,0 +1,161 @@
+from rest_framework.test import APITestCase, APIClient
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from todo_list.models import Subtask, Task, Workspace, WorkspaceMembership
+
+
+class TaskWorkspaceTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.default = Workspace.objects.get(is_default=True)
+        self.other = Workspace.objects.create(name='Other')
+        self.user = self.create_user('anna')
+        self.outsider = self.create_user('bernd')
+        # bernd works in the other workspace only
+        WorkspaceMembership.objects.filter(
+            profile=self.outsider.userprofile).delete()
+        self.join(self.outsider, self.other)
+
+        self.task = self.create_task(self.default)
+        self.subtask = Subtask.objects.create(title='Step', task=self.task)
+        self.other_task = self.create_task(self.other)
+        self.client = self.client_for(self.user)
+
+    def create_user(self, username):
+        return User.objects.create_user(
+            username=username, email=f'{username}@example.com',
+            password='testpassword')
+
+    def create_task(self, workspace, **fields):
+        return Task.objects.create(
+            workspace=workspace, title='Task', description='Description',
+            color='red', **fields)
+
+    def join(self, user, workspace, role='member'):
+        return WorkspaceMembership.objects.create(
+            workspace=workspace, profile=user.userprofile, role=role)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def test_new_profiles_join_the_default_workspace(self):
+        self.assertTrue(self.default.members.filter(
+            pk=self.user.userprofile.pk).exists())
+
+    def test_default_workspace_is_resolved_on_save(self):
+        with self.assertNumQueries(0):
+            task = Task(title='Task', description='Description', color='red')
+            Task(workspace=self.other, title='Task', color='red')
+        self.assertIsNone(task.workspace_id)
+        task.save()
+        self.assertEqual(task.workspace_id, self.default.id)
+
+    def test_list_only_shows_own_workspaces(self):
+        response = self.client.get(reverse('task-list'))
+        self.assertEqual([task['id'] for task in response.data], [self.task.id])
+        self.assertEqual(response.data[0]['workspace'], self.default.id)
+
+        self.join(self.user, self.other, role='viewer')
+        response = self.client.get(reverse('task-list'))
+        self.assertEqual(
+            {task['id'] for task in response.data},
+            {self.task.id, self.other_task.id})
+
+    def test_list_query_count_does_not_depend_on_other_workspaces(self):
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(reverse('task-list'))
+        for _ in range(5):
+            self.create_task(self.other)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(reverse('task-list'))
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def test_other_workspaces_are_not_found(self):
+        response = self.client.get(
+            reverse('task-detail', args=[self.other_task.id]))
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(reverse('subtask-list'))
+        self.assertEqual([subtask['id'] for subtask in response.data],
+                         [self.subtask.id])
+        response = self.client_for(self.outsider).patch(
+            reverse('subtask-detail', args=[self.subtask.id]),
+            {'status': True}, format='json')
+        self.assertEqual(response.status_code, 404)
+        response = self.client_for(self.outsider).post(
+            reverse('subtask-list'),
+            {'title': 'Step', 'task': self.task.id}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'task': 'Task not found.'})
+
+    def test_viewers_cannot_write(self):
+        self.join(self.user, self.other, role='viewer')
+        response = self.client.patch(
+            reverse('task-detail', args=[self.other_task.id]),
+            {'title': 'Changed'}, format='json')
+        self.assertEqual(response.status_code, 403)
+        response = self.client.delete(
+            reverse('task-detail', args=[self.other_task.id]))
+        self.assertEqual(response.status_code, 403)
+        response = self.client.post(reverse('task-list'), {
+            'title': 'New', 'description': 'Description', 'color': 'blue',
+            'members': [], 'subtasks': [], 'workspace': self.other.id,
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('workspace', response.data)
+        response = self.client.post(reverse('task-batch'), {'operations': [
+            {'op': 'update', 'id': self.other_task.id, 'data': {'title': 'x'}},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['results'][0]['status'], 403)
+        self.other_task.refresh_from_db()
+        self.assertEqual(self.other_task.title, 'Task')
+
+    def test_create_goes_to_the_default_workspace(self):
+        payload = {
+            'title': 'New', 'description': 'Description', 'color': 'blue',
+            'members': [], 'subtasks': [],
+        }
+        response = self.client.post(reverse('task-list'), payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['workspace'], self.default.id)
+
+        # outside the default workspace: the user's own one
+        response = self.client_for(self.outsider).post(
+            reverse('task-list'), payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['workspace'], self.other.id)
+
+    def test_moving_a_task_updates_both_summaries(self):
+        self.join(self.user, self.other)
+        outsider = self.client_for(self.outsider)
+        newcomer = self.client_for(self.create_user('carla'))
+        self.assertEqual(outsider.get(reverse('task-summary')).data['total'], 1)
+        self.assertEqual(newcomer.get(reverse('task-summary')).data['total'], 1)
+        self.assertEqual(self.client.get(reverse('task-summary')).data['total'], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse('task-detail', args=[self.task.id]),
+                {'workspace': self.other.id}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(outsider.get(reverse('task-summary')).data['total'], 2)
+        self.assertEqual(newcomer.get(reverse('task-summary')).data['total'], 0)
+        self.assertEqual(self.client.get(reverse('task-summary')).data['total'], 2)
+
+    def test_change_feed_hides_other_workspaces(self):
+        since = self.client.get(reverse('task-changes')).data['cursor']
+        self.other_task.save()
+        self.task.save()
+        changes = self.client.get(
+            reverse('task-changes'), {'since': since}).data['changes']
+        self.assertEqual(
+            [(change['id'], change['action']) for change in changes],
+            [(self.other_task.id, 'deleted'), (self.task.id, 'updated')])
+        self.assertIsNone(changes[0]['data'])
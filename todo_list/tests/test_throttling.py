@@ -0,0 +1,97 @@
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from todo_list.api.throttle_stores import CacheThrottleStore, SQLiteThrottleStore
+from todo_list.api.throttling import SlidingWindowMixin
+
+
+class ThreePerMinuteThrottle(SlidingWindowMixin, SimpleRateThrottle):
+    rate = '3/min'
+
+    def get_cache_key(self, request, view):
+        return 'throttle_test_client'
+
+
+class SlidingWindowThrottleTests:
+    """
+    Runs against every store; subclasses set THROTTLE_STORE up.
+    """
+
+    def allow_at(self, now):
+        throttle = ThreePerMinuteThrottle()
+        with mock.patch.object(throttle, 'timer', return_value=now):
+            return throttle.allow_request(request=None, view=None), throttle
+
+    def test_limit_is_enforced(self):
+        results = [self.allow_at(60 * 100 + i)[0] for i in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+
+    def test_previous_window_is_weighted(self):
+        for i in range(3):
+            self.allow_at(60 * 100 + i)
+        # Half-way through the next window the previous one still counts
+        # for 1.5 requests, so only one more request fits.
+        allowed, _ = self.allow_at(60 * 101 + 30)
+        self.assertTrue(allowed)
+        allowed, throttle = self.allow_at(60 * 101 + 31)
+        self.assertFalse(allowed)
+        self.assertGreater(throttle.wait(), 0)
+
+    def test_rejected_requests_are_not_counted(self):
+        for i in range(3):
+            self.allow_at(60 * 100 + i)
+        for i in range(10):
+            allowed, throttle = self.allow_at(60 * 100 + 10 + i)
+            self.assertFalse(allowed)
+        self.assertEqual(throttle.current, 3)
+        allowed, _ = self.allow_at(60 * 101 + 30)
+        self.assertTrue(allowed)
+
+
+class SQLiteStoreThrottleTests(SlidingWindowThrottleTests, SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / 'throttle.sqlite3'
+        settings_override = override_settings(THROTTLE_STORE={
+            'BACKEND': 'todo_list.api.throttle_stores.SQLiteThrottleStore',
+            'OPTIONS': {'path': self.path},
+        })
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_workers_share_counters(self):
+        worker_a = SQLiteThrottleStore(self.path)
+        worker_b = SQLiteThrottleStore(self.path)
+        self.assertEqual(worker_a.hit('key:1', 'key:0', 60, 3, 1), (True, 1, 0))
+        self.assertEqual(worker_b.hit('key:1', 'key:0', 60, 3, 1), (True, 2, 0))
+        self.assertEqual(worker_a.hit('key:2', 'key:1', 60, 3, 1), (True, 1, 2))
+        self.assertEqual(worker_b.hit('key:2', 'key:1', 60, 3, 1), (False, 1, 2))
+
+
+@override_settings(
+    CACHES={'throttle': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'throttle-tests',
+    }},
+    THROTTLE_STORE={
+        'BACKEND': 'todo_list.api.throttle_stores.CacheThrottleStore',
+        'OPTIONS': {'alias': 'throttle'},
+    },
+)
+class CacheStoreThrottleTests(SlidingWindowThrottleTests, SimpleTestCase):
+
+    def setUp(self):
+        caches['throttle'].clear()
+
+    def test_rejected_request_is_taken_back(self):
+        store = CacheThrottleStore('throttle')
+        self.assertEqual(store.hit('key:1', 'key:0', 60, 1, 1), (True, 1, 0))
+        self.assertEqual(store.hit('key:1', 'key:0', 60, 1, 1), (False, 1, 0))
+        self.assertEqual(caches['throttle'].get('key:1'), 1)
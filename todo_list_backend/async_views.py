@@ -0,0 +1,155 @@
+"""
+Async handlers for DRF views, used when the app is served through
+todo_list_backend/asgi.py (SERVER_MODE=asgi).
+
+DRF views are sync only. `as_async_view()` returns an async Django view:
+the methods listed in `async_methods` run the usual DRF pipeline
+(authentication, permissions, throttles in a thread via sync_to_async)
+and then the view's `a<method>()` handler, e.g. `aget()`, which loads
+its data with Django's async ORM. Every other method goes to the normal
+sync view.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+
+from .middleware import timing
+
+
+class AsyncViewMixin:
+    async_methods = ()
+
+    @classmethod
+    def as_async_view(cls, **initkwargs):
+        sync_view = cls.as_view(**initkwargs)
+
+        async def view(request, *args, **kwargs):
+            method = request.method.lower()
+            if method not in cls.async_methods:
+                return await sync_to_async(sync_view)(request, *args, **kwargs)
+
+            self = cls(**initkwargs)
+            self.setup(request, *args, **kwargs)
+            self.args, self.kwargs = args, kwargs
+            request = self.initialize_request(request, *args, **kwargs)
+            self.request = request
+            self.headers = self.default_response_headers
+
+            try:
+                await sync_to_async(self.initial)(request, *args, **kwargs)
+                handler = getattr(self, 'a' + method)
+                response = await handler(request, *args, **kwargs)
+            except Exception as exc:
+                response = self.handle_exception(exc)
+
+            response = self.finalize_response(request, response, *args, **kwargs)
+            if isinstance(response, Response):
+                if isinstance(response.accepted_renderer, BrowsableAPIRenderer):
+                    # The browsable API renders forms, which may query.
+                    await sync_to_async(response.render)()
+                else:
+                    with timing(request, 'render'):
+                        response.render()
+            return response
+
+        view.cls = cls
+        view.initkwargs = initkwargs
+        # Not csrf_exempt(): before Django 5.0 it wraps the view in a sync
+        # function, which hides the coroutine from the handler.
+        view.csrf_exempt = True
+        return view
+
+
+class AsyncReadMixin(AsyncViewMixin):
+    async_methods = ('get',)
+
+    async def aget(self, request, *args, **kwargs):
+        raise NotImplementedError('.aget() must be overridden')
+
+
+def serialized(request, serializer):
+    """
+    serializer.data, timed as 'serialize' in the request's profile.
+    """
+    with timing(request, 'serialize'):
+        return serializer.data
+
+
+class AsyncListModelMixin(AsyncReadMixin):
+    """
+    Async counterpart of ListModelMixin.list. Both paths time the
+    serializer output as 'serialize'.
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serialized(request, serializer))
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serialized(request, serializer))
+
+    async def aget(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = await sync_to_async(self.paginate_queryset)(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serialized(request, serializer))
+
+        objects = [obj async for obj in queryset]
+        serializer = self.get_serializer(objects, many=True)
+        return Response(serialized(request, serializer))
+
+
+class AsyncRetrieveModelMixin(AsyncReadMixin):
+    """
+    Async counterpart of RetrieveModelMixin.retrieve. Both paths time the
+    serializer output as 'serialize'.
+    """
+
+    def retrieve(self, request, *args, **kwargs):
+        serializer = self.get_serializer(self.get_object())
+        return Response(serialized(request, serializer))
+
+    async def aget(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+        return Response(serialized(request, serializer))
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            instance = await queryset.aget(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError):
+            raise Http404
+        await sync_to_async(self.check_object_permissions)(
+            self.request, instance)
+        return instance
+
+
+def async_view(view_class, setting, **initkwargs):
+    """
+    The view for urls.py: the async view when settings.<setting> is on,
+    the plain DRF view otherwise.
+    """
+    if getattr(settings, setting, False):
+        return view_class.as_async_view(**initkwargs)
+    return view_class.as_view(**initkwargs)
+
+
+def read_view(view_class, **initkwargs):
+    """
+    Async GET when ASYNC_READ_VIEWS is on (ASGI).
+    """
+    return async_view(view_class, 'ASYNC_READ_VIEWS', **initkwargs)
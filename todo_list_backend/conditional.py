@@ -0,0 +1,98 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+VERSION_AGGREGATES = {'count': Count('pk'), 'updated': Max('updated_at')}
+
+
+def table_version(queryset):
+    """
+    Cheap version marker of a queryset: (row count, newest updated_at).
+    The count catches deletes, the timestamp catches inserts and updates.
+    """
+    return queryset.aggregate(**VERSION_AGGREGATES)
+
+
+async def atable_version(queryset):
+    return await queryset.aaggregate(**VERSION_AGGREGATES)
+
+
+def combine_versions(*versions):
+    """
+    Returns (token, last_modified) for one or more table_version() results.
+    """
+    token = hashlib.md5(
+        repr([(v['count'], v['updated']) for v in versions]).encode()
+    ).hexdigest()
+    timestamps = [v['updated'] for v in versions if v['updated'] is not None]
+    return token, max(timestamps) if timestamps else None
+
+
+class ConditionalGetMixin:
+    """
+    Weak ETag (+ optional Last-Modified) for GET/HEAD.
+
+    Views implement get_version_querysets(): the querysets the response
+    depends on. Their table_version() markers form the ETag, so a matching
+    If-None-Match returns 304 before the queryset is evaluated or anything
+    is serialized.
+
+    Last-Modified (and so If-Modified-Since) is only sent when
+    `send_last_modified` is set: the newest updated_at does not move when
+    a row is deleted or an m2m link removed, only the ETag's row count
+    does. That is safe for a single row only.
+
+    Detail views set `version_object`: their first version queryset is
+    the object, scoped like get_queryset(). Without a row the view
+    answers 404 before any validator is compared, so a known ETag does
+    not reveal that an object the user cannot see exists.
+    """
+    send_last_modified = False
+    version_object = False
+
+    def get_version_querysets(self):
+        raise NotImplementedError(
+            '.get_version_querysets() must be overridden')
+
+    def check_versions(self, versions):
+        if self.version_object and not versions[0]['count']:
+            raise Http404
+
+    def get(self, request, *args, **kwargs):
+        versions = [table_version(qs) for qs in self.get_version_querysets()]
+        self.check_versions(versions)
+        etag, timestamp = self.get_validators(versions)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return self.set_validators(response, etag, timestamp)
+
+    async def aget(self, request, *args, **kwargs):
+        versions = [
+            await atable_version(qs) for qs in self.get_version_querysets()]
+        self.check_versions(versions)
+        etag, timestamp = self.get_validators(versions)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = await super().aget(request, *args, **kwargs)
+        return self.set_validators(response, etag, timestamp)
+
+    def get_validators(self, versions):
+        token, last_modified = combine_versions(*versions)
+        timestamp = None
+        if self.send_last_modified and last_modified:
+            # HTTP dates have whole seconds
+            timestamp = int(last_modified.timestamp())
+        return f'W/"{token}"', timestamp
+
+    def set_validators(self, response, etag, timestamp):
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
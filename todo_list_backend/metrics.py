@@ -0,0 +1,109 @@
+"""
+Per-process runtime metrics, served at GET /api/metrics/ (staff only).
+
+Each gunicorn worker keeps its own counters, so the response includes
+the pid; scrape a few times to see every worker.
+"""
+import os
+import threading
+
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+_collectors = {}
+
+
+def register(name):
+    """
+    Decorator adding a section to the metrics response:
+
+        @register('cache')
+        def cache_metrics():
+            return {...}
+    """
+    def decorator(func):
+        _collectors[name] = func
+        return func
+    return decorator
+
+
+def collect():
+    return {'pid': os.getpid(), **{name: func() for name, func in _collectors.items()}}
+
+
+class ConnectionStats:
+    """
+    Counts requests and new database connections. With CONN_MAX_AGE
+    working, opens_per_request drops towards 0 once the workers are warm.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.connections_opened = 0
+            self.opened_in_requests = 0
+            self._active = 0
+
+    def request_started(self, **kwargs):
+        with self._lock:
+            self.requests += 1
+            self._active += 1
+
+    def request_finished(self, **kwargs):
+        with self._lock:
+            self._active = max(self._active - 1, 0)
+
+    def connection_created(self, **kwargs):
+        with self._lock:
+            self.connections_opened += 1
+            if self._active:
+                self.opened_in_requests += 1
+
+    def snapshot(self):
+        with self._lock:
+            requests, opened = self.requests, self.opened_in_requests
+            total = self.connections_opened
+        opens_per_request = opened / requests if requests else 0.0
+        return {
+            'requests': requests,
+            'connections_opened': total,
+            'opens_per_request': round(opens_per_request, 4),
+            'reuse_ratio': round(max(1 - opens_per_request, 0.0), 4) if requests else None,
+        }
+
+
+connection_stats = ConnectionStats()
+request_started.connect(connection_stats.request_started)
+request_finished.connect(connection_stats.request_finished)
+connection_created.connect(connection_stats.connection_created)
+
+
+@register('db')
+def db_metrics():
+    db = settings.DATABASES['default']
+    return {
+        'vendor': connections['default'].vendor,
+        'conn_max_age': db.get('CONN_MAX_AGE', 0),
+        'conn_health_checks': db.get('CONN_HEALTH_CHECKS', False),
+        'server_side_cursors': not db.get('DISABLE_SERVER_SIDE_CURSORS', False),
+        **connection_stats.snapshot(),
+    }
+
+
+class MetricsView(APIView):
+    """
+    GET /api/metrics/ -> counters of the worker that served the request.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(collect())
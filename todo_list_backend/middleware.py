@@ -0,0 +1,250 @@
+"""
+Per-request performance instrumentation.
+
+PerformanceMiddleware times a sample of the requests (settings
+PERF_SAMPLE_RATE, 0..1) and records wall time, DB time, query count,
+duplicate queries (the same SQL run more than once, usually an N+1),
+serialize time (serializers and readers building the response data,
+including the queries they run), render time (JSON encoding) and
+response size. Each sampled request gets a
+Server-Timing header and one JSON log line on the
+'todo_list_backend.perf' logger, and is added to a per-URL-name
+histogram served in the 'requests' section of GET /api/metrics/.
+
+With PERF_SAMPLE_RATE=0 the middleware removes itself at startup.
+"""
+import json
+import logging
+import random
+import threading
+from bisect import bisect_left
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from .metrics import register
+
+logger = logging.getLogger('todo_list_backend.perf')
+
+
+class RequestProfile:
+    """
+    Timings of one request. Installed as execute_wrapper on every
+    database connection while the request runs.
+    """
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.db_seconds = 0.0
+        self.queries = Counter()
+        self.timings = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += perf_counter() - started
+            self.queries[sql] += 1
+
+    @contextmanager
+    def timed(self, name):
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + perf_counter() - started
+
+    def record(self, request, response):
+        query_count = sum(self.queries.values())
+        match = getattr(request, 'resolver_match', None)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'url_name': match.url_name if match and match.url_name else 'unresolved',
+            'status': response.status_code,
+            'total_ms': round((perf_counter() - self.started) * 1000, 2),
+            'db_ms': round(self.db_seconds * 1000, 2),
+            'queries': query_count,
+            'duplicate_queries': query_count - len(self.queries),
+            'serialize_ms': round(self.timings.get('serialize', 0.0) * 1000, 2),
+            'render_ms': round(self.timings.get('render', 0.0) * 1000, 2),
+            'bytes': None if response.streaming else len(response.content),
+        }
+        if record['duplicate_queries']:
+            sql, count = self.queries.most_common(1)[0]
+            record['top_duplicate'] = {'sql': sql[:200], 'count': count}
+        return record
+
+
+@contextmanager
+def timing(request, name):
+    """
+    Adds the block's duration to the request's profile under `name`;
+    a no-op for requests that are not sampled.
+    """
+    profile = getattr(request, 'perf_profile', None)
+    if profile is None:
+        yield
+    else:
+        with profile.timed(name):
+            yield
+
+
+def server_timing(record):
+    return ', '.join([
+        f'app;dur={record["total_ms"]}',
+        f'db;dur={record["db_ms"]};desc="{record["queries"]} queries, '
+        f'{record["duplicate_queries"]} duplicate"',
+        f'serialize;dur={record["serialize_ms"]}',
+        f'render;dur={record["render_ms"]}',
+    ])
+
+
+class LatencyHistogram:
+    """
+    Request latency per URL name, in fixed buckets (milliseconds), with
+    DB time, query and size totals for the averages.
+    """
+    BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.endpoints = {}
+
+    def observe(self, record):
+        with self._lock:
+            stats = self.endpoints.get(record['url_name'])
+            if stats is None:
+                stats = self.endpoints[record['url_name']] = {
+                    'buckets': [0] * (len(self.BUCKETS) + 1),
+                    'count': 0, 'total_ms': 0.0, 'db_ms': 0.0,
+                    'serialize_ms': 0.0, 'render_ms': 0.0,
+                    'queries': 0, 'duplicate_queries': 0, 'bytes': 0,
+                }
+            stats['buckets'][bisect_left(self.BUCKETS, record['total_ms'])] += 1
+            stats['count'] += 1
+            for name in ('total_ms', 'db_ms', 'serialize_ms', 'render_ms',
+                         'queries', 'duplicate_queries'):
+                stats[name] += record[name]
+            stats['bytes'] += record['bytes'] or 0
+
+    def percentile(self, buckets, count, fraction):
+        """
+        Upper bound of the bucket holding the given fraction of requests
+        (None when it is the open-ended last bucket).
+        """
+        seen = 0
+        for bound, bucket in zip((*self.BUCKETS, None), buckets):
+            seen += bucket
+            if seen >= count * fraction:
+                return bound
+        return None
+
+    def snapshot(self):
+        with self._lock:
+            endpoints = {
+                name: {**stats, 'buckets': list(stats['buckets'])}
+                for name, stats in self.endpoints.items()
+            }
+        labels = [str(bound) for bound in self.BUCKETS] + ['+Inf']
+        result = {}
+        for name, stats in sorted(endpoints.items()):
+            count = stats['count']
+            result[name] = {
+                'count': count,
+                'avg_ms': round(stats['total_ms'] / count, 2),
+                'p50_ms': self.percentile(stats['buckets'], count, 0.5),
+                'p95_ms': self.percentile(stats['buckets'], count, 0.95),
+                'p99_ms': self.percentile(stats['buckets'], count, 0.99),
+                'avg_db_ms': round(stats['db_ms'] / count, 2),
+                'avg_serialize_ms': round(stats['serialize_ms'] / count, 2),
+                'avg_render_ms': round(stats['render_ms'] / count, 2),
+                'avg_queries': round(stats['queries'] / count, 2),
+                'avg_duplicate_queries': round(stats['duplicate_queries'] / count, 2),
+                'avg_bytes': round(stats['bytes'] / count),
+                'buckets': dict(zip(labels, stats['buckets'])),
+            }
+        return result
+
+
+latency_histogram = LatencyHistogram()
+
+
+@register('requests')
+def request_metrics():
+    return {
+        'sample_rate': getattr(settings, 'PERF_SAMPLE_RATE', 0),
+        'endpoints': latency_histogram.snapshot(),
+    }
+
+
+class PerformanceMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.sample_rate = getattr(settings, 'PERF_SAMPLE_RATE', 0)
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def sampled(self):
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def start(self, request, stack):
+        profile = request.perf_profile = RequestProfile()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(profile))
+        return profile
+
+    def finish(self, request, response, profile):
+        record = profile.record(request, response)
+        response['Server-Timing'] = server_timing(record)
+        latency_histogram.observe(record)
+        logger.info(json.dumps(record, separators=(',', ':')))
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+        with ExitStack() as stack:
+            profile = self.start(request, stack)
+            response = self.get_response(request)
+        return self.finish(request, response, profile)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+        # Connections are per thread: the wrappers go on the connection of
+        # the thread the async ORM runs its queries in.
+        stack = ExitStack()
+        profile = await sync_to_async(self.start)(request, stack)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.finish(request, response, profile)
+
+    def process_template_response(self, request, response):
+        """
+        Renders DRF responses here, so rendering gets its own timing.
+        The handler skips responses that are already rendered.
+        """
+        if getattr(request, 'perf_profile', None) is not None:
+            with request.perf_profile.timed('render'):
+                response.render()
+        return response
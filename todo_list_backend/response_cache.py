@@ -0,0 +1,321 @@
+"""
+Cache of rendered JSON responses for the task and contact endpoints.
+
+ResponseCacheMixin stores the bytes of a 200 GET response under a key
+made of the URL name, path, query params, accepted media type, the user
+(for per-user views) and the current version counters of the models the
+response is built from. A write bumps the counters of its model
+(bump_versions(), called from the save/delete signals and after bulk
+writes), so later requests use new keys and the stale entries are never
+read again; they age out of the cache.
+
+The backend is selected with settings.RESPONSE_CACHE:
+
+    RESPONSE_CACHE = {
+        "BACKEND": "todo_list_backend.response_cache.LocalResponseCache",
+        "OPTIONS": {"max_entries": 512, "timeout": 300},
+    }
+
+    - LocalResponseCache  -> in-process LRU, counters in memory. Only
+                             correct with a single worker process.
+    - SharedResponseCache -> a Django cache alias (Redis in production):
+                             entries and counters shared by all workers.
+
+Without a BACKEND nothing is cached. Hits and misses per URL name are in
+the 'response_cache' section of GET /api/metrics/.
+"""
+import hashlib
+import threading
+import time
+from functools import lru_cache
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.utils.module_loading import import_string
+from rest_framework.response import Response
+
+from .cache import LRUCache
+from .metrics import register
+from .middleware import timing
+
+KEY_PREFIX = 'response-cache'
+
+
+class BaseResponseCache:
+    """
+    Entries larger than max_entry_bytes are not stored, so memory use is
+    bounded by the number of entries times that size.
+    """
+
+    def __init__(self, timeout=300, max_entry_bytes=1024 * 1024):
+        self.timeout = timeout
+        self.max_entry_bytes = max_entry_bytes
+
+    def get_versions(self, labels):
+        """
+        Current counters of the given model labels, in order.
+        """
+        raise NotImplementedError('.get_versions() must be overridden')
+
+    def bump(self, labels):
+        raise NotImplementedError('.bump() must be overridden')
+
+    def get(self, key):
+        raise NotImplementedError('.get() must be overridden')
+
+    def set(self, key, content):
+        raise NotImplementedError('.set() must be overridden')
+
+    def info(self):
+        return {}
+
+
+class LocalResponseCache(BaseResponseCache):
+    """
+    LRUCache of at most max_entries responses in this process.
+    """
+
+    def __init__(self, max_entries=512, **kwargs):
+        super().__init__(**kwargs)
+        self.entries = LRUCache(max_size=max_entries, timeout=self.timeout)
+        self.versions = {}
+        self._lock = threading.Lock()
+
+    def get_versions(self, labels):
+        with self._lock:
+            return [self.versions.get(label, 0) for label in labels]
+
+    def bump(self, labels):
+        with self._lock:
+            for label in labels:
+                self.versions[label] = self.versions.get(label, 0) + 1
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, content):
+        self.entries.set(key, content)
+
+    def info(self):
+        return {'entries': len(self.entries), 'max_entries': self.entries.max_size}
+
+
+class SharedResponseCache(BaseResponseCache):
+    """
+    Entries expire after `timeout` seconds; beyond that the cache server
+    bounds memory (Redis: maxmemory with an allkeys-lru policy). Counters
+    do not expire. An evicted counter restarts from the clock, so it never
+    returns to a value whose entries may still be cached.
+    """
+
+    def __init__(self, alias='default', **kwargs):
+        super().__init__(**kwargs)
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @staticmethod
+    def version_key(label):
+        return f'{KEY_PREFIX}:version:{label}'
+
+    @staticmethod
+    def initial_version():
+        return time.time_ns() // 1000
+
+    def get_versions(self, labels):
+        cache = self.cache
+        keys = [self.version_key(label) for label in labels]
+        versions = cache.get_many(keys)
+        for key in keys:
+            if key not in versions:
+                cache.add(key, self.initial_version(), None)
+                versions[key] = cache.get(key)
+        return [versions[key] for key in keys]
+
+    def bump(self, labels):
+        cache = self.cache
+        for label in labels:
+            key = self.version_key(label)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, self.initial_version(), None)
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, content):
+        self.cache.set(key, content, self.timeout)
+
+
+@lru_cache(maxsize=None)
+def get_response_cache():
+    config = getattr(settings, 'RESPONSE_CACHE', {})
+    if not config.get('BACKEND'):
+        return None
+    return import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+
+
+@receiver(setting_changed)
+def reset_response_cache(setting, **kwargs):
+    if setting == 'RESPONSE_CACHE':
+        get_response_cache.cache_clear()
+
+
+def bump_versions(*models):
+    """
+    Invalidates the cached responses built from these models (classes or
+    instances) once the current transaction commits (right away outside
+    of one), so no reader can cache pre-commit data under the new version.
+    """
+    cache = get_response_cache()
+    if cache is None:
+        return
+    labels = sorted({model._meta.label_lower for model in models})
+    if labels:
+        transaction.on_commit(lambda: cache.bump(labels))
+
+
+class ResponseCacheStats:
+    """
+    Hits and misses per URL name, in this process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.endpoints = {}
+            self.too_large = 0
+
+    def count(self, name, outcome):
+        with self._lock:
+            stats = self.endpoints.setdefault(name, {'hits': 0, 'misses': 0})
+            stats[outcome] += 1
+
+    def skip(self):
+        with self._lock:
+            self.too_large += 1
+
+    def snapshot(self):
+        with self._lock:
+            endpoints = {
+                name: dict(stats) for name, stats in self.endpoints.items()}
+            too_large = self.too_large
+
+        def ratio(hits, misses):
+            return round(hits / (hits + misses), 4) if hits + misses else None
+
+        for stats in endpoints.values():
+            stats['hit_ratio'] = ratio(stats['hits'], stats['misses'])
+        hits = sum(stats['hits'] for stats in endpoints.values())
+        misses = sum(stats['misses'] for stats in endpoints.values())
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': ratio(hits, misses),
+            'too_large': too_large,
+            'endpoints': dict(sorted(endpoints.items())),
+        }
+
+
+response_cache_stats = ResponseCacheStats()
+
+
+@register('response_cache')
+def response_cache_metrics():
+    cache = get_response_cache()
+    return {
+        'backend': type(cache).__name__ if cache else None,
+        **(cache.info() if cache else {}),
+        **response_cache_stats.snapshot(),
+    }
+
+
+class ResponseCacheMixin:
+    """
+    Serves GET from the response cache.
+
+    Views list the models their response is built from in
+    `response_cache_models`. Views whose response depends on who asks
+    (querysets scoped to the user) set `response_cache_per_user`; a hit
+    skips the view, including its object permission checks, so entries
+    must never be shared between users who could see different data.
+    Only JSON responses are cached. The backend calls are short and are
+    made directly, also from the async views.
+    """
+    response_cache_models = ()
+    response_cache_per_user = False
+    response_cache_key = None
+
+    def get(self, request, *args, **kwargs):
+        response = self.get_cached_response(request)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return response
+
+    async def aget(self, request, *args, **kwargs):
+        response = self.get_cached_response(request)
+        if response is None:
+            response = await super().aget(request, *args, **kwargs)
+        return response
+
+    def get_response_cache_name(self, request):
+        match = request.resolver_match
+        return match.url_name if match and match.url_name else type(self).__name__
+
+    def get_response_cache_key(self, request, cache):
+        labels = [model._meta.label_lower for model in self.response_cache_models]
+        versions = cache.get_versions(labels)
+        parts = [
+            request.path,
+            urlencode(sorted(request.query_params.lists()), doseq=True),
+            request.accepted_media_type,
+            str(request.user.id) if self.response_cache_per_user else '*',
+            *(f'{label}={version}' for label, version in zip(labels, versions)),
+        ]
+        digest = hashlib.sha1('|'.join(parts).encode()).hexdigest()
+        return f'{KEY_PREFIX}:{self.get_response_cache_name(request)}:{digest}'
+
+    def get_cached_response(self, request):
+        cache = get_response_cache()
+        renderer = getattr(request, 'accepted_renderer', None)
+        if cache is None or getattr(renderer, 'format', None) != 'json':
+            return None
+
+        key = self.get_response_cache_key(request, cache)
+        content = cache.get(key)
+        name = self.get_response_cache_name(request)
+        if content is None:
+            response_cache_stats.count(name, 'misses')
+            self.response_cache_key = key
+            return None
+
+        response_cache_stats.count(name, 'hits')
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type += f'; charset={renderer.charset}'
+        return HttpResponse(content, content_type=content_type)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if (self.response_cache_key is not None
+                and isinstance(response, Response)
+                and response.status_code == 200):
+            with timing(request, 'render'):
+                response.render()
+            cache = get_response_cache()
+            if len(response.content) > cache.max_entry_bytes:
+                response_cache_stats.skip()
+            else:
+                cache.set(self.response_cache_key, response.content)
+        return response
@@ -84,6 +84,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # outermost, so its timings cover the whole request
+    'todo_list_backend.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
 
@@ -98,6 +100,26 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'todo_list_backend.urls'
 
+# Share of requests timed by PerformanceMiddleware (0..1): Server-Timing
+# header, a JSON line on the todo_list_backend.perf logger and the
+# per-endpoint histogram in GET /api/metrics/. 0 = off, no overhead.
+PERF_SAMPLE_RATE = float(os.getenv("PERF_SAMPLE_RATE", "0"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "todo_list_backend.perf": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -115,19 +137,29 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'todo_list_backend.wsgi.application'
+ASGI_APPLICATION = 'todo_list_backend.asgi.application'
+
+# SERVER_MODE=wsgi -> gunicorn sync workers (scripts/entrypoint.sh)
+# SERVER_MODE=asgi -> gunicorn + uvicorn workers; the hot GET endpoints
+#                     (task list/detail, contacts) run as async views
+SERVER_MODE = os.getenv("SERVER_MODE", "wsgi")
+ASYNC_READ_VIEWS = os.getenv(
+    "ASYNC_READ_VIEWS", "1" if SERVER_MODE == "asgi" else "0") == "1"
 
 # ---------------------------------------------------------------------
 # Database
 # ---------------------------------------------------------------------
 # Dev: USE_SQLITE=1 -> SQLite
 # Prod: USE_SQLITE=0 -> Postgres (RDS) с SSL
+# SQLITE_PATH moves the SQLite file; scripts/bench_*.py use it to run the
+# servers they start against a throwaway database.
 USE_SQLITE = os.getenv("USE_SQLITE", "1") == "1"
 
 if USE_SQLITE:
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
-            "NAME": BASE_DIR / "db.sqlite3",
+            "NAME": os.getenv("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
         }
     }
 else:
@@ -145,6 +177,163 @@ else:
         }
     }
 
+# Connection reuse. Without it every request pays a new TLS handshake.
+# DB_CONN_MAX_AGE       seconds a worker keeps its connection open
+#                       (0 = close after each request, "none" = forever)
+# DB_CONN_HEALTH_CHECKS ping a reused connection before the request uses it
+# DB_POOLER=1           behind a transaction-level pooler (PgBouncer, RDS
+#                       Proxy): no server-side cursors, since a cursor does
+#                       not survive the pooler switching server connections
+# Under SERVER_MODE=asgi every request runs its sync code in a new thread,
+# so a kept connection is never reused and only piles up until it ages
+# out (RDS max_connections). The default is 0 there; reuse connections
+# through DB_POOLER instead.
+_conn_max_age = os.getenv(
+    "DB_CONN_MAX_AGE", "0" if USE_SQLITE or SERVER_MODE == "asgi" else "60")
+DATABASES["default"].update({
+    "CONN_MAX_AGE": None if _conn_max_age.lower() == "none" else int(_conn_max_age),
+    "CONN_HEALTH_CHECKS": os.getenv("DB_CONN_HEALTH_CHECKS", "1") == "1",
+})
+if os.getenv("DB_POOLER", "0") == "1":
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+
+# ---------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------
+# REDIS_URL set -> shared Redis cache (all gunicorn workers see the same data)
+# otherwise      -> per-process LocMemCache (dev)
+REDIS_URL = os.getenv("REDIS_URL", "")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Counters for the sliding-window throttles (todo_list/api/throttling.py).
+# THROTTLE_STORE=cache  -> the "default" cache above (Redis in production)
+# THROTTLE_STORE=sqlite -> a SQLite file shared by the workers on one host
+if os.getenv("THROTTLE_STORE", "cache") == "sqlite":
+    THROTTLE_STORE = {
+        "BACKEND": "todo_list.api.throttle_stores.SQLiteThrottleStore",
+        "OPTIONS": {
+            "path": os.getenv("THROTTLE_SQLITE_PATH", BASE_DIR / "throttle.sqlite3"),
+        },
+    }
+else:
+    THROTTLE_STORE = {
+        "BACKEND": "todo_list.api.throttle_stores.CacheThrottleStore",
+        "OPTIONS": {"alias": "default"},
+    }
+
+# GET /api/tasks/summary/ is cached until the next task write, at most
+# this many seconds (0 = no caching).
+TASK_SUMMARY_CACHE_TIMEOUT = int(os.getenv("TASK_SUMMARY_CACHE_TIMEOUT", "300"))
+
+# Rendered JSON of the task and contact lists/details, keyed by per-model
+# version counters (todo_list_backend/response_cache.py).
+# RESPONSE_CACHE=local  -> in-process LRU; only correct with ONE worker process
+# RESPONSE_CACHE=shared -> the "default" cache above, shared by all workers
+# RESPONSE_CACHE=off    -> no response cache (default)
+RESPONSE_CACHE_MODE = os.getenv("RESPONSE_CACHE", "off")
+_response_cache_options = {
+    "timeout": int(os.getenv("RESPONSE_CACHE_TIMEOUT", "300")),
+    "max_entry_bytes": int(os.getenv("RESPONSE_CACHE_MAX_ENTRY_BYTES", "1048576")),
+}
+if RESPONSE_CACHE_MODE == "local":
+    RESPONSE_CACHE = {
+        "BACKEND": "todo_list_backend.response_cache.LocalResponseCache",
+        "OPTIONS": {
+            **_response_cache_options,
+            "max_entries": int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512")),
+        },
+    }
+elif RESPONSE_CACHE_MODE == "shared":
+    RESPONSE_CACHE = {
+        "BACKEND": "todo_list_backend.response_cache.SharedResponseCache",
+        "OPTIONS": {**_response_cache_options, "alias": "default"},
+    }
+else:
+    RESPONSE_CACHE = {}
+
+# Tasks are visible to the members of their workspace only. New profiles
+# join the default workspace (the single shared board of older versions)
+# as members; set to 0 when workspaces are managed explicitly.
+WORKSPACE_AUTO_JOIN = os.getenv("WORKSPACE_AUTO_JOIN", "1") == "1"
+
+# Change feed (GET /api/tasks/changes/, /api/tasks/changes/stream/)
+# MAX_WAIT: longest ?wait= of a long poll. The poll blocks a sync worker,
+# so it is capped at a quarter of the gunicorn worker timeout
+# (GUNICORN_TIMEOUT, scripts/entrypoint.sh). The SSE stream is only served
+# with SERVER_MODE=asgi.
+_worker_timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+CHANGE_FEED = {
+    "PAGE_SIZE": 500,
+    "MAX_WAIT": min(int(os.getenv("CHANGE_FEED_MAX_WAIT", "25")),
+                    _worker_timeout // 4),
+    "POLL_INTERVAL": 1,
+    "KEEPALIVE_SECONDS": 15,
+    "STREAM_SECONDS": int(os.getenv("CHANGE_FEED_STREAM_SECONDS", "300")),
+    # Seconds a log entry must be old before it is served (see
+    # todo_list/api/changes.py); must exceed the longest write transaction.
+    # SQLite commits writers one at a time, in id order.
+    "VISIBILITY_LAG": float(os.getenv(
+        "CHANGE_FEED_VISIBILITY_LAG", "0" if USE_SQLITE else "2")),
+    # used by `manage.py prune_changes`
+    "RETENTION_DAYS": int(os.getenv("CHANGE_FEED_RETENTION_DAYS", "7")),
+}
+
+# ---------------------------------------------------------------------
+# Password hashing (user_auth_app/hashers.py)
+# ---------------------------------------------------------------------
+# PASSWORD_HASHER hashes new passwords: pbkdf2, scrypt or argon2 (needs
+# argon2-cffi). Passwords hashed with another hasher or cost are
+# rehashed on their next successful login.
+PASSWORD_HASHER_CHOICES = {
+    "pbkdf2": "user_auth_app.hashers.PBKDF2PasswordHasher",
+    "scrypt": "user_auth_app.hashers.ScryptPasswordHasher",
+    "argon2": "user_auth_app.hashers.Argon2PasswordHasher",
+}
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "pbkdf2")
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_CHOICES[PASSWORD_HASHER],
+    *(path for name, path in PASSWORD_HASHER_CHOICES.items()
+      if name != PASSWORD_HASHER),
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+]
+
+
+def _env_int(name):
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+# Unset -> Django's default cost for that hasher.
+PASSWORD_HASHING = {
+    "PBKDF2_ITERATIONS": _env_int("PBKDF2_ITERATIONS"),
+    "SCRYPT_WORK_FACTOR": _env_int("SCRYPT_WORK_FACTOR"),
+    "SCRYPT_PARALLELISM": _env_int("SCRYPT_PARALLELISM"),
+    "ARGON2_TIME_COST": _env_int("ARGON2_TIME_COST"),
+    "ARGON2_MEMORY_COST": _env_int("ARGON2_MEMORY_COST"),  # KiB
+    "ARGON2_PARALLELISM": _env_int("ARGON2_PARALLELISM"),
+    # Threads that verify passwords for the async login view
+    "WORKERS": _env_int("PASSWORD_HASH_WORKERS") or 2,
+}
+
+# POST /api/login/ as an async view: the password check runs in a
+# bounded thread pool instead of blocking the worker (SERVER_MODE=asgi).
+ASYNC_LOGIN = os.getenv(
+    "ASYNC_LOGIN", "1" if SERVER_MODE == "asgi" else "0") == "1"
+
 # ---------------------------------------------------------------------
 # Password validation
 # ---------------------------------------------------------------------
@@ -183,20 +372,52 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": False,
     "BLACKLIST_AFTER_ROTATION": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    # int `id`, like User.id (the claim itself is a string)
+    "TOKEN_USER_CLASS": "user_auth_app.authentication.TokenUser",
+}
+
+# In-process cache of the user resolved from the access token cookie
+# (user_auth_app/authentication.py). TIMEOUT=0 disables it.
+# STATELESS_READS=1 -> GET/HEAD/OPTIONS get a TokenUser built from the
+# token claims, without any DB lookup.
+AUTH_USER_CACHE = {
+    "TIMEOUT": int(os.getenv("AUTH_USER_CACHE_TIMEOUT", "60")),
+    "MAX_SIZE": int(os.getenv("AUTH_USER_CACHE_MAX_SIZE", "1024")),
+    "STATELESS_READS": os.getenv("AUTH_STATELESS_READS", "0") == "1",
 }
 
 # ---------------------------------------------------------------------
 # DRF
 # ---------------------------------------------------------------------
+# JSON_BACKEND=orjson -> todo_list_backend/renderers.py (stdlib fallback
+#                       when orjson is missing); stdlib -> DRF defaults.
+# The browsable API is only offered with DEBUG.
+JSON_BACKEND = os.getenv("JSON_BACKEND", "orjson")
+if JSON_BACKEND == "orjson":
+    _JSON_RENDERER = "todo_list_backend.renderers.FastJSONRenderer"
+    _JSON_PARSER = "todo_list_backend.renderers.FastJSONParser"
+else:
+    _JSON_RENDERER = "rest_framework.renderers.JSONRenderer"
+    _JSON_PARSER = "rest_framework.parsers.JSONParser"
+
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [_JSON_RENDERER] + (
+        ['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
+    'DEFAULT_PARSER_CLASSES': [
+        _JSON_PARSER,
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'todo_list.api.throttling.AnonThrottle',
+        'todo_list.api.throttling.UserThrottle'
     ],
+    # Overridable so scripts/bench_*.py can lift the limits for their
+    # load runs; the defaults are the production rates.
     'DEFAULT_THROTTLE_RATES': {
-        'anon': '1000/day',
-        'user': '5000/day',
-        'task-write': '500/day',
+        'anon': os.getenv("THROTTLE_ANON_RATE", "1000/day"),
+        'user': os.getenv("THROTTLE_USER_RATE", "5000/day"),
+        'task-write': os.getenv("THROTTLE_TASK_WRITE_RATE", "500/day"),
     },
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
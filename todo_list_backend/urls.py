@@ -19,9 +19,12 @@ from django.urls import path, include
 from django.conf import settings
 from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 
+from .metrics import MetricsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('user_auth_app.api.urls')),
     path('api/', include('todo_list.api.urls')),
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
     path('api-auth', include('rest_framework.urls'))
 ] + staticfiles_urlpatterns()
@@ -0,0 +1,21 @@
+from django.db.models import Q
+from rest_framework.filters import BaseFilterBackend
+
+
+class ContactSearchFilter(BaseFilterBackend):
+    """
+    ?q=an mü -> contacts where every word is the start of the first name,
+    last name, username or email (case-insensitive). Prefix matching keeps
+    the lookups on the indexes from migration 0003.
+    """
+    search_param = 'q'
+    search_fields = (
+        'user__first_name', 'user__last_name', 'user__username', 'user__email')
+
+    def filter_queryset(self, request, queryset, view):
+        for word in request.query_params.get(self.search_param, '').split():
+            match = Q()
+            for field in self.search_fields:
+                match |= Q(**{f'{field}__istartswith': word})
+            queryset = queryset.filter(match)
+        return queryset
@@ -0,0 +1,11 @@
+from todo_list.api.pagination import KeysetPagination
+
+
+class ContactPagination(KeysetPagination):
+    """
+    Opt-in keyset pagination of the contacts (?page_size= / ?cursor=),
+    ordered by the primary key.
+    """
+    ordering = ('id',)
+    page_size = 100
+    max_page_size = 500
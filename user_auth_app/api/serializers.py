@@ -1,7 +1,14 @@
 from rest_framework import serializers
+from django.db import IntegrityError, transaction
 from django.contrib.auth.models import User
 
 from todo_list.models import UserProfile
+from user_auth_app.models import unique_conflict
+
+USER_CONFLICT_MESSAGES = {
+    'username': 'This username is already taken.',
+    'email': 'This email is already in use.',
+}
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -13,21 +20,6 @@ class UserSerializer(serializers.ModelSerializer):
             "username": {"read_only": True},
         }
 
-    def validate_username(self, username):
-        user = self.instance
-
-        if User.objects.filter(username=username).exclude(pk=user.pk).exists():
-            raise serializers.ValidationError(
-                "This username is already taken.")
-        return username
-
-    def validate_email(self, email):
-        user = self.instance
-
-        if User.objects.filter(email=email).exclude(pk=user.pk).exists():
-            raise serializers.ValidationError("This email is already in use.")
-        return email
-
 
 class UserProfileSerializer(serializers.ModelSerializer):
     user = UserSerializer()
@@ -42,7 +34,21 @@ class UserProfileSerializer(serializers.ModelSerializer):
             user_instance = instance.user
             for attr, value in user_data.items():
                 setattr(user_instance, attr, value)
-            user_instance.save()
+            # The profile is saved below, the post_save receiver of User
+            # does not need to touch it. Uniqueness is enforced by
+            # auth_user's constraints.
+            user_instance.profile_save_pending = True
+            try:
+                with transaction.atomic():
+                    user_instance.save()
+            except IntegrityError as error:
+                field = unique_conflict(error)
+                if field is None:
+                    raise
+                raise serializers.ValidationError(
+                    {'user': {field: [USER_CONFLICT_MESSAGES[field]]}})
+            finally:
+                user_instance.profile_save_pending = False
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
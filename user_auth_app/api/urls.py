@@ -1,14 +1,17 @@
 from django.urls import path
 from rest_framework.authtoken.views import obtain_auth_token
-from .views import UserProfileList_View, UserProfileDetail_View, UserRegister_View, UserRefreshToken_View, UserLogin_View, UserLogout_View
+from todo_list_backend.async_views import async_view, read_view
+from .views import ContactPicker_View, UserProfileList_View, UserProfileDetail_View, UserRegister_View, UserRefreshToken_View, UserLogin_View, UserLogout_View
 
 urlpatterns = [
     path('register/', UserRegister_View.as_view(), name='user-register'),
-    path('login/', UserLogin_View.as_view(), name='user-login'),
+    path('login/', async_view(UserLogin_View, 'ASYNC_LOGIN'), name='user-login'),
     path('refresh/', UserRefreshToken_View.as_view(), name='token-refresh'),
     path('logout/', UserLogout_View.as_view(), name='user-logout'),
 
-    path('contacts/', UserProfileList_View.as_view(), name='user-contacts'),
+    path('contacts/', read_view(UserProfileList_View), name='user-contacts'),
+    path('contacts/picker/', read_view(ContactPicker_View),
+         name='user-contacts-picker'),
     path('contacts/<int:pk>/',
          UserProfileDetail_View.as_view(), name='user-contact-detail'),
 ]
@@ -1,4 +1,6 @@
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.db import IntegrityError, transaction
 from rest_framework import status, generics
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -8,29 +10,124 @@ from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework.response import Response
 
 from django.contrib.auth.models import User
-from django.contrib.auth import authenticate
 
-from user_auth_app.models import UserProfile
+from todo_list_backend.async_views import (
+    AsyncListModelMixin, AsyncViewMixin, serialized)
+from todo_list_backend.conditional import ConditionalGetMixin
+from todo_list_backend.middleware import timing
+from todo_list_backend.response_cache import ResponseCacheMixin
+from user_auth_app.hashers import acheck_password
+from user_auth_app.models import UserProfile, unique_conflict
 from user_auth_app.utils import clear_jwt_cookies, set_jwt_cookies
+from .filters import ContactSearchFilter
+from .pagination import ContactPagination
 from .serializers import UserProfileSerializer
 
 
-class UserProfileList_View(generics.ListCreateAPIView):
+CONTACT_RESPONSE_MODELS = (UserProfile, User)
+
+
+class UserProfileList_View(ConditionalGetMixin, ResponseCacheMixin, AsyncListModelMixin, generics.ListCreateAPIView):
     """
     List all user profiles or create a new user profile.
+
+    GET query params (all optional):
+        ?q=an mü                  -> prefix search over name, username, email
+        ?page_size=100&cursor=... -> keyset pagination ({next, results})
+
+    GET answers If-None-Match with 304, uses the response cache and is
+    served async under ASGI.
     """
-    queryset = UserProfile.objects.all()
+    queryset = UserProfile.objects.select_related('user')
     serializer_class = UserProfileSerializer
     permission_classes = [IsAuthenticated]
+    filter_backends = [ContactSearchFilter]
+    pagination_class = ContactPagination
+    response_cache_models = CONTACT_RESPONSE_MODELS
+
+    def get_version_querysets(self):
+        return [UserProfile.objects.all()]
 
 
-class UserProfileDetail_View(generics.RetrieveUpdateDestroyAPIView):
+def contact_initials(first_name, last_name, username):
+    letters = [name[0] for name in (first_name, last_name) if name]
+    return ''.join(letters).upper() or username[:1].upper()
+
+
+class ContactPicker_View(ConditionalGetMixin, ResponseCacheMixin, AsyncListModelMixin, generics.ListAPIView):
     """
-    Retrieve, update or delete a user profile.
+    GET /api/contacts/picker/ -> [{"id": 3, "initials": "AM", "color": "..."}]
+
+    Compact contacts for the task assignment dropdown, read as values()
+    rows. Same ?q= search and pagination as the contacts list.
     """
     queryset = UserProfile.objects.all()
+    permission_classes = [IsAuthenticated]
+    filter_backends = [ContactSearchFilter]
+    pagination_class = ContactPagination
+    response_cache_models = CONTACT_RESPONSE_MODELS
+    columns = (
+        'id', 'color', 'user__first_name', 'user__last_name', 'user__username')
+
+    def get_version_querysets(self):
+        return [UserProfile.objects.all()]
+
+    def get_rows(self):
+        return self.filter_queryset(self.get_queryset()).order_by(
+            'id').values(*self.columns)
+
+    def to_data(self, rows):
+        return [
+            {
+                'id': row['id'],
+                'initials': contact_initials(
+                    row['user__first_name'], row['user__last_name'],
+                    row['user__username']),
+                'color': row['color'],
+            }
+            for row in rows
+        ]
+
+    def list(self, request, *args, **kwargs):
+        rows = self.get_rows()
+        page = self.paginate_queryset(rows)
+        rows = list(rows) if page is None else page
+        with timing(request, 'serialize'):
+            data = self.to_data(rows)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    async def alist(self, request, *args, **kwargs):
+        rows = self.get_rows()
+        page = await sync_to_async(self.paginate_queryset)(rows)
+        rows = [row async for row in rows] if page is None else page
+        with timing(request, 'serialize'):
+            data = self.to_data(rows)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+class UserProfileDetail_View(ConditionalGetMixin, ResponseCacheMixin, generics.RetrieveUpdateDestroyAPIView):
+    """
+    Retrieve, update or delete a user profile.
+    GET answers If-None-Match / If-Modified-Since with 304 (404 first for
+    unknown profiles) and uses the response cache.
+    """
+    queryset = UserProfile.objects.select_related('user')
     serializer_class = UserProfileSerializer
     permission_classes = [IsAuthenticated]
+    response_cache_models = CONTACT_RESPONSE_MODELS
+    send_last_modified = True
+    version_object = True
+
+    def get_version_querysets(self):
+        return [UserProfile.objects.filter(pk=self.kwargs['pk'])]
+
+    def retrieve(self, request, *args, **kwargs):
+        serializer = self.get_serializer(self.get_object())
+        return Response(serialized(request, serializer))
 
     def perform_destroy(self, instance):
         """
@@ -42,7 +139,18 @@ class UserProfileDetail_View(generics.RetrieveUpdateDestroyAPIView):
         user.delete()
 
 
+REGISTER_CONFLICT_MESSAGES = {
+    'username': 'Username already exists.',
+    'email': 'Email already exists.',
+}
+
+
 class UserRegister_View(APIView):
+    """
+    Register a user. The user and its profile are inserted in one
+    transaction; duplicate usernames and emails are detected by the
+    unique constraints on auth_user, not by querying first.
+    """
     permission_classes = [AllowAny]
     authentication_classes = []
 
@@ -59,17 +167,21 @@ class UserRegister_View(APIView):
         if not username or not email or not password:
             return Response({'status': 'error', 'message': 'Username, email, and password are required.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        if User.objects.filter(username=username).exists():
-            return Response({'status': 'error', 'message': 'Username already exists.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        if User.objects.filter(email=email).exists():
-            return Response({'status': 'error', 'message': 'Email already exists.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        user = User.objects.create_user(
-            username=username, email=email, password=password, first_name=first_name, last_name=last_name)
-        user.userprofile.phone_number = phone_number
-        user.userprofile.color = color
-        user.userprofile.save()
+        user = User(
+            username=User.normalize_username(username),
+            email=User.objects.normalize_email(email),
+            first_name=first_name or '', last_name=last_name)
+        user.set_password(password)
+        user.profile_defaults = {'phone_number': phone_number, 'color': color}
+        try:
+            with transaction.atomic():
+                user.save()
+        except IntegrityError as error:
+            field = unique_conflict(error)
+            if field is None:
+                raise
+            message = REGISTER_CONFLICT_MESSAGES[field]
+            return Response({'status': 'error', 'message': message}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response({
             'status': 'success',
@@ -103,46 +215,82 @@ class UserRefreshToken_View(APIView):
         return response
 
 
-class UserLogin_View(APIView):
+class UserLogin_View(AsyncViewMixin, APIView):
+    """
+    Log in with email and password.
+
+    The user is looked up once by case-insensitive email and the
+    password checked directly, with rehash
+    when PASSWORD_HASHER or its cost changed. As an async view
+    (ASYNC_LOGIN) the hash runs in the bounded pool of
+    user_auth_app.hashers, so slow hashes do not block other requests.
+    """
     permission_classes = [AllowAny]
     authentication_classes = []
+    async_methods = ('post',)
 
-    def post(self, request):
+    def get_credentials(self, request):
         email = request.data.get('email')
         password = request.data.get('password')
-
         if not email or not password:
-            return Response(
+            return None, None, Response(
                 {'status': 'error', 'message': 'Email and password are required.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-
-        try:
-            user_exist = User.objects.get(email=email)
-        except User.DoesNotExist:
+        return email, password, None
+
+    def get_user_queryset(self, email):
+        # The unique email index is partial (WHERE email <> ''); repeating
+        # its predicate lets Postgres use it for UPPER(email) = UPPER(%s).
+        return User.objects.filter(email__iexact=email).exclude(email='')
+
+    def user_not_found(self):
+        return Response(
+            {'status': 'error', 'message': 'User with this email does not exist.'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    def login_response(self, user, password_ok):
+        # Inactive users are rejected like ModelBackend does
+        if not (password_ok and user.is_active):
             return Response(
-                {'status': 'error', 'message': 'User with this email does not exist.'},
-                status=status.HTTP_404_NOT_FOUND
+                {'status': 'error', 'message': 'Invalid credentials.'},
+                status=status.HTTP_401_UNAUTHORIZED
             )
 
-        user = authenticate(username=user_exist.username, password=password)
-        if user is not None:
-            refresh = RefreshToken.for_user(user)
-            access = refresh.access_token
+        refresh = RefreshToken.for_user(user)
+        access = refresh.access_token
 
-            response = Response({
-                'user_id': user.pk,
-                'username': user.username,
-            }, status=status.HTTP_200_OK)
+        response = Response({
+            'user_id': user.pk,
+            'username': user.username,
+        }, status=status.HTTP_200_OK)
 
-            set_jwt_cookies(response, str(access), str(
-                refresh), debug=settings.DEBUG)
-            return response
-        else:
-            return Response(
-                {'status': 'error', 'message': 'Invalid credentials.'},
-                status=status.HTTP_401_UNAUTHORIZED
-            )
+        set_jwt_cookies(response, str(access), str(
+            refresh), debug=settings.DEBUG)
+        return response
+
+    def post(self, request):
+        email, password, error = self.get_credentials(request)
+        if error:
+            return error
+
+        user = self.get_user_queryset(email).first()
+        if user is None:
+            return self.user_not_found()
+        return self.login_response(user, user.check_password(password))
+
+    async def apost(self, request):
+        email, password, error = self.get_credentials(request)
+        if error:
+            return error
+
+        user = await self.get_user_queryset(email).afirst()
+        if user is None:
+            return self.user_not_found()
+        password_ok = await acheck_password(user, password)
+        # RefreshToken.for_user records the token (token_blacklist)
+        return await sync_to_async(self.login_response)(user, password_ok)
 
 
 class UserLogout_View(APIView):
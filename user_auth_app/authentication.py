@@ -1,6 +1,83 @@
+from django.conf import settings
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser as BaseTokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
 from rest_framework.exceptions import AuthenticationFailed
 
+from todo_list_backend.cache import LRUCache
+
+AUTH_USER_CACHE = getattr(settings, 'AUTH_USER_CACHE', {})
+
+# (user id, token jti) -> field values of the User and its userprofile.
+# Only plain values are stored, every hit builds new instances, so
+# requests never share (and mutate) the same User. Per process; signals.py drops a user's entries when the User or the
+# UserProfile changes, other workers catch up after TIMEOUT seconds.
+# TIMEOUT=0 disables the cache.
+user_cache = LRUCache(
+    max_size=AUTH_USER_CACHE.get('MAX_SIZE', 1024),
+    timeout=AUTH_USER_CACHE.get('TIMEOUT', 60),
+)
+
+
+def invalidate_cached_user(user_id):
+    # The user id claim is a string in the token.
+    user_id = str(user_id)
+    user_cache.delete_where(lambda key: key[0] == user_id)
+
+
+def _field_values(instance):
+    return tuple(
+        getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields)
+
+
+def _from_field_values(model, db, values):
+    return model.from_db(
+        db, [field.attname for field in model._meta.concrete_fields], values)
+
+
+def _cache_entry(user):
+    profile = getattr(user, 'userprofile', None)
+    return (
+        user._state.db,
+        _field_values(user),
+        _field_values(profile) if profile is not None else None,
+    )
+
+
+def _user_from_cache_entry(user_model, entry):
+    """
+    A new User (and userprofile) from `_cache_entry()` values, the same
+    as `select_related('userprofile')` would return.
+    """
+    db, user_values, profile_values = entry
+    user = _from_field_values(user_model, db, user_values)
+    related = user_model._meta.get_field('userprofile')
+    if profile_values is None:
+        related.set_cached_value(user, None)
+    else:
+        profile = _from_field_values(related.related_model, db, profile_values)
+        related.set_cached_value(user, profile)
+        related.field.set_cached_value(profile, user)
+    return user
+
+
+class TokenUser(BaseTokenUser):
+    """
+    simplejwt's TokenUser returns the user id claim as it is in the token
+    (a string); ours is an int like `User.id`, so both kinds of
+    `request.user` compare the same against ids from the database.
+    """
+
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
 
 class CookieJWTAuthentication(JWTAuthentication):
     def authenticate(self, request):
@@ -13,5 +90,61 @@ class CookieJWTAuthentication(JWTAuthentication):
         except AuthenticationFailed:
             return None
 
+        stateless_reads = getattr(
+            settings, 'AUTH_USER_CACHE', {}).get('STATELESS_READS')
+        if stateless_reads and request.method in SAFE_METHODS:
+            return (self.get_token_user(validated_token), validated_token)
+
         user = self.get_user(validated_token)
         return (user, validated_token)
+
+    def get_user(self, validated_token):
+        """
+        Same checks as JWTAuthentication.get_user, but the user (and its
+        profile) is loaded in one query and reused for the lifetime of
+        the token or until it changes.
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        key = (str(user_id), validated_token.get(api_settings.JTI_CLAIM))
+        entry = user_cache.get(key)
+        if entry is not None:
+            return _user_from_cache_entry(self.user_model, entry)
+
+        try:
+            user = self.user_model.objects.select_related('userprofile').get(
+                **{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found") from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."),
+                    code="password_changed")
+
+        if user_cache.timeout:
+            user_cache.set(key, _cache_entry(user))
+        return user
+
+    def get_token_user(self, validated_token):
+        """
+        Stateless mode: a lightweight user built from the token claims,
+        no database access. Only used for read-only requests.
+        """
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification"))
+        return api_settings.TOKEN_USER_CLASS(validated_token)
@@ -0,0 +1,81 @@
+"""
+Password hashers with their cost taken from settings.PASSWORD_HASHING,
+and the password check used by the async login view.
+
+settings.PASSWORD_HASHER picks which one hashes new passwords. The
+others stay in PASSWORD_HASHERS so existing hashes still verify;
+check_password() rehashes them with the preferred hasher (and its
+current cost) on the next successful login.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+PASSWORD_HASHING = getattr(settings, 'PASSWORD_HASHING', {})
+
+
+def cost(name, default):
+    value = PASSWORD_HASHING.get(name)
+    return default if value is None else value
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    iterations = cost('PBKDF2_ITERATIONS', hashers.PBKDF2PasswordHasher.iterations)
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    work_factor = cost('SCRYPT_WORK_FACTOR', hashers.ScryptPasswordHasher.work_factor)
+    parallelism = cost('SCRYPT_PARALLELISM', hashers.ScryptPasswordHasher.parallelism)
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Needs the argon2-cffi package.
+    """
+    time_cost = cost('ARGON2_TIME_COST', hashers.Argon2PasswordHasher.time_cost)
+    memory_cost = cost('ARGON2_MEMORY_COST', hashers.Argon2PasswordHasher.memory_cost)
+    parallelism = cost('ARGON2_PARALLELISM', hashers.Argon2PasswordHasher.parallelism)
+
+
+_executor = None
+
+
+def hash_executor():
+    """
+    The thread pool password checks of async views run in. Bounded by
+    PASSWORD_HASHING['WORKERS'], extra logins queue instead of piling
+    more hashing threads onto the worker.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=cost('WORKERS', 2), thread_name_prefix='password-hash')
+    return _executor
+
+
+def verify_password(encoded, raw_password):
+    """
+    (is correct, new hash or None). The new hash is set when the stored
+    one was made with another hasher or cost and should be replaced.
+    """
+    outdated = []
+    correct = hashers.check_password(raw_password, encoded, setter=outdated.append)
+    if correct and outdated:
+        return True, hashers.make_password(raw_password)
+    return correct, None
+
+
+async def acheck_password(user, raw_password):
+    """
+    Async User.check_password: hashing runs in hash_executor(), the
+    event loop stays free. Rehashes like the sync version does.
+    """
+    loop = asyncio.get_running_loop()
+    correct, encoded = await loop.run_in_executor(
+        hash_executor(), verify_password, user.password, raw_password)
+    if encoded:
+        user.password = encoded
+        await user.asave(update_fields=['password'])
+    return correct
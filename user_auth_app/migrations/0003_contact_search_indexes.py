@@ -0,0 +1,41 @@
+from django.db import migrations
+
+SEARCH_COLUMNS = ('first_name', 'last_name', 'username', 'email')
+
+
+def create_indexes(apps, schema_editor):
+    """
+    Prefix indexes for ?q= on /api/contacts/ (istartswith):
+    - SQLite: LIKE is case-insensitive, it uses NOCASE indexes
+    - Postgres: icontains/istartswith compile to UPPER(col::text) LIKE,
+      which needs a matching expression index with text_pattern_ops
+    """
+    vendor = schema_editor.connection.vendor
+    for column in SEARCH_COLUMNS:
+        name = f'auth_user_{column}_prefix_idx'
+        if vendor == 'sqlite':
+            schema_editor.execute(
+                f'CREATE INDEX {name} ON auth_user ({column} COLLATE NOCASE)')
+        elif vendor == 'postgresql':
+            schema_editor.execute(
+                f'CREATE INDEX {name} ON auth_user '
+                f'(UPPER({column}::text) text_pattern_ops)')
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        for column in SEARCH_COLUMNS:
+            schema_editor.execute(
+                f'DROP INDEX IF EXISTS auth_user_{column}_prefix_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth_app', '0002_userprofile_updated_at'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
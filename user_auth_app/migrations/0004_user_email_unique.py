@@ -0,0 +1,72 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Upper
+
+EMAIL_UNIQUE_INDEX = 'auth_user_email_ci_uniq'
+
+
+def check_duplicate_emails(apps, schema_editor):
+    """
+    Emails that only differ in case were accepted before, and would make
+    the index below fail. They are not merged or deleted here (both users
+    may have tasks and logins); the migration stops and lists them so
+    they can be fixed by hand first.
+    """
+    User = apps.get_model('auth', 'User')
+    duplicates = (
+        User.objects.using(schema_editor.connection.alias)
+        .exclude(email='')
+        .annotate(normalized=Upper('email'))
+        .values('normalized')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+        .values_list('normalized', flat=True)
+    )
+    conflicts = []
+    for email in duplicates:
+        users = User.objects.using(schema_editor.connection.alias).filter(
+            email__iexact=email).order_by('id')
+        conflicts.append(', '.join(
+            f'{user.id} ({user.username}, {user.email})' for user in users))
+    if conflicts:
+        raise RuntimeError(
+            'Cannot add the case-insensitive unique email index, these '
+            'users share an email (differing only in case). Change or '
+            'clear the email of all but one user of each group and run '
+            'migrate again:\n' + '\n'.join(conflicts))
+
+
+def create_index(apps, schema_editor):
+    """
+    Case-insensitive unique email on auth_user. Registration and profile
+    updates rely on it instead of checking with exists() first. Empty
+    emails are not constrained.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        expression = 'email COLLATE NOCASE'
+    elif vendor == 'postgresql':
+        expression = 'UPPER(email)'
+    else:
+        return
+    schema_editor.execute(
+        f"CREATE UNIQUE INDEX {EMAIL_UNIQUE_INDEX} ON auth_user ({expression}) "
+        f"WHERE email <> ''")
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute(f'DROP INDEX IF EXISTS {EMAIL_UNIQUE_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('user_auth_app', '0003_contact_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.RunPython(create_index, drop_index),
+    ]
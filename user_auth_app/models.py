@@ -2,6 +2,27 @@ from django.contrib.auth.models import User
 
 from django.db import models
 
+EMAIL_UNIQUE_INDEX = 'auth_user_email_ci_uniq'
+
+
+USERNAME_UNIQUE_INDEX = 'auth_user_username_key'
+
+
+def unique_conflict(error):
+    """
+    The auth_user field an IntegrityError raised by saving a User
+    collided on, or None for any other integrity error (e.g. from the
+    profile inserted by post_save in the same transaction). Postgres
+    names the index in the message, SQLite the indexed column
+    ("UNIQUE constraint failed: auth_user.email").
+    """
+    message = str(error)
+    if EMAIL_UNIQUE_INDEX in message or 'auth_user.email' in message:
+        return 'email'
+    if USERNAME_UNIQUE_INDEX in message or 'auth_user.username' in message:
+        return 'username'
+    return None
+
 
 class UserProfile(models.Model):
     user = models.OneToOneField(
@@ -9,6 +30,7 @@ class UserProfile(models.Model):
     phone_number = models.CharField(
         max_length=40, blank=True, null=True, default='')
     color = models.CharField(max_length=40, blank=True, default='green')
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f'(Id:{self.id}) - {self.user.username}'
@@ -1,12 +1,70 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
+from todo_list_backend.response_cache import bump_versions
+from .authentication import invalidate_cached_user
 from .models import UserProfile
 
+# User fields that are part of the profile representation
+# (UserProfileSerializer). Changing one of them bumps the profile's
+# updated_at, which ETags and the change feed are based on.
+PROFILE_USER_FIELDS = ('first_name', 'last_name', 'username', 'email')
+
+
+def profile_user_state(user):
+    # __dict__ so deferred fields are not loaded
+    return tuple(user.__dict__.get(name) for name in PROFILE_USER_FIELDS)
+
+
+@receiver(post_init, sender=User)
+def remember_profile_user_state(sender, instance, **kwargs):
+    instance._profile_user_state = profile_user_state(instance)
+
 
 @receiver(post_save, sender=User)
-def create_or_update_user_profile(sender, instance, created, **kwargs):
+def create_or_update_user_profile(sender, instance, created, update_fields=None, raw=False, **kwargs):
     if created:
-        UserProfile.objects.create(user=instance, phone_number='')
+        defaults = getattr(instance, 'profile_defaults', {'phone_number': ''})
+        UserProfile.objects.create(user=instance, **defaults)
+        instance._profile_user_state = profile_user_state(instance)
+        return
+
+    if raw:
+        return
+    # e.g. update_last_login() saves with update_fields=['last_login']
+    if update_fields is not None and not set(update_fields) & set(PROFILE_USER_FIELDS):
+        return
+    state = profile_user_state(instance)
+    if state == instance._profile_user_state:
+        return
+    instance._profile_user_state = state
+    # The caller saves the profile itself right after (UserProfileSerializer)
+    if getattr(instance, 'profile_save_pending', False):
+        return
+
+    if User.userprofile.is_cached(instance):
+        profile = instance.userprofile
     else:
-        instance.userprofile.save()
+        profile = UserProfile.objects.only('id', 'user_id').get(user=instance)
+    profile.save(update_fields=['updated_at'])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_profile_user_cache(sender, instance, **kwargs):
+    invalidate_cached_user(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def bump_user_response_version(sender, instance, update_fields=None, **kwargs):
+    # Logins (last_login) and rehashes do not change any response.
+    if update_fields is not None and not set(update_fields) & set(PROFILE_USER_FIELDS):
+        return
+    bump_versions(User)
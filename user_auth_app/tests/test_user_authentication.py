@@ -0,0 +1,82 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import AccessToken
+
+from todo_list.models import Task
+from user_auth_app.authentication import CookieJWTAuthentication, user_cache
+
+
+class CookieJWTAuthenticationCacheTests(TestCase):
+
+    def setUp(self):
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+        self.user = User.objects.create_user(
+            username='testuser', email='testuser@example.com', password='testpassword')
+        self.token = str(AccessToken.for_user(self.user))
+        self.factory = APIRequestFactory()
+        self.authentication = CookieJWTAuthentication()
+
+    def authenticate(self, method='get'):
+        request = getattr(self.factory, method)('/api/tasks/')
+        request.COOKIES['access_token'] = self.token
+        user, _ = self.authentication.authenticate(request)
+        return user
+
+    def test_user_is_cached_with_profile(self):
+        with self.assertNumQueries(1):
+            user = self.authenticate()
+            self.assertEqual(user.userprofile.color, 'green')
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+            self.assertEqual(user.pk, self.user.pk)
+
+    def test_cache_hits_are_separate_instances(self):
+        self.authenticate()
+        first = self.authenticate()
+        first.first_name = 'Changed'
+        first.userprofile.color = 'red'
+        with self.assertNumQueries(0):
+            second = self.authenticate()
+            self.assertIsNot(second, first)
+            self.assertEqual(second.first_name, '')
+            self.assertEqual(second.userprofile.color, 'green')
+            self.assertIs(second.userprofile.user, second)
+
+    def test_profile_save_invalidates_cache(self):
+        self.authenticate()
+        profile = self.user.userprofile
+        profile.color = 'red'
+        profile.save()
+        with self.assertNumQueries(1):
+            user = self.authenticate()
+        self.assertEqual(user.userprofile.color, 'red')
+
+    def test_user_delete_invalidates_cache(self):
+        self.authenticate()
+        self.user.delete()
+        self.assertEqual(len(user_cache), 0)
+
+    @override_settings(AUTH_USER_CACHE={'STATELESS_READS': True})
+    def test_stateless_reads(self):
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+        self.assertIsInstance(user, TokenUser)
+        self.assertEqual(user.id, self.user.id)
+        self.assertEqual(user.pk, self.user.pk)
+
+        with self.assertNumQueries(1):
+            user = self.authenticate(method='post')
+        self.assertIsInstance(user, User)
+
+    @override_settings(AUTH_USER_CACHE={'STATELESS_READS': True})
+    def test_stateless_reads_summary(self):
+        task = Task.objects.create(title='Task', description='Description')
+        task.members.set([self.user.userprofile])
+        client = APIClient()
+        client.cookies['access_token'] = self.token
+        response = client.get(reverse('task-summary'))
+        self.assertEqual(response.data['mine'], {'total': 1, 'open': 1})
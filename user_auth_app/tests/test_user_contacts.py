@@ -0,0 +1,82 @@
+from unittest import skipUnless
+
+from rest_framework.test import APITestCase, APIClient
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from user_auth_app.models import UserProfile
+
+
+class UserContactsTests(APITestCase):
+
+    def setUp(self):
+        self.user = self.create_user('anna', 'Anna', 'Müller', 'anna@example.com')
+        self.create_user('bernd', 'Bernd', 'Andersen', 'bernd@example.com')
+        self.create_user('carla', '', '', 'annex@example.org')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('user-contacts')
+        self.picker_url = reverse('user-contacts-picker')
+
+    def create_user(self, username, first_name, last_name, email):
+        return User.objects.create_user(
+            username=username, email=email, password='testpassword',
+            first_name=first_name, last_name=last_name)
+
+    def usernames(self, response):
+        results = response.data
+        if isinstance(results, dict):
+            results = results['results']
+        return [contact['user']['username'] for contact in results]
+
+    def test_full_list_is_unchanged(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(
+            set(response.data[0]), {'id', 'user', 'phone_number', 'color'})
+
+    def test_list_query_count_is_constant(self):
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url)
+        for i in range(10):
+            self.create_user(f'user{i}', 'User', str(i), f'user{i}@example.com')
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 13)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def test_pagination(self):
+        response = self.client.get(self.url, {'page_size': 2})
+        self.assertEqual(self.usernames(response), ['anna', 'bernd'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual(self.usernames(response), ['carla'])
+        self.assertIsNone(response.data['next'])
+
+    def test_prefix_search(self):
+        response = self.client.get(self.url, {'q': 'an'})
+        self.assertEqual(self.usernames(response), ['anna', 'bernd', 'carla'])
+        response = self.client.get(self.url, {'q': 'AN mü'})
+        self.assertEqual(self.usernames(response), ['anna'])
+        response = self.client.get(self.url, {'q': 'ller'})
+        self.assertEqual(self.usernames(response), [])
+
+    def test_picker(self):
+        response = self.client.get(self.picker_url, {'q': 'an'})
+        self.assertEqual(response.status_code, 200)
+        profiles = UserProfile.objects.order_by('id')
+        self.assertEqual(response.data, [
+            {'id': profiles[0].id, 'initials': 'AM', 'color': 'green'},
+            {'id': profiles[1].id, 'initials': 'BA', 'color': 'green'},
+            {'id': profiles[2].id, 'initials': 'C', 'color': 'green'},
+        ])
+
+        response = self.client.get(self.picker_url, {'page_size': 1})
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNotNone(response.data['next'])
+
+    @skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is SQLite syntax')
+    def test_search_uses_prefix_indexes(self):
+        queryset = UserProfile.objects.filter(user__last_name__istartswith='mü')
+        self.assertIn('auth_user_last_name_prefix_idx', str(queryset.explain()))
@@ -0,0 +1,98 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import AsyncRequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from user_auth_app.api.views import UserLogin_View
+from user_auth_app.hashers import verify_password
+
+
+class LoginPipelineTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword')
+        self.client = APIClient()
+        self.url = reverse('user-login')
+
+    def login(self, email='test@example.com', password='testpassword'):
+        return self.client.post(
+            self.url, {'email': email, 'password': password}, format='json')
+
+    def test_user_is_looked_up_once(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.login()
+        self.assertEqual(response.status_code, 200)
+        user_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "auth_user"' in query['sql']
+        ]
+        self.assertEqual(len(user_queries), 1)
+        # the predicate of the partial unique email index
+        self.assertIn('NOT ("auth_user"."email" = ', user_queries[0])
+
+    def test_email_is_case_insensitive(self):
+        self.assertEqual(self.login(email='TEST@example.com').status_code, 200)
+
+    def test_invalid_credentials(self):
+        self.assertEqual(self.login(password='wrong').status_code, 401)
+        self.assertEqual(self.login(email='nobody@example.com').status_code, 404)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.login().status_code, 401)
+
+    def test_outdated_hash_is_replaced_on_login(self):
+        self.user.password = make_password('testpassword', hasher='pbkdf2_sha1')
+        self.user.save()
+        self.assertEqual(self.login().status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$'))
+        self.assertTrue(self.user.check_password('testpassword'))
+
+    def test_verify_password(self):
+        current = make_password('testpassword')
+        self.assertEqual(verify_password(current, 'testpassword'), (True, None))
+        self.assertEqual(verify_password(current, 'wrong'), (False, None))
+        outdated = make_password('testpassword', hasher='pbkdf2_sha1')
+        correct, encoded = verify_password(outdated, 'testpassword')
+        self.assertTrue(correct)
+        self.assertTrue(encoded.startswith('pbkdf2_sha256$'))
+
+
+class AsyncLoginTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword')
+        self.factory = AsyncRequestFactory()
+
+    async def login(self, password='testpassword'):
+        request = self.factory.post(
+            reverse('user-login'),
+            data={'email': 'test@example.com', 'password': password},
+            content_type='application/json')
+        return await UserLogin_View.as_async_view()(request)
+
+    async def test_login(self):
+        response = await self.login()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['username'], 'testuser')
+        self.assertIn('access_token', response.cookies)
+
+    async def test_invalid_credentials(self):
+        response = await self.login(password='wrong')
+        self.assertEqual(response.status_code, 401)
+
+    async def test_outdated_hash_is_replaced_on_login(self):
+        self.user.password = make_password('testpassword', hasher='pbkdf2_sha1')
+        await self.user.asave()
+        response = await self.login()
+        self.assertEqual(response.status_code, 200)
+        await sync_to_async(self.user.refresh_from_db)()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$'))
@@ -0,0 +1,91 @@
+from rest_framework.test import APITestCase, APIClient
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User, update_last_login
+from todo_list.models import ChangeLogEntry
+from user_auth_app.models import UserProfile
+
+
+def captured_sql(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if 'SAVEPOINT' not in query['sql']
+    ]
+
+
+def profile_queries(queries):
+    return [sql for sql in queries if 'user_auth_app_userprofile' in sql]
+
+
+class UserProfileSignalTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword')
+        self.user = User.objects.get(pk=self.user.pk)
+        self.profile_updated = UserProfile.objects.get(user=self.user).updated_at
+
+    def profile_changes(self):
+        return ChangeLogEntry.objects.filter(
+            model='userprofile', action='updated').count()
+
+    def test_last_login_does_not_touch_profile(self):
+        with CaptureQueriesContext(connection) as context:
+            update_last_login(None, self.user)
+        queries = captured_sql(context)
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0].startswith('UPDATE "auth_user"'))
+
+    def test_password_change_does_not_touch_profile(self):
+        self.user.set_password('newpassword')
+        with CaptureQueriesContext(connection) as context:
+            self.user.save()
+        self.assertEqual(len(captured_sql(context)), 1)
+        self.assertEqual(self.profile_changes(), 0)
+
+    def test_visible_change_bumps_profile(self):
+        self.user.first_name = 'Renamed'
+        self.user.save()
+        profile = UserProfile.objects.get(user=self.user)
+        self.assertGreater(profile.updated_at, self.profile_updated)
+        self.assertEqual(self.profile_changes(), 1)
+
+        # saving again without changes does not
+        with CaptureQueriesContext(connection) as context:
+            self.user.save()
+        self.assertEqual(len(captured_sql(context)), 1)
+        self.assertEqual(self.profile_changes(), 1)
+
+
+class UserProfileQueryCountTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword')
+        self.client = APIClient()
+
+    def test_login(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(reverse('user-login'), {
+                'email': 'test@example.com', 'password': 'testpassword',
+            }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(profile_queries(captured_sql(context)), [])
+
+    def test_profile_edit(self):
+        self.client.force_authenticate(user=self.user)
+        url = reverse(
+            'user-contact-detail', kwargs={'pk': self.user.userprofile.pk})
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(url, {
+                'user': {'first_name': 'Renamed'}, 'color': 'red',
+            }, format='json')
+        self.assertEqual(response.status_code, 200)
+        queries = captured_sql(context)
+        # profile + user, user UPDATE, profile UPDATE, change log INSERT
+        self.assertEqual(len(queries), 4, queries)
+        self.assertEqual(len(profile_queries(queries)), 2)
+        self.assertEqual(
+            ChangeLogEntry.objects.filter(
+                model='userprofile', action='updated').count(), 1)
@@ -0,0 +1,148 @@
+from importlib import import_module
+
+from rest_framework.test import APITestCase, APIClient
+from django.apps import apps
+from django.db import IntegrityError, connection
+from django.db.models.signals import post_save
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from user_auth_app.models import EMAIL_UNIQUE_INDEX, UserProfile, unique_conflict
+
+email_unique_migration = import_module(
+    'user_auth_app.migrations.0004_user_email_unique')
+
+
+class UserRegisterConstraintTests(APITestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('user-register')
+        self.existing = User.objects.create_user(
+            username='existinguser', email='Existing@example.com', password='password')
+
+    def register(self, **data):
+        data = {
+            'username': 'newuser', 'first_name': 'First', 'last_name': 'Last',
+            'email': 'newuser@example.com', 'password': 'newpassword',
+            'phone_number': '1234567890', 'color': 'blue', **data,
+        }
+        return self.client.post(self.url, data, format='json')
+
+    def test_register_inserts_user_and_profile_once(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.register()
+        queries = [
+            query['sql'] for query in context.captured_queries
+            if 'SAVEPOINT' not in query['sql']
+        ]
+        # user, profile, the profile's change log entry and its membership
+        # in the default workspace (looked up once)
+        self.assertEqual(len(queries), 5, queries)
+        self.assertEqual(
+            sum(sql.startswith('INSERT') for sql in queries), 4, queries)
+        self.assertEqual(response.status_code, 201)
+        profile = UserProfile.objects.get(user_id=response.data['user_id'])
+        self.assertEqual(
+            (profile.phone_number, profile.color), ('1234567890', 'blue'))
+        self.assertTrue(profile.user.check_password('newpassword'))
+
+    def test_existing_username(self):
+        response = self.register(username='existinguser')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['message'], 'Username already exists.')
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_existing_email_is_case_insensitive(self):
+        response = self.register(email='existing@EXAMPLE.com')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['message'], 'Email already exists.')
+        self.assertEqual(UserProfile.objects.count(), 1)
+
+    def test_other_integrity_errors_are_not_reported_as_conflicts(self):
+        def fail(**kwargs):
+            raise IntegrityError(
+                'NOT NULL constraint failed: user_auth_app_userprofile.color')
+
+        post_save.connect(fail, sender=User)
+        try:
+            with self.assertRaises(IntegrityError):
+                self.register()
+        finally:
+            post_save.disconnect(fail, sender=User)
+
+    def test_empty_emails_are_not_unique(self):
+        User.objects.create_user(username='a', email='', password='password')
+        User.objects.create_user(username='b', email='', password='password')
+        self.assertEqual(User.objects.filter(email='').count(), 2)
+
+
+class UserProfileUpdateConstraintTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpassword')
+        User.objects.create_user(
+            username='otheruser', email='other@example.com', password='testpassword')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse(
+            'user-contact-detail', kwargs={'pk': self.user.userprofile.pk})
+
+    def update(self, email):
+        return self.client.patch(
+            self.url, {'user': {'email': email}, 'color': 'red'}, format='json')
+
+    def test_keep_own_email(self):
+        response = self.update('test@example.com')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['color'], 'red')
+
+    def test_email_taken(self):
+        response = self.update('OTHER@example.com')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data['user']['email'], ['This email is already in use.'])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email, 'test@example.com')
+        self.assertEqual(self.user.userprofile.color, 'green')
+
+
+class UniqueConflictTests(SimpleTestCase):
+
+    def test_messages(self):
+        cases = [
+            ('UNIQUE constraint failed: auth_user.email', 'email'),
+            (f'duplicate key value violates unique constraint "{EMAIL_UNIQUE_INDEX}"',
+             'email'),
+            ('UNIQUE constraint failed: auth_user.username', 'username'),
+            ('duplicate key value violates unique constraint '
+             '"auth_user_username_key"', 'username'),
+            ('FOREIGN KEY constraint failed', None),
+            ('UNIQUE constraint failed: '
+             'todo_list_workspacemembership.profile_id', None),
+        ]
+        for message, field in cases:
+            with self.subTest(message):
+                self.assertEqual(unique_conflict(IntegrityError(message)), field)
+
+
+class EmailUniqueMigrationTests(TestCase):
+
+    def check(self):
+        email_unique_migration.check_duplicate_emails(apps, connection.schema_editor())
+
+    def test_case_duplicates_stop_the_migration(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP INDEX {EMAIL_UNIQUE_INDEX}')
+        User.objects.create_user(username='a', email='Same@example.com')
+        User.objects.create_user(username='b', email='same@EXAMPLE.com')
+        User.objects.create_user(username='c', email='')
+        User.objects.create_user(username='d', email='')
+        with self.assertRaisesMessage(RuntimeError, '(b, same@example.com)'):
+            self.check()
+
+    def test_no_duplicates(self):
+        User.objects.create_user(username='a', email='a@example.com')
+        self.check()